@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+数值数组基准测试：逐元素 乘、加 和 求和，数组一次算完 vs 一息息 按下标一个一个算
+Numeric array benchmark: element-wise multiply/add and sum, vectorized arrays vs 一息息 loops
+
+用法:
+  python bench/bench_arrays.py
+  python bench/bench_arrays.py --n 1000000 --backend array numpy
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import arrays
+from interpreter import HangzhouInterpreter
+from output import create_sink
+from parser import parse_text
+
+SETUP = """
+老倌 xs 装 []
+老倌 ys 装 []
+老倌 i 装 0
+一息息 i 小过 {n}：
+    塞进（xs，i）
+    塞进（ys，i 乘 2）
+    i 装 i 加 1
+"""
+
+LOOP = """
+老倌 zs 装 []
+老倌 i 装 0
+老倌 s 装 0
+一息息 i 小过 {n}：
+    老倌 z 装 xs[i] 乘 ys[i] 加 3
+    塞进（zs，z）
+    s 装 s 加 z
+    i 装 i 加 1
+话说 s
+"""
+
+VECTORIZED = """
+老倌 a 装 数组（xs）
+老倌 b 装 数组（ys）
+老倌 zs 装 a 乘 b 加 3
+话说 求和（zs）
+"""
+
+def timed(interpreter: HangzhouInterpreter, source: str) -> float:
+    program = parse_text(source)
+    start = time.perf_counter()
+    interpreter.interpret(program)
+    elapsed = time.perf_counter() - start
+    if interpreter.last_error is not None:
+        raise interpreter.last_error
+    return elapsed
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='数值数组基准测试')
+    parser.add_argument('--n', type=int, default=1000000, help='元素个数')
+    parser.add_argument('--backend', nargs='+', default=['array', 'numpy'],
+                        help='要测的数组后端（没装 NumPy 时跳过 numpy）')
+    args = parser.parse_args()
+
+    sink = create_sink('capture')
+    interpreter = HangzhouInterpreter(output=sink)
+    timed(interpreter, SETUP.format(n=args.n))
+    loop = timed(interpreter, LOOP.format(n=args.n))
+    expected = sink.lines[-1]
+
+    print(f"{'写法':<24}{'总耗时(秒)':>12}{'每元素(纳秒)':>14}{'加速':>9}")
+    print(f"{'一息息 按下标算':<24}{loop:>12.3f}{loop / args.n * 1e9:>14.1f}{1:>8.1f}x")
+    for name in args.backend:
+        try:
+            arrays.set_backend(name)
+        except ImportError:
+            print(f"{f'数组（{name}）':<24}{'没装，跳过':>12}")
+            continue
+        sink = create_sink('capture')
+        interpreter.output = sink
+        vectorized = timed(interpreter, VECTORIZED)
+        if sink.lines[-1] != expected:
+            raise SystemExit(f"结果对不上: {sink.lines[-1]} != {expected}")
+        print(f"{f'数组（{name}）':<24}{vectorized:>12.3f}{vectorized / args.n * 1e9:>14.1f}"
+              f"{loop / vectorized:>8.1f}x")
+
+if __name__ == '__main__':
+    main()
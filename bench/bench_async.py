@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+异步模式基准测试：很多个会 撒宽 的脚本一起跑，线程池 vs 一个线程里的事件循环
+Async mode benchmark: many sleeping scripts on a thread pool vs one event loop
+
+用法:
+  python bench/bench_async.py
+  python bench/bench_async.py --scripts 10000 --sleep 100 --threads 64
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from async_interpreter import AsyncHangzhouInterpreter
+from output import create_sink
+from parser import parse_text
+from template import InterpreterTemplate
+
+PRELUDE = """
+会做事 等一息（老倌 毫秒）：
+    撒宽（毫秒）
+    有数 毫秒
+"""
+
+def make_script(sleep_ms: int) -> str:
+    return f"老倌 睏了 装 等一息（{sleep_ms}）\n话说 睏了"
+
+def run_threads(template: InterpreterTemplate, program, scripts: int, threads: int) -> float:
+    """线程池：每个脚本占一个线程睏觉"""
+    def run_one(_):
+        interpreter = template.clone(output=create_sink('capture'))
+        return interpreter.interpret(program)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        results = list(pool.map(run_one, range(scripts)))
+    elapsed = time.perf_counter() - start
+    assert all(len(result) == 1 for result in results)
+    return elapsed
+
+def run_async(template: InterpreterTemplate, program, scripts: int) -> float:
+    """事件循环：全部脚本在一个线程里一起睏觉"""
+    async def run_all():
+        interpreters = [template.clone(output=create_sink('capture'), interpreter_class=AsyncHangzhouInterpreter)
+                        for _ in range(scripts)]
+        return await asyncio.gather(*(interpreter.run_async(program) for interpreter in interpreters))
+
+    start = time.perf_counter()
+    results = asyncio.run(run_all())
+    elapsed = time.perf_counter() - start
+    assert all(len(result) == 1 for result in results)
+    return elapsed
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='异步模式基准测试')
+    parser.add_argument('--scripts', type=int, default=10000, help='一起跑多少个脚本')
+    parser.add_argument('--sleep', type=int, default=100, help='每个脚本撒宽多少毫秒')
+    parser.add_argument('--threads', type=int, default=64, help='线程池的线程数')
+    parser.add_argument('--skip-threads', action='store_true', help='不跑线程池对照组')
+    args = parser.parse_args()
+
+    template = InterpreterTemplate(PRELUDE)
+    program = parse_text(make_script(args.sleep))
+    ideal = args.sleep / 1000
+
+    print(f"{args.scripts} 个脚本，每个撒宽 {args.sleep} 毫秒")
+    print(f"{'模式':<16}{'总耗时(秒)':>12}{'脚本/秒':>12}")
+    if not args.skip_threads:
+        elapsed = run_threads(template, program, args.scripts, args.threads)
+        print(f"{f'线程池({args.threads})':<16}{elapsed:>12.2f}{args.scripts / elapsed:>12.0f}")
+    elapsed = run_async(template, program, args.scripts)
+    print(f"{'异步(1线程)':<16}{elapsed:>12.2f}{args.scripts / elapsed:>12.0f}")
+    print(f"（只睏一次的理想耗时 {ideal:.2f} 秒）")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+函数定义基准测试：变量很多的作用域里反复定义函数、函数里面再定义函数
+Closure benchmark: repeated and nested function definitions
+
+用法:
+  python bench/bench_closures.py
+  python bench/bench_closures.py --variables 2000 --definitions 20000
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from interpreter import HangzhouInterpreter
+from output import create_sink
+from parser import parse_text
+
+def repeated_definitions(variables: int, definitions: int) -> str:
+    """全局有很多变量，循环里一遍遍定义同一个函数"""
+    lines = [f"老倌 v{i} 装 {i}" for i in range(variables)]
+    lines += [
+        "老倌 i 装 0",
+        "老倌 函数们 装 空的",
+        f"一息息 i 小过 {definitions}：",
+        "    会做事 加一（老倌 n）：",
+        "        有数 n 加 1",
+        "    函数们 装 加一",
+        "    i 装 加一（i）",
+    ]
+    return '\n'.join(lines)
+
+def nested_definitions(variables: int, definitions: int) -> str:
+    """函数里先声明很多局部变量，再定义内层函数"""
+    lines = ["会做事 外层（老倌 n）："]
+    lines += [f"    老倌 局部{i} 装 n" for i in range(variables)]
+    lines += [
+        "    会做事 内层（老倌 m）：",
+        "        有数 m 加 n",
+        "    老倌 结果 装 内层（1）",
+        "    有数 结果",
+        "老倌 i 装 0",
+        f"一息息 i 小过 {definitions}：",
+        "    i 装 i 加 外层（0）",
+    ]
+    return '\n'.join(lines)
+
+def run(source: str) -> tuple:
+    """返回 (耗时秒数, 内存峰值字节)"""
+    program = parse_text(source)
+    interpreter = HangzhouInterpreter(output=create_sink('discard'))
+    tracemalloc.start()
+    start = time.perf_counter()
+    interpreter.interpret(program)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    if interpreter.last_error is not None:
+        raise interpreter.last_error
+    return elapsed, peak
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='函数定义基准测试')
+    parser.add_argument('--variables', type=int, default=1000, help='作用域里的变量数')
+    parser.add_argument('--definitions', type=int, default=5000, help='定义函数的次数')
+    args = parser.parse_args()
+    
+    workloads = [
+        ('循环里反复定义', repeated_definitions(args.variables, args.definitions)),
+        ('嵌套定义', nested_definitions(args.variables, args.definitions // 10)),
+    ]
+    print(f"作用域变量 {args.variables} 个，定义 {args.definitions} 次（嵌套的十分之一）:")
+    for name, source in workloads:
+        elapsed, peak = run(source)
+        print(f"  {name:<10}{elapsed:8.3f} 秒   内存峰值 {peak / 1024 / 1024:8.2f} MB")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+词典模糊搜索基准测试：10^5 个词条上查子串，n-gram 倒排索引 vs 一条一条扫描
+Dictionary search benchmark: substring queries over 10^5 entries, n-gram inverted index vs linear scan
+
+两边查出来的词条必须一样（索引的结果排过序，比较时按集合比）。
+
+用法:
+  python bench/bench_dict_search.py
+  python bench/bench_dict_search.py --entries 200000 --queries 200
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from keywords import ALL_HANGZHOU_WORDS
+from ngram_index import NgramIndex, build_index
+
+# 生成词条用的字：杭州话词汇里出现过的字，释义用英文字母
+CHARACTERS = sorted({character for word in ALL_HANGZHOU_WORDS for character in word})
+LETTERS = 'abcdefghijklmnopqrstuvwxyz_'
+
+def generate_entries(count: int, rng: random.Random) -> list:
+    """扩充过的大词典：内置词汇打头，后面是随机生成的词条"""
+    entries = dict(ALL_HANGZHOU_WORDS)
+    while len(entries) < count:
+        word = ''.join(rng.choice(CHARACTERS) for _ in range(rng.randint(2, 5)))
+        meaning = ''.join(rng.choice(LETTERS) for _ in range(rng.randint(4, 12)))
+        entries.setdefault(word, meaning)
+    return list(entries.items())
+
+def linear_scan(entries: list, pattern: str) -> list:
+    """和 keywords.search_hangzhou_words 一样一条一条扫"""
+    return [(word, meaning) for word, meaning in entries if pattern in word or pattern in meaning]
+
+def make_queries(entries: list, count: int, rng: random.Random) -> dict:
+    """按长度分组的查询，从词条里截出来的，保证查得到"""
+    queries = {}
+    for length in (1, 2, 3, 4):
+        group = []
+        while len(group) < count:
+            word, meaning = rng.choice(entries)
+            text = word if rng.random() < 0.7 else meaning
+            if len(text) >= length:
+                start = rng.randrange(len(text) - length + 1)
+                group.append(text[start:start + length])
+        queries[length] = group
+    return queries
+
+def timed(function, queries: list) -> tuple:
+    """跑一组查询，返回 (每次查询的平均秒数, 结果)"""
+    start = time.perf_counter()
+    results = [function(query) for query in queries]
+    return (time.perf_counter() - start) / len(queries), results
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='词典模糊搜索基准测试')
+    parser.add_argument('--entries', type=int, default=100000, help='词条数（默认 100000）')
+    parser.add_argument('--queries', type=int, default=100, help='每种长度的查询个数（默认 100）')
+    parser.add_argument('--seed', type=int, default=62, help='随机数种子')
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    entries = generate_entries(args.entries, rng)
+    queries = make_queries(entries, args.queries, rng)
+
+    start = time.perf_counter()
+    index = NgramIndex(entries)
+    build = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'words.idx')
+        index.save(path)
+        start = time.perf_counter()
+        loaded = build_index(entries, path)
+        load = time.perf_counter() - start
+        assert loaded.postings == index.postings
+
+    print(f"{len(entries)} 个词条，{len(index.postings)} 个片段")
+    print(f"建索引 {build:.2f} 秒，读存下来的索引 {load:.2f} 秒（含校验词典有没有变）")
+    print(f"\n{'查询长度':<8}{'扫描(毫秒)':>12}{'索引(毫秒)':>12}{'加速':>10}{'平均结果数':>12}")
+    for length, group in queries.items():
+        scan_time, expected = timed(lambda query: linear_scan(entries, query), group)
+        index_time, found = timed(index.search, group)
+        for query, want, got in zip(group, expected, found):
+            if sorted(want) != sorted(got):
+                raise AssertionError(f"查 {query!r} 的结果和扫描的不一样")
+        hits = sum(len(result) for result in found) / len(found)
+        print(f"{length:<12}{scan_time * 1000:>12.3f}{index_time * 1000:>12.3f}"
+              f"{scan_time / index_time:>9.1f}x{hits:>12.1f}")
+
+if __name__ == '__main__':
+    main()
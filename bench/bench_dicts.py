@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+字典基准测试：10^4 个键的查表，字典 O(1) 查 vs 一串 要是 ... 等于 ... 挨个比
+Dict benchmark: a 10^4-key lookup table, dict lookup vs if-chains
+
+用法:
+  python bench/bench_dicts.py
+  python bench/bench_dicts.py --keys 10000 --lookups 1000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from interpreter import HangzhouInterpreter
+from output import create_sink
+from parser import parse_text
+
+def if_chain_program(keys: int) -> str:
+    """查表函数写成一串 要是，每个键一个"""
+    lines = ["会做事 查（x）："]
+    for i in range(keys):
+        lines.append(f'    要是 x 等于 "键{i}"：')
+        lines.append(f"        有数 {i}")
+    lines.append("    有数 -1")
+    return "\n".join(lines) + "\n"
+
+def dict_program(keys: int) -> str:
+    """查表写成一个字典字面量"""
+    entries = "，".join(f'"键{i}"：{i}' for i in range(keys))
+    return f"老倌 表 装 {{{entries}}}\n会做事 查（x）：\n    有数 取（表，x，-1）\n"
+
+def lookups_program(targets: list) -> str:
+    entries = "，".join(f'"键{i}"' for i in targets)
+    return f"""
+老倌 要查 装 [{entries}]
+老倌 i 装 0
+老倌 s 装 0
+一息息 i 小过 长度（要查）：
+    s 装 s 加 查（要查[i]）
+    i 装 i 加 1
+话说 s
+"""
+
+def timed(definitions: str, lookups: str) -> tuple:
+    """定义部分不计时，只计查表；返回 (耗时, 结果)。查 是纯函数，关掉记忆化免得查重复的键直接命中"""
+    sink = create_sink('capture')
+    interpreter = HangzhouInterpreter(memo_size=0, output=sink)
+    interpreter.interpret(parse_text(definitions))
+    program = parse_text(lookups)
+    start = time.perf_counter()
+    interpreter.interpret(program)
+    elapsed = time.perf_counter() - start
+    if interpreter.last_error is not None:
+        raise interpreter.last_error
+    return elapsed, sink.lines[-1]
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='字典基准测试')
+    parser.add_argument('--keys', type=int, default=10000, help='查找表里键的个数')
+    parser.add_argument('--lookups', type=int, default=1000, help='查多少次')
+    args = parser.parse_args()
+
+    rng = random.Random(62)
+    targets = [rng.randrange(args.keys) for _ in range(args.lookups)]
+    lookups = lookups_program(targets)
+    chain, chain_result = timed(if_chain_program(args.keys), lookups)
+    table, table_result = timed(dict_program(args.keys), lookups)
+    if chain_result != table_result:
+        raise SystemExit(f"结果对不上: {chain_result} != {table_result}")
+
+    print(f"{args.keys} 个键，查 {args.lookups} 次")
+    print(f"{'写法':<16}{'总耗时(秒)':>12}{'每次(微秒)':>12}")
+    print(f"{'一串 要是':<16}{chain:>12.3f}{chain / args.lookups * 1e6:>12.1f}")
+    print(f"{'字典':<16}{table:>12.3f}{table / args.lookups * 1e6:>12.1f}")
+    print(f"字典快 {chain / table:.0f} 倍")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+挨个循环基准测试：同样的累加，挨个 ... 从 ... 直到 vs 一息息 自己数下标
+For-loop benchmark: the same summation with 挨个 ... 从 ... 直到 vs a hand-counted 一息息 loop
+
+用法:
+  python bench/bench_for.py
+  python bench/bench_for.py --n 1000000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from interpreter import HangzhouInterpreter
+from output import create_sink
+from parser import parse_text
+
+# (一息息 写法, 挨个 写法)，循环体一样，差的就是循环本身的开销
+PAIRS = {
+    '数到 n': ("""
+老倌 s 装 0
+老倌 i 装 0
+一息息 i 小过 {n}：
+    s 装 s 加 i
+    i 装 i 加 1
+话说 s
+""", """
+老倌 s 装 0
+挨个 i 从 0 直到 {n}：
+    s 装 s 加 i
+话说 s
+"""),
+    '走列表': ("""
+老倌 s 装 0
+老倌 i 装 0
+老倌 n 装 长度（xs）
+一息息 i 小过 n：
+    s 装 s 加 xs[i]
+    i 装 i 加 1
+话说 s
+""", """
+老倌 s 装 0
+挨个 x 从 xs：
+    s 装 s 加 x
+话说 s
+"""),
+}
+
+def timed(setup, source: str) -> float:
+    interpreter = HangzhouInterpreter(output=create_sink('capture'))
+    interpreter.interpret(setup)
+    program = parse_text(source)
+    start = time.perf_counter()
+    interpreter.interpret(program)
+    elapsed = time.perf_counter() - start
+    if interpreter.last_error is not None:
+        raise interpreter.last_error
+    return elapsed
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='挨个循环基准测试')
+    parser.add_argument('--n', type=int, default=500000, help='循环次数')
+    args = parser.parse_args()
+
+    setup = parse_text(f"老倌 xs 装 []\n挨个 i 从 0 直到 {args.n}：\n    塞进（xs，i）\n")
+    print(f"{'循环':<10}{'一息息(秒)':>12}{'挨个(秒)':>12}{'每趟省(纳秒)':>14}{'加速':>8}")
+    for name, (while_source, for_source) in PAIRS.items():
+        while_time = timed(setup, while_source.format(n=args.n))
+        for_time = timed(setup, for_source.format(n=args.n))
+        saved = (while_time - for_time) / args.n * 1e9
+        print(f"{name:<10}{while_time:>12.3f}{for_time:>12.3f}{saved:>14.0f}{while_time / for_time:>7.2f}x")
+
+if __name__ == '__main__':
+    main()
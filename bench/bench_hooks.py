@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+执行钩子开销基准测试
+Tracing hook overhead benchmark
+
+没登记钩子、登记过又注销、登记一个空钩子三种情况对比。
+没登记过钩子的解释器走的就是原来的类，没有任何额外开销；
+登记过又注销的也回到原来的类，但 CPython 改过 __class__ 的实例属性访问会慢一点。
+
+用法:
+  python bench/bench_hooks.py
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from hooks import STATEMENT, CALL
+from interpreter import HangzhouInterpreter
+from output import create_sink
+from parser import parse_text
+
+WORKLOADS = {
+    '计数循环': '''
+老倌 i 装 0
+一息息 i 小过 200000：
+    i 装 i 加 1
+''',
+    '递归调用': '''
+会做事 斐波那契（老倌 n）：
+    特为 n 小等于 1：
+        有数 n
+    有数 斐波那契（n 减 1） 加 斐波那契（n 减 2）
+话说 斐波那契（20）
+''',
+}
+
+def noop(*args) -> None:
+    pass
+
+def make_interpreter(mode: str) -> HangzhouInterpreter:
+    interpreter = HangzhouInterpreter(memo_size=0, output=create_sink('discard'))
+    if mode in ('注销后', '空钩子'):
+        interpreter.register_hook(STATEMENT, noop)
+        interpreter.register_hook(CALL, noop)
+    if mode == '注销后':
+        interpreter.unregister_hook(STATEMENT, noop)
+        interpreter.unregister_hook(CALL, noop)
+    return interpreter
+
+def measure(source: str, mode: str, repeat: int) -> float:
+    """取 repeat 次里最快的一次"""
+    program = parse_text(source)
+    best = float('inf')
+    for _ in range(repeat):
+        interpreter = make_interpreter(mode)
+        start = time.perf_counter()
+        interpreter.interpret(program)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='执行钩子开销基准测试')
+    parser.add_argument('--repeat', type=int, default=5, help='每种情况跑几次取最快')
+    args = parser.parse_args()
+    
+    for name, source in WORKLOADS.items():
+        baseline = measure(source, '没钩子', args.repeat)
+        print(f"{name}:")
+        print(f"  没钩子    {baseline:8.3f} 秒")
+        for mode in ('注销后', '空钩子'):
+            elapsed = measure(source, mode, args.repeat)
+            print(f"  {mode}    {elapsed:8.3f} 秒  ({elapsed / baseline - 1:+.1%})")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+字符串插值基准测试："{甲}起床，{乙}做事体" 一次 join vs 一串 加 每步拼一个中间字符串
+String interpolation benchmark: one join for "{甲}...{乙}" vs a chain of 加 concatenations
+
+用法:
+  python bench/bench_interpolation.py
+  python bench/bench_interpolation.py --n 200000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from interpreter import HangzhouInterpreter
+from output import create_sink
+from parser import parse_text
+
+SETUP = """
+老倌 早上时间 装 "早半日"
+老倌 白天时间 装 "日里"
+老倌 夜晚时间 装 "夜里头"
+"""
+
+PROGRAMS = {
+    '一串 加': """
+挨个 i 从 0 直到 {n}：
+    老倌 日子 装 早上时间 加 "起床，" 加 白天时间 加 "做事体，" 加 夜晚时间 加 "睏觉。"
+""",
+    '插值': """
+挨个 i 从 0 直到 {n}：
+    老倌 日子 装 "{{早上时间}}起床，{{白天时间}}做事体，{{夜晚时间}}睏觉。"
+""",
+}
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='字符串插值基准测试')
+    parser.add_argument('--n', type=int, default=100000, help='拼几次')
+    args = parser.parse_args()
+
+    results = {}
+    for name, template in PROGRAMS.items():
+        interpreter = HangzhouInterpreter(output=create_sink('discard'))
+        interpreter.interpret(parse_text(SETUP))
+        program = parse_text(template.format(n=args.n))
+        start = time.perf_counter()
+        interpreter.interpret(program)
+        results[name] = time.perf_counter() - start
+        if interpreter.last_error is not None:
+            raise interpreter.last_error
+
+    print(f"{'写法':<10}{'总耗时(秒)':>12}{'每次(微秒)':>12}")
+    for name, elapsed in results.items():
+        print(f"{name:<10}{elapsed:>12.3f}{elapsed / args.n * 1e6:>12.2f}")
+    print(f"插值快 {results['一串 加'] / results['插值']:.2f} 倍")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+列表基准测试：塞进 建 10^6 个元素的列表、按下标扫一遍、切片视图，对照以前拿字符串拼接凑数组
+List benchmark: building and scanning 10^6-element lists, slice views, vs string-concatenation arrays
+
+用法:
+  python bench/bench_lists.py
+  python bench/bench_lists.py --n 1000000 --string-n 100000 200000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from interpreter import HangzhouInterpreter
+from output import create_sink
+from parser import parse_text
+
+BUILD = """
+老倌 xs 装 []
+老倌 i 装 0
+一息息 i 小过 {n}：
+    塞进（xs，i）
+    i 装 i 加 1
+话说 长度（xs）
+"""
+
+SCAN = """
+老倌 i 装 0
+老倌 s 装 0
+老倌 n 装 长度（xs）
+一息息 i 小过 n：
+    s 装 s 加 xs[i]
+    i 装 i 加 1
+话说 s
+"""
+
+SLICES = """
+老倌 i 装 0
+老倌 total 装 0
+一息息 i 小过 1000：
+    老倌 后半 装 xs[i：]
+    total 装 total 加 长度（后半）
+    i 装 i 加 1
+话说 total
+"""
+
+STRING_BUILD = """
+老倌 s 装 ""
+老倌 i 装 0
+一息息 i 小过 {n}：
+    s 装 s 加 "x,"
+    i 装 i 加 1
+话说 长度（s）
+"""
+
+def timed(interpreter: HangzhouInterpreter, source: str) -> float:
+    program = parse_text(source)
+    start = time.perf_counter()
+    interpreter.interpret(program)
+    elapsed = time.perf_counter() - start
+    if interpreter.last_error is not None:
+        raise interpreter.last_error
+    return elapsed
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='列表基准测试')
+    parser.add_argument('--n', type=int, default=1000000, help='列表元素个数')
+    parser.add_argument('--string-n', type=int, nargs='+', default=[50000, 100000, 200000],
+                        help='字符串拼接对照组的规模（平方级，别太大）')
+    args = parser.parse_args()
+
+    interpreter = HangzhouInterpreter(output=create_sink('capture'))
+    build = timed(interpreter, BUILD.format(n=args.n))
+    scan = timed(interpreter, SCAN)
+    slices = timed(interpreter, SLICES)
+
+    print(f"{'操作':<28}{'总耗时(秒)':>12}{'每元素(微秒)':>14}")
+    print(f"{f'塞进 建 {args.n} 个元素':<28}{build:>12.3f}{build / args.n * 1e6:>14.2f}")
+    print(f"{f'按下标扫 {args.n} 个元素':<28}{scan:>12.3f}{scan / args.n * 1e6:>14.2f}")
+    print(f"{'1000 个大切片（视图）':<28}{slices:>12.3f}{slices / 1000 * 1e6:>14.2f}")
+
+    for n in args.string_n:
+        elapsed = timed(HangzhouInterpreter(output=create_sink('capture')), STRING_BUILD.format(n=n))
+        print(f"{f'字符串拼接凑 {n} 个元素':<28}{elapsed:>12.3f}{elapsed / n * 1e6:>14.2f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+模块缓存基准测试：大模块第一次解析、从 __hzcache__ 读回来、同一个进程里再导入
+Module cache benchmark: parsing a large module, loading it from __hzcache__, and a warm in-process import
+
+用法:
+  python bench/bench_modules.py
+  python bench/bench_modules.py --functions 5000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from modules import CompiledModuleCache
+
+def module_source(functions: int) -> str:
+    """生成一个有很多小函数的模块"""
+    lines = []
+    for i in range(functions):
+        lines.append(f"会做事 函数{i}（x，y）：")
+        lines.append(f"    要是 x 大过 y：")
+        lines.append(f"        有数 \"大 {{x 加 {i}}}\"")
+        lines.append(f"    有数 [x，y，{i}]")
+    return "\n".join(lines) + "\n"
+
+def timed(cache: CompiledModuleCache, path: str) -> float:
+    start = time.perf_counter()
+    cache.load('大模块', path)
+    return time.perf_counter() - start
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='模块缓存基准测试')
+    parser.add_argument('--functions', type=int, default=2000, help='模块里函数的个数')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, '大模块.hz')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(module_source(args.functions))
+
+        cache = CompiledModuleCache()
+        parse = timed(cache, path)
+        warm = timed(cache, path)
+        disk = timed(CompiledModuleCache(), path)  # 新的进程：内存里没有，读缓存文件
+
+        print(f"{args.functions} 个函数的模块（{os.path.getsize(path) // 1024} KB）")
+        print(f"{'方式':<20}{'耗时(毫秒)':>12}")
+        print(f"{'解析源码':<20}{parse * 1000:>12.2f}")
+        print(f"{'读 __hzcache__':<20}{disk * 1000:>12.2f}")
+        print(f"{'进程里已经有':<20}{warm * 1000:>12.3f}")
+        print(f"缓存文件比解析快 {parse / disk:.1f} 倍")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+话说 输出方式基准测试：打印 10^6 行
+Output sink benchmark: print 10^6 lines
+
+用法:
+  python bench/bench_output.py              # 只测输出目的地本身
+  python bench/bench_output.py --program    # 再加上解释执行整个程序
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from interpreter import HangzhouInterpreter
+from output import OUTPUT_MODES, create_sink
+from parser import parse_text
+
+PROGRAM = '''
+老倌 i 装 0
+一息息 i 小过 {lines}：
+    话说 i
+    i 装 i 加 1
+'''
+
+def bench_print_per_line(lines: int, devnull) -> float:
+    """老办法：每行 print 一次再 flush（相当于终端上每行一次系统调用）"""
+    start = time.perf_counter()
+    for i in range(lines):
+        print(str(i), file=devnull, flush=True)
+    return time.perf_counter() - start
+
+def bench_sink(mode: str, lines: int, devnull) -> float:
+    """直接往输出目的地里写"""
+    sink = create_sink(mode, devnull)
+    sink.reset()
+    start = time.perf_counter()
+    for i in range(lines):
+        sink.write(str(i))
+    sink.flush()
+    return time.perf_counter() - start
+
+def bench_program(mode: str, lines: int, devnull) -> float:
+    """解释执行一个打印 lines 行的程序"""
+    program = parse_text(PROGRAM.format(lines=lines))
+    interpreter = HangzhouInterpreter(output=create_sink(mode, devnull))
+    start = time.perf_counter()
+    interpreter.interpret(program)
+    return time.perf_counter() - start
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='话说 输出方式基准测试')
+    parser.add_argument('--lines', type=int, default=1000000, help='打印的行数（默认 10^6）')
+    parser.add_argument('--program', action='store_true', help='同时测解释执行整个程序')
+    args = parser.parse_args()
+    
+    with open(os.devnull, 'w') as devnull:
+        print(f"打印 {args.lines} 行到 {os.devnull}:")
+        print(f"  {'print+flush 每行':<16}{bench_print_per_line(args.lines, devnull):8.3f} 秒")
+        for mode in OUTPUT_MODES:
+            print(f"  {mode:<16}{bench_sink(mode, args.lines, devnull):8.3f} 秒")
+        
+        if args.program:
+            print("解释执行整个程序:")
+            for mode in OUTPUT_MODES:
+                print(f"  {mode:<16}{bench_program(mode, args.lines, devnull):8.3f} 秒")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+预先 fork 基准测试：工作进程的 USS（只属于它自己的内存），fork 前 gc.freeze() 与否，
+以及开场脚本里的函数都被调用到、二元运算都特化过以后的 USS
+Prefork benchmark: per-worker USS with and without gc.freeze() before fork, and after quickening
+
+用法:
+  python bench/bench_prefork.py
+  python bench/bench_prefork.py --workers 8 --functions 20000 --requests 200
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+sys.path.insert(0, SRC)
+
+from client import connect, run_remote
+from governor import process_memory
+from protocol import send_frame, recv_frame
+from quicken import QUICKEN_THRESHOLD
+
+class DiscardStream:
+    def write(self, text: str) -> None:
+        pass
+
+    def flush(self) -> None:
+        pass
+
+def make_functions(prefix: str, functions: int) -> str:
+    """functions 个函数定义"""
+    lines = []
+    for i in range(functions):
+        lines.append(f"会做事 {prefix}{i}（老倌 x）：")
+        lines.append(f"    老倌 y 装 x 乘 {i} 加 1")
+        lines.append(f"    要是 y 大过 10：")
+        lines.append(f"        有数 y 减 {i}")
+        lines.append(f"    有数 y")
+    return '\n'.join(lines)
+
+def make_request(number: int, functions: int) -> str:
+    """每个请求都是不一样的源码（会留在程序缓存里），调用开场脚本里的函数"""
+    return make_functions(f"请求{number}_", functions) + f"\n话说 工具{number}（3） 加 请求{number}_1（4）"
+
+def make_quickening_request(functions: int) -> str:
+    """把开场脚本里每个函数调用够特化的次数，每个工作进程都收到几个以后，模板的二元运算就都特化过了"""
+    lines = [f"挨个 j 从 0 直到 {QUICKEN_THRESHOLD * 2}："]
+    lines.extend(f"    工具{i}（j）" for i in range(functions))
+    return '\n'.join(lines)
+
+def wait_for_server(socket_path: str, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with connect(socket_path) as sock:
+                send_frame(sock, {'op': 'ping'})
+                if recv_frame(sock):
+                    return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError("守护进程没起来")
+
+def children(pid: int):
+    with open(f'/proc/{pid}/task/{pid}/children') as f:
+        return [int(child) for child in f.read().split()]
+
+def measure(library: str, functions: int, workers: int, requests: int, request_size: int, freeze: bool):
+    """
+    起一个预先 fork 的服务，跑一批请求，返回 (父进程内存, 各工作进程内存, 特化以后各工作进程内存)
+    请求的程序都留在程序缓存里，长寿对象越来越多，工作进程迟早会做完整的垃圾回收，
+    不冻结的话这时会把从父进程继承来的对象全部碰一遍。
+    特化的计数记在每个工作进程自己的表里，不写共享的语法树节点；特化以后 USS 还是会涨，
+    一是预热请求自己的语法树，二是 Python 3.12 以前碰一下对象就要改它的引用计数，
+    执行到的开场脚本节点所在的页照样会被复制。
+    """
+    socket_path = os.path.join(tempfile.mkdtemp(), 'bench.sock')
+    command = [sys.executable, os.path.join(SRC, 'hangzhoulang.py'), 'serve', '--socket', socket_path,
+               '--workers', str(workers), '--prelude', library]
+    if not freeze:
+        command.append('--no-freeze')
+    server = subprocess.Popen(command, stderr=subprocess.DEVNULL)
+    try:
+        wait_for_server(socket_path)
+        for number in range(requests):
+            done = run_remote(socket_path, {'op': 'run', 'source': make_request(number, request_size)},
+                              DiscardStream())
+            assert done['status'] == 'ok', done
+        time.sleep(0.5)
+        before = [process_memory(child) for child in children(server.pid)]
+        warm = make_quickening_request(functions)
+        for _ in range(workers * 4):  # 请求随便哪个工作进程接，多发几个让每个都轮到
+            done = run_remote(socket_path, {'op': 'run', 'source': warm}, DiscardStream())
+            assert done['status'] == 'ok', done
+        time.sleep(0.5)
+        return process_memory(server.pid), before, [process_memory(child) for child in children(server.pid)]
+    finally:
+        server.terminate()
+        server.wait()
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='预先 fork 基准测试')
+    parser.add_argument('--workers', type=int, default=4, help='工作进程数')
+    parser.add_argument('--functions', type=int, default=10000, help='开场脚本里有多少个函数')
+    parser.add_argument('--requests', type=int, default=200, help='一共发多少个请求')
+    parser.add_argument('--request-size', type=int, default=100, help='每个请求的程序里有多少个函数')
+    args = parser.parse_args()
+
+    if not process_memory():
+        print("这个系统读不到 /proc/<pid>/smaps_rollup，没法量 USS")
+        return
+
+    library = os.path.join(tempfile.mkdtemp(), 'library.hz')
+    with open(library, 'w', encoding='utf-8') as f:
+        f.write(make_functions('工具', args.functions))
+
+    mb = 1024 * 1024
+    print(f"{args.workers} 个工作进程，开场脚本 {args.functions} 个函数，"
+          f"{args.requests} 个请求（每个 {args.request_size} 个函数）")
+    print(f"{'模式':<12}{'父进程RSS(MB)':>14}{'平均USS(MB)':>12}{'平均PSS(MB)':>12}{'平均RSS(MB)':>12}"
+          f"{'特化后USS(MB)':>14}")
+    for freeze in (False, True):
+        parent, workers, quickened = measure(library, args.functions, args.workers, args.requests,
+                                             args.request_size, freeze)
+        average = {key: sum(memory[key] for memory in workers) / len(workers) / mb for key in ('uss', 'pss', 'rss')}
+        after = sum(memory['uss'] for memory in quickened) / len(quickened) / mb
+        name = 'gc.freeze' if freeze else '不冻结'
+        print(f"{name:<12}{parent['rss'] / mb:>14.1f}{average['uss']:>12.1f}{average['pss']:>12.1f}{average['rss']:>12.1f}"
+              f"{after:>14.1f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+守护进程基准测试：每次冷启动 hangzhoulang vs 让常驻的 hangzhoulang serve 跑
+Daemon benchmark: cold CLI invocations vs a warm hangzhoulang serve
+
+用法:
+  python bench/bench_serve.py
+  python bench/bench_serve.py test/examples/fibonacci.hz --count 50
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+sys.path.insert(0, SRC)
+
+from client import connect, run_remote
+from protocol import send_frame, recv_frame
+
+class DiscardStream:
+    def write(self, text: str) -> None:
+        pass
+
+    def flush(self) -> None:
+        pass
+
+def per_invocation(command, count: int) -> float:
+    """平均每次耗时（毫秒）"""
+    start = time.perf_counter()
+    for _ in range(count):
+        subprocess.run(command, stdout=subprocess.DEVNULL, check=True)
+    return (time.perf_counter() - start) / count * 1000
+
+def wait_for_server(socket_path: str, timeout: float = 10.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with connect(socket_path) as sock:
+                send_frame(sock, {'op': 'ping'})
+                if recv_frame(sock):
+                    return
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError("守护进程没起来")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='守护进程基准测试')
+    parser.add_argument('file', nargs='?', default=os.path.join(SRC, '..', 'test', 'examples', 'hangzhou_life.hz'))
+    parser.add_argument('--count', type=int, default=20, help='每种方式跑多少次')
+    args = parser.parse_args()
+    path = os.path.abspath(args.file)
+
+    socket_path = os.path.join(tempfile.mkdtemp(), 'bench.sock')
+    server = subprocess.Popen([sys.executable, os.path.join(SRC, 'hangzhoulang.py'), 'serve', '--socket', socket_path])
+    try:
+        wait_for_server(socket_path)
+
+        cold = per_invocation([sys.executable, os.path.join(SRC, 'hangzhoulang.py'), path], args.count)
+        client = per_invocation([sys.executable, os.path.join(SRC, 'client.py'), '--socket', socket_path, path],
+                                args.count)
+
+        start = time.perf_counter()
+        for _ in range(args.count):
+            run_remote(socket_path, {'op': 'run', 'path': path}, DiscardStream())
+        in_process = (time.perf_counter() - start) / args.count * 1000
+    finally:
+        server.terminate()
+        server.wait()
+
+    print(f"{'方式':<24}{'每次(毫秒)':>12}")
+    print(f"{'冷启动 hangzhoulang':<24}{cold:>12.1f}")
+    print(f"{'client.py 命令':<24}{client:>12.1f}")
+    print(f"{'已连上的客户端（不含启动）':<24}{in_process:>12.2f}")
+
+if __name__ == '__main__':
+    main()
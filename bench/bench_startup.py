@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+启动时间基准测试：python -X importtime 下导入 hangzhoulang 的累计耗时，外加跑一个小脚本的总耗时
+Startup benchmark: cumulative `python -X importtime` cost of importing hangzhoulang, plus a small script run
+
+导入耗时超过 --target（默认 30 毫秒）时退出码为 1，可以当回归检查用。
+
+用法:
+  python bench/bench_startup.py
+  python bench/bench_startup.py --runs 20 --top 15 --target 30
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+HELLO = os.path.join(SRC, '..', 'test', 'examples', 'hello_world.hz')
+
+# 跑脚本时不该导入的模块：用到相应功能才导入
+DEFERRED_MODULES = ('argparse', 'pickle', 'random', 'profiler', 'threading', 'vocabulary', 'numpy')
+
+def import_times(module: str) -> dict:
+    """在新进程里导入一次 module，返回 {模块名: 累计微秒}"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            cwd=SRC, capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(cumulative)
+    return times
+
+def loaded_modules(arguments: list) -> set:
+    """跑一遍 hangzhoulang，返回最后导入了哪些模块"""
+    probe = ('import sys, hangzhoulang; sys.argv = ["hangzhoulang"] + sys.argv[1:]; '
+             'hangzhoulang.main(); print(" ".join(sys.modules), file=sys.stderr)')
+    result = subprocess.run([sys.executable, '-c', probe] + arguments,
+                            cwd=SRC, capture_output=True, text=True, check=True)
+    return set(result.stderr.split())
+
+def wall_time(arguments: list, runs: int) -> float:
+    """整个进程跑 runs 遍的最短耗时（秒）"""
+    best = float('inf')
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, 'hangzhoulang.py'] + arguments, cwd=SRC,
+                       stdout=subprocess.DEVNULL, check=True)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='启动时间基准测试')
+    parser.add_argument('--runs', type=int, default=10, help='重复次数，取最小值（默认 10）')
+    parser.add_argument('--top', type=int, default=10, help='列出导入最慢的几个模块（默认 10）')
+    parser.add_argument('--target', type=float, default=30.0, help='导入耗时目标（毫秒，默认 30）')
+    args = parser.parse_args()
+
+    samples = [import_times('hangzhoulang') for _ in range(args.runs)]
+    totals = [sample['hangzhoulang'] / 1000 for sample in samples]
+    best = min(totals)
+    fastest = samples[totals.index(best)]
+
+    print(f"导入 hangzhoulang（{args.runs} 次）: 最短 {best:.1f} 毫秒，"
+          f"中位数 {statistics.median(totals):.1f} 毫秒，目标 < {args.target:.0f} 毫秒")
+    print(f"\n{'模块':<24}{'累计(毫秒)':>12}")
+    ranked = sorted((item for item in fastest.items() if item[0] != 'hangzhoulang'),
+                    key=lambda item: item[1], reverse=True)
+    for name, cumulative in ranked[:args.top]:
+        print(f"{name:<24}{cumulative / 1000:>12.2f}")
+
+    loaded = loaded_modules([HELLO])
+    eager = [name for name in DEFERRED_MODULES if name in loaded]
+    print(f"\n跑 hello_world.hz 时提前导入的模块: {', '.join(eager) if eager else '没有'}")
+    print(f"整个进程跑 hello_world.hz: {wall_time([HELLO], args.runs) * 1000:.1f} 毫秒")
+    print(f"整个进程跑 --output capture hello_world.hz（走 argparse）: "
+          f"{wall_time(['--output', 'capture', HELLO], args.runs) * 1000:.1f} 毫秒")
+
+    if best >= args.target or eager:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+字符串拼接基准测试：循环里 结果 装 结果 加 "..." 拼 10^5 次，
+每次复制整个字符串 vs 变量里存拼接缓冲 vs 显式的 拼串
+String building benchmark: 10^5 appends, copying concatenation vs the rope buffer vs 拼串
+
+用法:
+  python bench/bench_strings.py
+  python bench/bench_strings.py --n 25000 50000 100000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import interpreter as interpreter_module
+from interpreter import HangzhouInterpreter
+from output import create_sink
+from parser import parse_text
+
+CONCAT = """
+老倌 结果 装 ""
+挨个 i 从 0 直到 {n}：
+    结果 装 结果 加 "第几行，"
+话说 长度（结果）
+"""
+
+BUILDER = """
+老倌 结果 装 拼串（）
+挨个 i 从 0 直到 {n}：
+    塞进（结果，"第几行，"）
+话说 长度（拼好（结果））
+"""
+
+def timed(source: str, rope_threshold: int) -> float:
+    interpreter_module.ROPE_THRESHOLD = rope_threshold
+    sink = create_sink('capture')
+    interpreter = HangzhouInterpreter(output=sink)
+    program = parse_text(source)
+    start = time.perf_counter()
+    interpreter.interpret(program)
+    elapsed = time.perf_counter() - start
+    if interpreter.last_error is not None:
+        raise interpreter.last_error
+    return elapsed
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='字符串拼接基准测试')
+    parser.add_argument('--n', type=int, nargs='+', default=[25000, 50000, 100000], help='拼几次')
+    args = parser.parse_args()
+
+    default_threshold = interpreter_module.ROPE_THRESHOLD
+    print(f"{'拼几次':>8}{'每次复制(秒)':>14}{'拼接缓冲(秒)':>14}{'拼串(秒)':>12}{'加速':>8}")
+    for n in args.n:
+        copying = timed(CONCAT.format(n=n), sys.maxsize)
+        rope = timed(CONCAT.format(n=n), default_threshold)
+        builder = timed(BUILDER.format(n=n), default_threshold)
+        print(f"{n:>8}{copying:>14.3f}{rope:>14.3f}{builder:>12.3f}{copying / rope:>7.1f}x")
+
+if __name__ == '__main__':
+    main()
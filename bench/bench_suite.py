@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+基准测试套件：词法分析、语法分析、解释器各种操作的微基准，加上用杭州话写的宏观负载
+Benchmark suite: lexer, parser and per-operation interpreter microbenchmarks plus macro workloads in Hangzhou
+
+每个基准先预热几遍再重复测，结果（每次的耗时、平均、标准差、95% 置信区间）写成 JSON；
+compare 比较两个结果文件，变慢超过阈值、置信区间又不重叠的算回归，有回归时退出码为 1。
+
+用法:
+  python bench/bench_suite.py run -o before.json
+  python bench/bench_suite.py run --repetitions 20 --warmup 3 --filter 微观 -o after.json
+  python bench/bench_suite.py compare before.json after.json --threshold 0.05
+"""
+
+import argparse
+import datetime
+import json
+import math
+import os
+import platform
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+BENCH = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH, '..', 'src'))
+
+from interpreter import HangzhouInterpreter
+from lexer import tokenize
+from output import create_sink
+from parser import parse_text
+
+WORKLOADS = os.path.join(BENCH, 'workloads')
+
+# 每个微基准循环的次数，结果里的 per_op 按这个摊
+MICRO_LOOPS = 20000
+
+# 解释器操作的微基准：{操作} 放进一个 挨个 循环里跑 MICRO_LOOPS 遍，
+# 和 空循环 比就晓得操作本身的开销
+MICRO_SETUP = """
+老倌 x 装 3
+老倌 y 装 4
+老倌 s 装 "杭州"
+老倌 xs 装 [1，2，3，4，5]
+老倌 d 装 {"西湖"：1，"钱塘江"：2}
+会做事 加一（老倌 n）：
+    有数 n 加 1
+"""
+
+MICRO_OPERATIONS = {
+    '空循环': '老倌 z 装 0',
+    '整数加法': 'x 装 y 加 1',
+    '浮点乘法': 'x 装 y 乘 1.5',
+    '比较': 'x 装 y 小过 10',
+    '变量读写': 'x 装 y',
+    '要是分支': '要是 y 大过 3：\n        x 装 1\n    不然：\n        x 装 2',
+    '函数调用': 'x 装 加一（y）',
+    '内置函数': 'x 装 长度（s）',
+    '列表下标': 'x 装 xs[2]',
+    '字典查表': 'x 装 d["西湖"]',
+    '字符串拼接': 'x 装 s 加 "人"',
+    '字符串插值': 'x 装 "{s}{y}"',
+    '话说': '话说 y',
+}
+
+# 95% 双侧 t 分布临界值，自由度 1..30；再多就用正态分布的 1.96
+_T_CRITICAL = (
+    12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+    2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+    2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042,
+)
+
+class Benchmark(NamedTuple):
+    """一个基准：setup 准备好以后返回每次要计时的函数"""
+    name: str
+    group: str
+    setup: Callable[[], Callable[[], None]]
+    operations: int = 1  # 每次计时里做了多少次操作，用来算 per_op
+
+def confidence_interval(samples: List[float]) -> tuple:
+    """平均值的 95% 置信区间（t 分布）"""
+    mean = statistics.mean(samples)
+    if len(samples) < 2:
+        return mean, mean
+    degrees = len(samples) - 1
+    critical = _T_CRITICAL[degrees - 1] if degrees <= len(_T_CRITICAL) else 1.96
+    margin = critical * statistics.stdev(samples) / math.sqrt(len(samples))
+    return mean - margin, mean + margin
+
+def program_runner(source: str) -> Callable[[], Callable[[], None]]:
+    """解析一次，每次计时用新的解释器跑（不记忆化，免得量到的是缓存）"""
+    def setup() -> Callable[[], None]:
+        program = parse_text(source)
+
+        def run() -> None:
+            interpreter = HangzhouInterpreter(memo_size=0, output=create_sink('discard'))
+            interpreter.interpret(program)
+            if interpreter.last_error is not None:
+                raise interpreter.last_error
+        return run
+    return setup
+
+def generated_source(functions: int = 300) -> str:
+    """生成的大源文件：一堆函数定义、变量、条件和调用"""
+    lines = []
+    for i in range(functions):
+        lines.append(f'会做事 事体{i}（老倌 甲，老倌 乙）：')
+        lines.append(f'    老倌 和 装 甲 加 乙 乘 {i}')
+        lines.append(f'    要是 和 大过 {i * 7}：')
+        lines.append(f'        有数 和 减 长度（"{i}"）')
+        lines.append('    不然：')
+        lines.append(f'        有数 [甲，乙，{i}][0]')
+    lines.append('老倌 结果 装 0')
+    for i in range(functions):
+        lines.append(f'结果 装 结果 加 事体{i}（{i}，2）')
+    lines.append('话说 "结果是 {结果}"')
+    return '\n'.join(lines) + '\n'
+
+def micro_benchmarks() -> List[Benchmark]:
+    """微基准：词法分析、语法分析，和解释器的每种操作"""
+    large = generated_source()
+    benchmarks = [
+        Benchmark('微观/词法分析', 'micro', lambda: lambda: tokenize(large), large.count('\n')),
+        Benchmark('微观/语法分析', 'micro', lambda: lambda: parse_text(large), large.count('\n')),
+    ]
+    for name, operation in MICRO_OPERATIONS.items():
+        source = MICRO_SETUP + f'挨个 i 从 0 直到 {MICRO_LOOPS}：\n    {operation}\n'
+        benchmarks.append(Benchmark(f'微观/{name}', 'micro', program_runner(source), MICRO_LOOPS))
+    return benchmarks
+
+def macro_benchmarks() -> List[Benchmark]:
+    """宏观负载：bench/workloads 下的杭州话程序，加上一个生成的大源文件从头跑到尾"""
+    benchmarks = []
+    for filename in sorted(os.listdir(WORKLOADS)):
+        if not filename.endswith('.hz'):
+            continue
+        with open(os.path.join(WORKLOADS, filename), 'r', encoding='utf-8') as f:
+            source = f.read()
+        benchmarks.append(Benchmark(f'宏观/{os.path.splitext(filename)[0]}', 'macro', program_runner(source)))
+
+    large = generated_source(1000)
+
+    def parse_and_run() -> Callable[[], None]:
+        def run() -> None:
+            interpreter = HangzhouInterpreter(memo_size=0, output=create_sink('discard'))
+            interpreter.interpret(parse_text(large))
+            if interpreter.last_error is not None:
+                raise interpreter.last_error
+        return run
+    benchmarks.append(Benchmark('宏观/大源文件', 'macro', parse_and_run))
+    return benchmarks
+
+def measure(benchmark: Benchmark, warmup: int, repetitions: int) -> Dict:
+    """预热 warmup 遍，再计时 repetitions 遍"""
+    run = benchmark.setup()
+    for _ in range(warmup):
+        run()
+    samples = []
+    for _ in range(repetitions):
+        start = time.perf_counter()
+        run()
+        samples.append(time.perf_counter() - start)
+    low, high = confidence_interval(samples)
+    mean = statistics.mean(samples)
+    return {
+        'group': benchmark.group,
+        'unit': 's',
+        'warmup': warmup,
+        'repetitions': repetitions,
+        'operations': benchmark.operations,
+        'samples': samples,
+        'mean': mean,
+        'median': statistics.median(samples),
+        'min': min(samples),
+        'stdev': statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        'ci95': [low, high],
+        'per_op': mean / benchmark.operations,
+    }
+
+def run_suite(args: argparse.Namespace) -> int:
+    """跑选中的基准，打表，写 JSON"""
+    benchmarks = micro_benchmarks() + macro_benchmarks()
+    if args.filter:
+        benchmarks = [benchmark for benchmark in benchmarks if args.filter in benchmark.name]
+
+    results = {}
+    print(f"{'基准':<20}{'平均(毫秒)':>12}{'±95%':>10}{'每次操作(微秒)':>16}")
+    for benchmark in benchmarks:
+        result = measure(benchmark, args.warmup, args.repetitions)
+        results[benchmark.name] = result
+        margin = (result['ci95'][1] - result['ci95'][0]) / 2
+        per_op = f"{result['per_op'] * 1e6:.3f}" if benchmark.operations > 1 else '-'
+        print(f"{benchmark.name:<20}{result['mean'] * 1000:>12.2f}{margin * 1000:>10.2f}{per_op:>16}")
+
+    document = {
+        'meta': {
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+            'date': datetime.datetime.now().isoformat(timespec='seconds'),
+        },
+        'benchmarks': results,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(document, f, ensure_ascii=False, indent=2)
+        print(f"\n结果已写到 {args.output}")
+    return 0
+
+def compare_results(args: argparse.Namespace) -> int:
+    """比较两个结果文件，变慢超过阈值并且置信区间不重叠的算回归"""
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)['benchmarks']
+    with open(args.current, 'r', encoding='utf-8') as f:
+        current = json.load(f)['benchmarks']
+
+    regressions = 0
+    print(f"{'基准':<20}{'之前(毫秒)':>12}{'现在(毫秒)':>12}{'变化':>10}  结论")
+    for name in sorted(baseline.keys() & current.keys()):
+        old, new = baseline[name], current[name]
+        change = new['mean'] / old['mean'] - 1
+        if change > args.threshold and new['ci95'][0] > old['ci95'][1]:
+            verdict = '回归'
+            regressions += 1
+        elif change < -args.threshold and new['ci95'][1] < old['ci95'][0]:
+            verdict = '变快'
+        else:
+            verdict = '差不多'
+        print(f"{name:<20}{old['mean'] * 1000:>12.2f}{new['mean'] * 1000:>12.2f}{change:>+10.1%}  {verdict}")
+
+    for name in sorted(baseline.keys() - current.keys()):
+        print(f"{name:<20}  只在 {args.baseline} 里有")
+    for name in sorted(current.keys() - baseline.keys()):
+        print(f"{name:<20}  只在 {args.current} 里有")
+
+    print(f"\n{regressions} 个回归（阈值 {args.threshold:.0%}）")
+    return 1 if regressions else 0
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='基准测试套件')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('run', help='跑基准，结果写成 JSON')
+    run.add_argument('--output', '-o', help='结果 JSON 文件')
+    run.add_argument('--warmup', type=int, default=2, help='每个基准预热几遍（默认 2）')
+    run.add_argument('--repetitions', '-r', type=int, default=10, help='每个基准计时几遍（默认 10）')
+    run.add_argument('--filter', '-k', help='只跑名字里带这个字符串的基准，比如 微观 或者 宏观/fibonacci')
+
+    compare = commands.add_parser('compare', help='比较两个结果文件，找回归')
+    compare.add_argument('baseline', help='之前的结果 JSON')
+    compare.add_argument('current', help='现在的结果 JSON')
+    compare.add_argument('--threshold', type=float, default=0.05, help='变慢多少算回归（默认 0.05，即 5%%）')
+
+    args = parser.parse_args(argv)
+    if args.command == 'run':
+        return run_suite(args)
+    return compare_results(args)
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+解释器模板基准测试：每个请求新建解释器并跑开场脚本 vs 从模板克隆
+Interpreter template benchmark: fresh interpreter + prelude vs template clone
+
+用法:
+  python bench/bench_template.py
+  python bench/bench_template.py --sizes 0 100 1000 5000
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from interpreter import HangzhouInterpreter
+from output import create_sink
+from parser import parse_text
+from template import InterpreterTemplate
+
+def make_prelude(size: int) -> str:
+    """size 个常量加 size 个函数定义"""
+    lines = []
+    for i in range(size):
+        lines.append(f"老倌 常量{i} 装 {i}")
+        lines.append(f"会做事 工具{i}（老倌 x）：")
+        lines.append(f"    有数 x 加 常量{i}")
+    return '\n'.join(lines)
+
+def per_call(func, count: int) -> float:
+    """平均每次耗时（微秒）"""
+    start = time.perf_counter()
+    for _ in range(count):
+        func()
+    return (time.perf_counter() - start) / count * 1e6
+
+def memory_per_clone(func, count: int) -> float:
+    """每个克隆占的内存（KB），克隆都留着不释放"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    keep = [func() for _ in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / len(keep) / 1024
+
+# 开场脚本里能就地改的值：每个克隆改的都是自己那份
+MUTABLE_PRELUDE = """
+老倌 名单 装 [[1]，2]
+老倌 别名 装 名单
+老倌 表 装 {"西湖"：[1]}
+老倌 集 装 {1，2}
+老倌 串 装 拼串（"杭"）
+"""
+
+MUTATE = """
+塞进（名单，3）
+塞进（名单[0]，4）
+塞进（表["西湖"]，5）
+塞进（集，6）
+塞进（串，"州"）
+话说 名单
+话说 别名
+话说 表
+话说 串
+"""
+
+def check_clone_isolation() -> None:
+    """两个克隆先后改开场脚本里的列表、字典、集合、拼串，后一个看到的还得是模板原样"""
+    template = InterpreterTemplate(parse_text(MUTABLE_PRELUDE))
+    program = parse_text(MUTATE)
+    outputs = []
+    for _ in range(2):
+        interpreter = template.clone(output=create_sink('capture'))
+        outputs.append(interpreter.interpret(program))
+        if interpreter.last_error is not None:
+            raise interpreter.last_error
+    assert outputs[0] == outputs[1], f"克隆之间互相影响了: {outputs}"
+    assert outputs[0][0] == outputs[0][1], f"同一个克隆里两个变量指着同一个列表，拷贝以后也该是同一个: {outputs[0]}"
+    assert template.interpreter.stringify(template.global_env.variables['名单']) == '[[1], 2]'
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='解释器模板基准测试')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[0, 100, 1000], help='开场脚本的规模')
+    parser.add_argument('--count', type=int, default=200, help='每种情况建多少个解释器')
+    args = parser.parse_args()
+    
+    check_clone_isolation()
+    print(f"{'开场规模':<8}{'新建+开场(微秒)':>16}{'克隆(微秒)':>12}{'新建内存(KB)':>14}{'克隆内存(KB)':>14}")
+    for size in args.sizes:
+        program = parse_text(make_prelude(size))
+        template = InterpreterTemplate(program)
+        
+        def fresh():
+            interpreter = HangzhouInterpreter(output=create_sink('discard'))
+            interpreter.interpret(program)
+            return interpreter
+        
+        def clone():
+            return template.clone(output=create_sink('discard'))
+        
+        count = max(10, args.count // max(1, size // 100))
+        print(f"{size:<8}{per_call(fresh, count):>16.1f}{per_call(clone, args.count):>12.1f}"
+              f"{memory_per_clone(fresh, count):>14.1f}{memory_per_clone(clone, args.count):>14.1f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,256 @@
+# -*- coding: utf-8 -*-
+"""
+杭州话编程语言数值数组
+Hangzhou Dialect Programming Language Numeric Arrays
+
+装了 NumPy 就用 ndarray，没装就用标准库的 array('q')/array('d')。NumPy 要第一次建数组时才导入，
+导入一次要几十毫秒，不用数组的脚本不该付这个钱。
+加减乘除对数组逐个元素算，数组和数字运算时数字会“广播”到每个元素上，
+整个数组一次算完，不用在杭州话里写 一息息 一个一个算。
+"""
+
+import operator
+import os
+from array import array
+from itertools import repeat
+from typing import Any, Iterable, Iterator, List, Optional, Union
+
+# 环境变量 HANGZHOULANG_ARRAY_BACKEND=array 可以在装了 NumPy 时也用标准库
+_use_numpy = os.environ.get('HANGZHOULANG_ARRAY_BACKEND', 'numpy') != 'array'
+
+# 导入过的 numpy 模块；_numpy_imported 为真以后 None 表示没装
+_numpy: Any = None
+_numpy_imported = False
+
+# 运算符（含杭州话写法）对应的逐元素运算
+_KERNELS = {
+    '+': operator.add, '加': operator.add,
+    '-': operator.sub, '减': operator.sub,
+    '*': operator.mul, '乘': operator.mul,
+    '/': operator.truediv, '除': operator.truediv,
+}
+
+Number = Union[int, float]
+
+def _import_numpy() -> Any:
+    """第一次调用时导入 NumPy（NumPy 是可选的），没装返回None"""
+    global _numpy, _numpy_imported
+    if not _numpy_imported:
+        _numpy_imported = True
+        try:
+            import numpy
+            _numpy = numpy
+        except ImportError:
+            _numpy = None
+    return _numpy
+
+def _active_numpy() -> Any:
+    """新建数组用 NumPy 时返回 numpy 模块，用标准库时返回None"""
+    return _import_numpy() if _use_numpy else None
+
+def backend() -> str:
+    """当前用的后端：numpy 或 array"""
+    return 'numpy' if _active_numpy() is not None else 'array'
+
+def set_backend(name: str) -> None:
+    """换后端（只影响以后新建的数组），name 是 numpy 或 array"""
+    global _use_numpy
+    if name == 'numpy':
+        if _import_numpy() is None:
+            raise ImportError("没有装 NumPy")
+        _use_numpy = True
+    elif name == 'array':
+        _use_numpy = False
+    else:
+        raise ValueError(f"未知的数组后端: {name}")
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float))
+
+class NumericArray:
+    """
+    数值数组
+    data 是 numpy.ndarray 或者 array.array（整数 'q'，小数 'd'）。
+    和列表不一样，切片会复制。
+    """
+    __slots__ = ('data',)
+
+    def __init__(self, data: Any):
+        self.data = data
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __iter__(self) -> Iterator[Number]:
+        return iter(self.tolist())
+
+    def __eq__(self, other: Any) -> bool:
+        # 整个数组比较，结果是一个 真的/假的
+        if not isinstance(other, NumericArray):
+            return NotImplemented
+        return self.tolist() == other.tolist()
+
+    __hash__ = None
+
+    @property
+    def is_integer(self) -> bool:
+        if isinstance(self.data, array):
+            return self.data.typecode == 'q'
+        return self.data.dtype.kind in 'iu'
+
+    def tolist(self) -> List[Number]:
+        """复制成 Python 数字的列表"""
+        return self.data.tolist()
+
+    def _position(self, index: int) -> int:
+        length = len(self.data)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError(f"下标超出范围: {index}（长度 {length}）")
+        return index
+
+    def get(self, index: int) -> Number:
+        """取第 index 个元素"""
+        value = self.data[self._position(index)]
+        return _scalar(value)
+
+    def set(self, index: int, value: Number) -> None:
+        """改第 index 个元素；整数数组里放小数时整个数组变成小数数组"""
+        if not _is_number(value):
+            raise TypeError("数组里只能放数字")
+        position = self._position(index)
+        if isinstance(value, float) and self.is_integer:
+            self.data = array('d', self.data) if isinstance(self.data, array) else self.data.astype(float)
+        self.data[position] = value
+
+    def slice(self, start: Optional[int] = None, stop: Optional[int] = None) -> 'NumericArray':
+        """切片，复制出一个新数组"""
+        part = self.data[start:stop]
+        return NumericArray(part.copy() if hasattr(part, 'copy') else part)
+
+    # 逐元素运算：数组 运算 数组/数字，数字 运算 数组
+    def __add__(self, other): return elementwise('+', self, other)
+    def __radd__(self, other): return elementwise('+', other, self)
+    def __sub__(self, other): return elementwise('-', self, other)
+    def __rsub__(self, other): return elementwise('-', other, self)
+    def __mul__(self, other): return elementwise('*', self, other)
+    def __rmul__(self, other): return elementwise('*', other, self)
+    def __truediv__(self, other): return elementwise('/', self, other)
+    def __rtruediv__(self, other): return elementwise('/', other, self)
+
+    def __neg__(self) -> 'NumericArray':
+        return elementwise('*', self, -1)
+
+def elementwise(operator_name: str, left: Any, right: Any) -> NumericArray:
+    """逐元素运算的内核，至少有一边是数组，另一边是数组或数字"""
+    kernel = _KERNELS[operator_name]
+    for operand in (left, right):
+        if not isinstance(operand, NumericArray) and not _is_number(operand):
+            raise TypeError("数组只能和数字或者数组加减乘除")
+    if isinstance(left, NumericArray) and isinstance(right, NumericArray) and len(left) != len(right):
+        raise ValueError(f"两个数组长度不一样: {len(left)} 和 {len(right)}")
+
+    a = left.data if isinstance(left, NumericArray) else left
+    b = right.data if isinstance(right, NumericArray) else right
+
+    # 两边都不是 array.array，至少有一边是 ndarray，这时 NumPy 已经导入过了
+    if _use_numpy and not isinstance(a, array) and not isinstance(b, array):
+        with _numpy.errstate(divide='raise', invalid='raise'):
+            try:
+                return NumericArray(kernel(a, b))
+            except FloatingPointError:
+                raise ZeroDivisionError("除零错误")
+
+    # 标准库后端：map 配 operator 里的函数，循环在C里跑
+    integer = kernel is not operator.truediv and all(
+        operand.is_integer if isinstance(operand, NumericArray) else isinstance(operand, int)
+        for operand in (left, right))
+    if isinstance(left, NumericArray) and isinstance(right, NumericArray):
+        values = map(kernel, a, b)
+    elif isinstance(left, NumericArray):
+        values = map(kernel, a, repeat(b))
+    else:
+        values = map(kernel, repeat(a), b)
+    try:
+        return NumericArray(array('q' if integer else 'd', values))
+    except ZeroDivisionError:
+        raise ZeroDivisionError("除零错误")
+    except OverflowError:
+        raise OverflowError("整数超出64位范围，先换成小数再算")
+
+def make_array(values: Iterable[Any]) -> NumericArray:
+    """从一串数字建数组，全是整数就是整数数组，否则是小数数组"""
+    values = list(values)
+    for value in values:
+        if not _is_number(value):
+            raise TypeError(f"数组里只能放数字，不能放 {value!r}")
+    integer = all(isinstance(value, int) for value in values)
+    numpy = _active_numpy()
+    if numpy is not None:
+        return NumericArray(numpy.array(values, dtype=numpy.int64 if integer else numpy.float64))
+    try:
+        return NumericArray(array('q' if integer else 'd', values))
+    except OverflowError:
+        return NumericArray(array('d', values))
+
+def array_range(start: Number, stop: Optional[Number] = None, step: Number = 1) -> NumericArray:
+    """等差数组：[开始, 结束)，只给一个参数时从0开始"""
+    if stop is None:
+        start, stop = 0, start
+    if step == 0:
+        raise ValueError("步长不能是0")
+    numpy = _active_numpy()
+    if all(isinstance(value, int) for value in (start, stop, step)):
+        if numpy is not None:
+            return NumericArray(numpy.arange(start, stop, step, dtype=numpy.int64))
+        return NumericArray(array('q', range(start, stop, step)))
+    if numpy is not None:
+        return NumericArray(numpy.arange(start, stop, step, dtype=numpy.float64))
+    count = max(0, int(-(-(stop - start) // step)))
+    return NumericArray(array('d', (start + i * step for i in range(count))))
+
+def _values(values: Any) -> Any:
+    """归约函数的参数：数组取底层数据，列表取元素"""
+    if isinstance(values, NumericArray):
+        return values.data
+    if hasattr(values, 'to_list'):
+        return values.to_list()
+    raise TypeError("要给一个数组或者列表")
+
+def _scalar(value: Any) -> Number:
+    return value.item() if hasattr(value, 'item') else value
+
+def total(values: Any) -> Number:
+    """求和"""
+    data = _values(values)
+    if _use_numpy and not isinstance(data, (array, list)):
+        return _scalar(data.sum())
+    return sum(data)
+
+def minimum(values: Any) -> Number:
+    """最小值"""
+    data = _values(values)
+    if len(data) == 0:
+        raise ValueError("空的没有最小值")
+    if _use_numpy and not isinstance(data, (array, list)):
+        return _scalar(data.min())
+    return min(data)
+
+def maximum(values: Any) -> Number:
+    """最大值"""
+    data = _values(values)
+    if len(data) == 0:
+        raise ValueError("空的没有最大值")
+    if _use_numpy and not isinstance(data, (array, list)):
+        return _scalar(data.max())
+    return max(data)
+
+def mean(values: Any) -> float:
+    """平均值"""
+    data = _values(values)
+    if len(data) == 0:
+        raise ValueError("空的没有平均值")
+    if _use_numpy and not isinstance(data, (array, list)):
+        return _scalar(data.mean())
+    return sum(data) / len(data)
@@ -0,0 +1,346 @@
+# -*- coding: utf-8 -*-
+"""
+杭州话编程语言异步解释器
+Hangzhou Dialect Programming Language Async Interpreter
+"""
+
+import asyncio
+import sys
+from typing import Any, Awaitable, Callable, List, Optional, Union
+from parser import (
+    Program, Statement, Expression,
+    VarDeclaration, Assignment, PrintStatement, ExpressionStatement, IfStatement, WhileStatement,
+    ForStatement, ReturnStatement, IndexAssignment, BinaryOp, UnaryOp, FunctionCall,
+    ListLiteral, IndexExpression, SliceExpression, DictLiteral, SetLiteral, InterpolatedString
+)
+from interpreter import (
+    HangzhouInterpreter, HangzhouFunction, Environment, ReturnException, TailCallException,
+    TracingMixin
+)
+from optimizer import may_suspend
+from lists import HangzhouList
+from modules import LazyName
+from hooks import STATEMENT, CALL, RETURN, BUILTIN_CALL, ERROR
+from utils import ResourceLimitError
+
+class AsyncBuiltin:
+    """
+    异步内置函数：异步模式下 await 它的协程，
+    同步模式（interpret）下调用 fallback，没有 fallback 就报错。
+    """
+    has_side_effects = True  # 异步内置函数都是做I/O的，调用了它的函数不能记忆化
+
+    def __init__(self, coroutine_function: Callable[..., Awaitable[Any]],
+                 fallback: Optional[Callable[..., Any]] = None):
+        self.coroutine_function = coroutine_function
+        self.fallback = fallback
+
+    def __call__(self, *args) -> Any:
+        if self.fallback is None:
+            raise TypeError("只能在异步模式下调用")
+        return self.fallback(*args)
+
+class AsyncTracingMixin(TracingMixin):
+    """异步执行路径上的钩子；不会让出的子树走同步路径，由 TracingMixin 负责"""
+
+    async def run_async(self, program: Program) -> List[str]:
+        output = await super().run_async(program)
+        if self.last_error is not None:
+            for callback in self.hooks.callbacks[ERROR]:
+                callback(self, self.last_error)
+        return output
+
+    async def execute_statement_async(self, stmt: Statement) -> None:
+        if may_suspend(stmt):
+            for callback in self.hooks.callbacks[STATEMENT]:
+                callback(self, stmt)
+        await super().execute_statement_async(stmt)
+
+    async def call_builtin_async(self, name: str, function: AsyncBuiltin, args: List[Any]) -> Any:
+        for callback in self.hooks.callbacks[BUILTIN_CALL]:
+            callback(self, name, args)
+        return await super().call_builtin_async(name, function, args)
+
+    async def call_user_function_async(self, function: HangzhouFunction, args: List[Any]) -> Any:
+        for callback in self.hooks.callbacks[CALL]:
+            callback(self, function, args)
+        value = await super().call_user_function_async(function, args)
+        for callback in self.hooks.callbacks[RETURN]:
+            callback(self, function, value)
+        return value
+
+class AsyncHangzhouInterpreter(HangzhouInterpreter):
+    """
+    异步杭州话解释器
+    `await interpreter.run_async(program)` 执行程序，撒宽 让出事件循环而不是堵住线程，
+    成千上万个脚本可以在一个线程里一起跑。以后做I/O的内置函数用
+    register_async_builtin 登记成协程就行。
+
+    只有可能调用到异步内置函数的地方才走协程：不含函数调用的语句和表达式、
+    纯函数（纯函数不会调用 撒宽 这种有副作用的函数）都直接走同步路径。
+    一个解释器同一时间只能跑一个程序；一直不调用异步内置函数的死循环照样会堵住事件循环，
+    要靠资源管控来限制。
+    """
+
+    tracing_mixin = AsyncTracingMixin
+
+    def _setup_bound_builtins(self) -> None:
+        """撒宽 换成异步的，同步模式下还是用原来的阻塞版本"""
+        super()._setup_bound_builtins()
+        self.register_async_builtin('撒宽', self._builtin_sleep_async, self._builtin_sleep)
+
+    def register_async_builtin(self, name: str, coroutine_function: Callable[..., Awaitable[Any]],
+                               fallback: Optional[Callable[..., Any]] = None) -> None:
+        """登记异步内置函数，fallback 是同步模式下用的版本"""
+        self.global_env.define(name, AsyncBuiltin(coroutine_function, fallback))
+
+    async def _builtin_sleep_async(self, ms: Union[int, float]) -> None:
+        """
+        撒宽 - 异步休眠函数
+        参数: ms - 毫秒数
+        """
+        if not isinstance(ms, (int, float)):
+            raise TypeError("撒宽的参数必须是数字（毫秒）")
+        if self.governor:
+            self.governor.check_time(ms / 1000)
+        self.output.flush()  # 睏觉前先把攒着的输出写出去
+        await asyncio.sleep(ms / 1000)
+
+    async def run_async(self, program: Program) -> List[str]:
+        """异步解释执行程序"""
+        self.output_buffer = self.output.reset()
+        self.last_error = None
+        self._budget_countdown = self.governor.start() if self.governor else sys.maxsize
+        self.calls = 0
+
+        try:
+            for statement in program.statements:
+                await self.execute_statement_async(statement)
+        except ReturnException:
+            # 在全局作用域遇到return，忽略
+            pass
+        except Exception as e:
+            self.last_error = e
+            self.output_buffer.append(f"错误: {str(e)}")
+        finally:
+            self.output.flush()
+
+        return self.output_buffer
+
+    async def execute_statement_async(self, stmt: Statement) -> None:
+        """异步执行语句"""
+        if not may_suspend(stmt):
+            self.execute_statement(stmt)
+            return
+
+        self._budget_countdown -= 1
+        if self._budget_countdown <= 0:
+            self._budget_countdown = self.governor.checkpoint() if self.governor else sys.maxsize
+        self.current_line = stmt.line
+
+        if isinstance(stmt, VarDeclaration):
+            self.current_env.define(stmt.name, await self.evaluate_expression_async(stmt.value))
+        elif isinstance(stmt, Assignment):
+            self.current_env.set(stmt.name, await self.evaluate_expression_async(stmt.value))
+        elif isinstance(stmt, PrintStatement):
+            value = await self.evaluate_expression_async(stmt.expression)
+            self.output.write(self.stringify(value))
+        elif isinstance(stmt, ExpressionStatement):
+            await self.evaluate_expression_async(stmt.expression)
+        elif isinstance(stmt, IfStatement):
+            await self.execute_if_statement_async(stmt)
+        elif isinstance(stmt, WhileStatement):
+            await self.execute_while_statement_async(stmt)
+        elif isinstance(stmt, ForStatement):
+            await self.execute_for_statement_async(stmt)
+        elif isinstance(stmt, ReturnStatement):
+            await self.execute_return_statement_async(stmt)
+        elif isinstance(stmt, IndexAssignment):
+            target = await self.evaluate_expression_async(stmt.target)
+            index = await self.evaluate_expression_async(stmt.index)
+            self.assign_index(target, index, await self.evaluate_expression_async(stmt.value))
+        else:
+            self.error(f"未知的语句类型: {type(stmt)}")
+
+    async def execute_if_statement_async(self, stmt: IfStatement) -> None:
+        """异步执行条件语句"""
+        condition_value = await self.evaluate_expression_async(stmt.condition)
+
+        if self.is_truthy(condition_value):
+            for statement in stmt.then_branch:
+                await self.execute_statement_async(statement)
+        elif stmt.else_branch:
+            for statement in stmt.else_branch:
+                await self.execute_statement_async(statement)
+
+    async def execute_while_statement_async(self, stmt: WhileStatement) -> None:
+        """异步执行循环语句"""
+        while True:
+            self.current_line = stmt.line
+            condition_value = await self.evaluate_expression_async(stmt.condition)
+            if not self.is_truthy(condition_value):
+                break
+
+            for statement in stmt.body:
+                await self.execute_statement_async(statement)
+
+    async def execute_for_statement_async(self, stmt: ForStatement) -> None:
+        """异步执行挨个循环"""
+        source = await self.evaluate_expression_async(stmt.source)
+        stop = await self.evaluate_expression_async(stmt.stop) if stmt.stop is not None else None
+        variables = self.current_env.variables
+        for value in self.loop_values(stmt, source, stop):
+            variables[stmt.name] = value
+            for statement in stmt.body:
+                await self.execute_statement_async(statement)
+
+    async def execute_return_statement_async(self, stmt: ReturnStatement) -> None:
+        """异步执行返回语句"""
+        if stmt.tail_call:
+            function = self.current_env.get(stmt.value.name)
+            if isinstance(function, HangzhouFunction):
+                args = [await self.evaluate_expression_async(arg) for arg in stmt.value.args]
+                raise TailCallException(function, args)
+
+        raise ReturnException(await self.evaluate_expression_async(stmt.value))
+
+    async def evaluate_expression_async(self, expr: Expression) -> Any:
+        """异步求值表达式"""
+        if not may_suspend(expr):
+            return self.evaluate_expression(expr)
+
+        if isinstance(expr, FunctionCall):
+            return await self.evaluate_function_call_async(expr)
+        elif isinstance(expr, BinaryOp):
+            return await self.evaluate_binary_op_async(expr)
+        elif isinstance(expr, UnaryOp):
+            operand = await self.evaluate_expression_async(expr.operand)
+            return self.unary_operation(expr.operator, operand)
+        elif isinstance(expr, IndexExpression):
+            target = await self.evaluate_expression_async(expr.target)
+            return self.index_value(target, await self.evaluate_expression_async(expr.index))
+        elif isinstance(expr, ListLiteral):
+            return HangzhouList([await self.evaluate_expression_async(element) for element in expr.elements])
+        elif isinstance(expr, InterpolatedString):
+            return ''.join([part if type(part) is str else self.stringify(await self.evaluate_expression_async(part))
+                            for part in expr.parts])
+        elif isinstance(expr, DictLiteral):
+            return self.build_dict([(await self.evaluate_expression_async(key),
+                                     await self.evaluate_expression_async(value))
+                                    for key, value in expr.entries])
+        elif isinstance(expr, SetLiteral):
+            return self.build_set([await self.evaluate_expression_async(element) for element in expr.elements])
+        elif isinstance(expr, SliceExpression):
+            target = await self.evaluate_expression_async(expr.target)
+            start = await self.evaluate_expression_async(expr.start) if expr.start else None
+            stop = await self.evaluate_expression_async(expr.stop) if expr.stop else None
+            return self.slice_value(target, start, stop)
+        else:
+            self.error(f"未知的表达式类型: {type(expr)}")
+
+    async def evaluate_binary_op_async(self, expr: BinaryOp) -> Any:
+        """异步求值二元运算"""
+        left = await self.evaluate_expression_async(expr.left)
+
+        # 短路求值
+        if expr.operator in ['还有', 'and']:
+            if not self.is_truthy(left):
+                return left
+            return await self.evaluate_expression_async(expr.right)
+        elif expr.operator in ['要么', 'or']:
+            if self.is_truthy(left):
+                return left
+            return await self.evaluate_expression_async(expr.right)
+
+        right = await self.evaluate_expression_async(expr.right)
+        return self.binary_operation(expr.operator, left, right)
+
+    async def evaluate_function_call_async(self, expr: FunctionCall) -> Any:
+        """异步求值函数调用"""
+        function = self.current_env.get(expr.name)
+        if type(function) is LazyName:
+            function = self.resolve_lazy(expr.name, function)  # 模块同步执行
+
+        # 求值参数
+        args = [await self.evaluate_expression_async(arg) for arg in expr.args]
+
+        # 异步内置函数
+        if isinstance(function, AsyncBuiltin):
+            return await self.call_builtin_async(expr.name, function, args)
+
+        # 普通内置函数（Python函数）
+        elif callable(function) and not isinstance(function, HangzhouFunction):
+            return self.call_builtin(expr.name, function, args)
+
+        # 用户定义函数，纯函数不会让出，直接同步调用
+        elif isinstance(function, HangzhouFunction):
+            if function.pure is None or (function.pure and self._callees_changed(function)):
+                self._setup_memo(function)
+            if function.pure:
+                return self.call_user_function(function, args)
+            return await self.call_user_function_async(function, args)
+
+        else:
+            self.error(f"{expr.name} 不是一个函数")
+
+    async def call_builtin_async(self, name: str, function: AsyncBuiltin, args: List[Any]) -> Any:
+        """调用异步内置函数"""
+        try:
+            return await function.coroutine_function(*args)
+        except ResourceLimitError:
+            raise
+        except Exception as e:
+            self.error(f"调用内置函数 {name} 时出错: {str(e)}")
+
+    async def call_user_function_async(self, function: HangzhouFunction, args: List[Any]) -> Any:
+        """
+        异步调用用户定义的函数，和 call_user_function 一样在这里循环处理尾调用
+        走到这里的一般都是不纯的函数，所以不查结果缓存
+        """
+        # 调用深度
+        self.calls += 1
+        self.call_depth += 1
+        if self.call_depth > self._max_depth:
+            self.call_depth -= 1
+            raise self.governor.depth_exceeded()
+
+        # 保存当前环境，压入杭州话调用栈
+        previous_env = self.current_env
+        call_line = self.current_line
+        self.call_stack.append((function.name, call_line))
+
+        try:
+            while True:
+                if len(args) != len(function.params):
+                    self.error(f"函数 {function.name} 期望 {len(function.params)} 个参数，但提供了 {len(args)} 个")
+
+                # 创建新的环境，挂在函数定义时的环境下面（词法作用域）
+                function_env = Environment(function.closure)
+                for param, arg in zip(function.params, args):
+                    function_env.define(param, arg)
+                self.current_env = function_env
+
+                try:
+                    for statement in function.body:
+                        await self.execute_statement_async(statement)
+
+                    result = None
+                    break
+
+                except TailCallException as call:
+                    function, args = call.function, call.args
+                    self.call_stack[-1] = (function.name, call_line)
+                    self.calls += 1
+
+                except ReturnException as ret:
+                    result = ret.value
+                    break
+
+        finally:
+            # 恢复环境
+            self.current_env = previous_env
+            self.call_depth -= 1
+            self.call_stack.pop()
+            self.current_line = call_line
+
+        return result
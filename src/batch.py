@@ -0,0 +1,246 @@
+# -*- coding: utf-8 -*-
+"""
+杭州话编程语言批量运行
+Hangzhou Dialect Programming Language Batch Runner
+
+hangzhoulang run-many 的实现：一批 .hz 文件分给进程池跑，
+每个工作进程里有一个预热好的解释器模板，每个文件克隆一个解释器。
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Iterator, List, Optional
+
+from governor import ResourceGovernor
+from output import create_sink
+from parser import parse_text
+from template import InterpreterTemplate
+
+# 工作进程里的解释器模板和资源限制，由 _init_worker 设置
+_template: Optional[InterpreterTemplate] = None
+_limits: Dict[str, Any] = {}
+
+def collect_files(patterns: List[str], manifest: Optional[str] = None) -> List[str]:
+    """把文件名、通配符、目录和清单文件展开成文件列表，保持给定顺序并去重"""
+    entries = list(patterns)
+    if manifest:
+        stream = sys.stdin if manifest == '-' else open(manifest, 'r', encoding='utf-8')
+        try:
+            for line in stream:
+                line = line.strip()
+                if line and not line.startswith('#'):
+                    entries.append(line)
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+    
+    files = []
+    seen = set()
+    for entry in entries:
+        if os.path.isdir(entry):
+            matches = sorted(glob.glob(os.path.join(entry, '**', '*.hz'), recursive=True))
+        elif glob.has_magic(entry):
+            matches = sorted(glob.glob(entry, recursive=True))
+        else:
+            matches = [entry]
+        for path in matches:
+            if path not in seen:
+                seen.add(path)
+                files.append(path)
+    return files
+
+def _init_worker(prelude: Optional[str], limits: Dict[str, Any]) -> None:
+    """工作进程启动时建一次解释器模板"""
+    global _template, _limits
+    _template = InterpreterTemplate(prelude)
+    _limits = limits
+
+def run_one(index: int, path: str) -> Dict[str, Any]:
+    """在当前工作进程里跑一个文件，任何错误都只影响这个文件"""
+    start = time.perf_counter()
+    record: Dict[str, Any] = {'index': index, 'file': path, 'status': 'ok', 'output': [], 'error': None}
+    
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            program = parse_text(f.read())
+        
+        governor = None
+        if any(value is not None for value in _limits.values()):
+            governor = ResourceGovernor(**_limits)
+        interpreter = _template.clone(governor=governor, output=create_sink('capture'))
+        interpreter.search_path.insert(0, os.path.dirname(os.path.abspath(path)))  # 先找脚本旁边的模块
+        interpreter.interpret(program)
+        
+        record['output'] = interpreter.output.lines
+        error = interpreter.last_error
+        if error is not None:
+            record['output'] = record['output'][:-1]  # 最后一行是 interpret 加上的错误信息
+            record['status'] = 'timeout' if getattr(error, 'resource', None) == 'time' else 'error'
+            record['error'] = str(error)
+    except Exception as e:
+        record['status'] = 'error'
+        record['error'] = f"{type(e).__name__}: {e}"
+    
+    record['elapsed_ms'] = round((time.perf_counter() - start) * 1000, 3)
+    return record
+
+def _make_pool(jobs: int, prelude: Optional[str], limits: Dict[str, Any]) -> ProcessPoolExecutor:
+    return ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(prelude, limits))
+
+def _crashed(index: int, path: str, error: BaseException) -> Dict[str, Any]:
+    """工作进程死掉的那个文件的结果"""
+    return {'index': index, 'file': path, 'status': 'error', 'output': [],
+            'error': f"工作进程崩溃了: {error}", 'elapsed_ms': None}
+
+def _run_isolated(files: List[str], indexes: List[int], prelude: Optional[str],
+                  limits: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """
+    池子坏掉时池子里的文件挨个重跑：只有一个工作进程、一次只交一个文件，
+    再坏就是这个文件弄死的，其余的照常出结果
+    """
+    pool = None
+    try:
+        for index in indexes:
+            if pool is None:
+                pool = _make_pool(1, prelude, limits)
+            try:
+                yield pool.submit(run_one, index, files[index]).result()
+            except BrokenProcessPool as e:
+                yield _crashed(index, files[index], e)
+                pool.shutdown()
+                pool = None
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+def _run_pool(files: List[str], jobs: int, prelude: Optional[str],
+              limits: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """
+    用进程池跑，按完成的先后产出结果
+    一个工作进程死了，池子里所有没跑完的文件都会报 BrokenProcessPool，看不出是谁弄死的；
+    所以池子里最多放 2×jobs 个文件，池子坏了就把这些文件交给 _run_isolated 挨个重跑，
+    再建一个新池子跑剩下的，只有弄死工作进程的那个文件算失败。
+    """
+    waiting = deque(range(len(files)))
+    running: Dict[Any, int] = {}  # future -> 文件下标
+    pool = _make_pool(jobs, prelude, limits)
+    try:
+        while waiting or running:
+            while waiting and len(running) < jobs * 2:
+                index = waiting.popleft()
+                running[pool.submit(run_one, index, files[index])] = index
+            
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            if not any(isinstance(future.exception(), BrokenProcessPool) for future in done):
+                for future in done:
+                    del running[future]
+                    yield future.result()
+                continue
+            
+            # 池子坏了：等剩下的都收到结果（多半也是 BrokenProcessPool），跑完了的照常产出
+            wait(running)
+            suspects = []
+            for future, index in running.items():
+                if isinstance(future.exception(), BrokenProcessPool):
+                    suspects.append(index)
+                else:
+                    yield future.result()
+            running.clear()
+            pool.shutdown()
+            pool = None
+            yield from _run_isolated(files, sorted(suspects), prelude, limits)
+            pool = _make_pool(jobs, prelude, limits)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+def run_many(files: List[str], jobs: int = 0, prelude: Optional[str] = None,
+             limits: Optional[Dict[str, Any]] = None, ordered: bool = True) -> Iterator[Dict[str, Any]]:
+    """
+    批量运行，逐个产出每个文件的结果
+    ordered 为真时按输入顺序产出，否则谁先跑完先产出。
+    jobs 为 1 时就在本进程里跑，不开进程池。
+    """
+    limits = limits or {}
+    jobs = jobs or os.cpu_count() or 1
+    
+    if jobs == 1:
+        _init_worker(prelude, limits)
+        for index, path in enumerate(files):
+            yield run_one(index, path)
+        return
+    
+    records = _run_pool(files, jobs, prelude, limits)
+    if not ordered:
+        yield from records
+        return
+    
+    # 按输入顺序产出：先跑完的攒着，等前面的都出来了再出
+    finished: Dict[int, Dict[str, Any]] = {}
+    next_index = 0
+    for record in records:
+        finished[record['index']] = record
+        while next_index in finished:
+            yield finished.pop(next_index)
+            next_index += 1
+
+def main(argv: List[str]) -> int:
+    """hangzhoulang run-many 命令行"""
+    parser = argparse.ArgumentParser(
+        prog='hangzhoulang run-many',
+        description='用进程池批量运行杭州话程序文件',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='''
+使用示例:
+  hangzhoulang run-many a.hz b.hz                 # 按顺序输出每个文件的结果
+  hangzhoulang run-many 'scripts/**/*.hz' --ndjson # 跑完一个输出一行JSON
+  hangzhoulang run-many --manifest list.txt -j 8 --timeout 2
+        '''
+    )
+    parser.add_argument('files', nargs='*', help='文件、目录或通配符')
+    parser.add_argument('--manifest', '-m', help='清单文件，一行一个文件（- 表示标准输入）')
+    parser.add_argument('--jobs', '-j', type=int, default=0, help='工作进程数（默认等于CPU核数）')
+    parser.add_argument('--prelude', help='每个工作进程预先加载的开场脚本')
+    parser.add_argument('--ndjson', action='store_true', help='每个文件跑完输出一行JSON（按完成顺序）')
+    parser.add_argument('--timeout', type=float, help='每个文件最长运行时间（秒）')
+    parser.add_argument('--max-steps', type=int, help='每个文件最多执行的语句数')
+    parser.add_argument('--max-depth', type=int, help='每个文件最深的函数调用层数')
+    args = parser.parse_args(argv)
+    
+    files = collect_files(args.files, args.manifest)
+    if not files:
+        parser.error("没有要运行的文件")
+    
+    prelude = None
+    if args.prelude:
+        with open(args.prelude, 'r', encoding='utf-8') as f:
+            prelude = f.read()
+    
+    limits = {'max_time': args.timeout, 'max_steps': args.max_steps, 'max_depth': args.max_depth}
+    
+    failed = 0
+    for record in run_many(files, args.jobs, prelude, limits, ordered=not args.ndjson):
+        if record['status'] != 'ok':
+            failed += 1
+        
+        if args.ndjson:
+            sys.stdout.write(json.dumps(record, ensure_ascii=False) + '\n')
+            sys.stdout.flush()
+            continue
+        
+        print(f"==> {record['file']} <== {record['status']} {record['elapsed_ms']} ms")
+        for line in record['output']:
+            print(line)
+        if record['error']:
+            print(f"错误: {record['error']}")
+    
+    if not args.ndjson:
+        print(f"共 {len(files)} 个文件，成功 {len(files) - failed} 个，失败 {failed} 个")
+    return 1 if failed else 0
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""
+杭州话编程语言守护进程客户端
+Hangzhou Dialect Programming Language Daemon Client
+
+hangzhoulang client 的实现：把要跑的程序发给 hangzhoulang serve，
+把输出原样转到标准输出。只用标准库和 protocol.py，不加载解释器。
+"""
+
+import argparse
+import os
+import re
+import socket
+import sys
+from typing import Any, Dict, List, Optional
+
+from protocol import default_socket_path, send_frame, recv_frame
+
+# 只有这样写的参数才当数字；int()/float() 还认 nan、inf、1_000、全角数字这些，当字符串更不容易出意外
+INTEGER_ARGUMENT = re.compile(r'-?[0-9]+')
+FLOAT_ARGUMENT = re.compile(r'-?[0-9]+\.[0-9]+')
+
+def parse_argument(text: str) -> Any:
+    """命令行上的脚本参数：像 42、-3、3.14 这样的当数字，其余当字符串"""
+    if INTEGER_ARGUMENT.fullmatch(text):
+        return int(text)
+    if FLOAT_ARGUMENT.fullmatch(text):
+        return float(text)
+    return text
+
+def connect(socket_path: str) -> socket.socket:
+    """连上守护进程"""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(socket_path)
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+def run_remote(socket_path: str, request: Dict[str, Any], stdout=None) -> Dict[str, Any]:
+    """发一个运行请求，边收边把输出写到 stdout，返回 done 帧"""
+    stdout = stdout or sys.stdout
+    with connect(socket_path) as sock:
+        send_frame(sock, request)
+        while True:
+            message = recv_frame(sock)
+            if message is None:
+                return {'type': 'done', 'status': 'error', 'error': '守护进程断开了连接'}
+            if message.get('type') == 'output':
+                stdout.write(message['text'])
+                stdout.flush()
+            else:
+                return message
+
+def main(argv: List[str]) -> int:
+    """hangzhoulang client 命令行"""
+    parser = argparse.ArgumentParser(
+        prog='hangzhoulang client',
+        description='让 hangzhoulang serve 守护进程跑程序，输出转到标准输出',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='''
+使用示例:
+  hangzhoulang client hello.hz              # 跑文件，程序里用 参数个数、参数1…… 取参数
+  hangzhoulang client add.hz 3 4
+  hangzhoulang client -c '话说 "你好"'
+  hangzhoulang client --stats
+        '''
+    )
+    parser.add_argument('file', nargs='?', help='要执行的杭州话程序文件')
+    parser.add_argument('args', nargs='*', help='脚本参数')
+    parser.add_argument('--socket', '-s', default=default_socket_path(), help='守护进程的套接字路径')
+    parser.add_argument('--code', '-c', help='直接给源码，不读文件（这时位置参数都是脚本参数）')
+    parser.add_argument('--timeout', type=float, help='最长运行时间（秒）')
+    parser.add_argument('--max-steps', type=int, help='最多执行的语句数')
+    parser.add_argument('--max-depth', type=int, help='最深的函数调用层数')
+    parser.add_argument('--stats', action='store_true', help='显示守护进程的运行统计')
+    args = parser.parse_args(argv)
+
+    try:
+        if args.stats:
+            with connect(args.socket) as sock:
+                send_frame(sock, {'op': 'stats'})
+                stats = recv_frame(sock) or {}
+            for key, value in stats.items():
+                if key != 'type':
+                    print(f"{key}: {value}")
+            return 0
+
+        script_args = [args.file] + args.args if args.code is not None and args.file else args.args
+        request: Dict[str, Any] = {
+            'op': 'run',
+            'args': [parse_argument(arg) for arg in script_args],
+            'limits': {'max_time': args.timeout, 'max_steps': args.max_steps, 'max_depth': args.max_depth},
+        }
+        if args.code is not None:
+            request['source'] = args.code
+        elif args.file:
+            request['path'] = os.path.abspath(args.file)
+        else:
+            parser.error("要给一个文件或者 --code")
+
+        done = run_remote(args.socket, request)
+    except OSError as e:
+        print(f"连不上守护进程 {args.socket}: {e}（先运行 hangzhoulang serve）", file=sys.stderr)
+        return 2
+
+    if done.get('status') != 'ok':
+        print(f"执行错误: {done.get('error')}", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
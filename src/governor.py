@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""
+杭州话编程语言执行资源管控
+Hangzhou Dialect Programming Language Resource Governor
+"""
+
+import os
+import sys
+import time
+from typing import Dict, Optional, Union
+from utils import ResourceLimitError
+
+# 每执行多少条语句做一次完整检查
+DEFAULT_CHECK_INTERVAL = 1000
+
+def current_memory() -> int:
+    """当前进程占用的内存（字节），取不到时返回0"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    
+    return peak_memory()
+
+def peak_memory() -> int:
+    """进程到现在为止的峰值 RSS（字节），取不到时返回0"""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux 上单位是KB，macOS 上是字节
+        return peak if sys.platform == 'darwin' else peak * 1024
+    except (ImportError, OSError):
+        return 0
+
+def process_memory(pid: Union[int, str] = 'self') -> Dict[str, int]:
+    """
+    进程的 RSS、PSS 和 USS（只属于这个进程的内存，Private_Clean + Private_Dirty），单位字节
+    读 /proc/<pid>/smaps_rollup，取不到时返回空字典。
+    """
+    fields = {}
+    try:
+        with open(f'/proc/{pid}/smaps_rollup') as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) >= 2 and parts[0].endswith(':') and parts[1].isdigit():
+                    fields[parts[0][:-1]] = int(parts[1]) * 1024
+    except OSError:
+        return {}
+    
+    return {
+        'rss': fields.get('Rss', 0),
+        'pss': fields.get('Pss', 0),
+        'uss': fields.get('Private_Clean', 0) + fields.get('Private_Dirty', 0),
+    }
+
+class ResourceGovernor:
+    """
+    执行资源管控
+    解释器每执行一条语句只把倒计数减一，倒计数归零时才调用 checkpoint
+    做一次完整检查（步数、时间、内存），所以热路径上几乎没有开销。
+    调用深度在每次进入用户函数时比较一下。
+    """
+    
+    def __init__(self, max_steps: Optional[int] = None, max_depth: Optional[int] = None,
+                 max_time: Optional[float] = None, max_memory: Optional[int] = None,
+                 check_interval: int = DEFAULT_CHECK_INTERVAL):
+        self.max_steps = max_steps        # 最多执行的语句数
+        self.max_depth = max_depth        # 最深的函数调用层数
+        self.max_time = max_time          # 最长运行时间（秒）
+        self.max_memory = max_memory      # 最多增长的内存（字节）
+        self.check_interval = max(1, check_interval)
+        
+        self.steps = 0
+        self.start_time = 0.0
+        self.start_memory = 0
+        self._interval = self.check_interval
+    
+    def start(self) -> int:
+        """开始计量，返回第一段倒计数"""
+        self.steps = 0
+        self.start_time = time.monotonic()
+        if self.max_memory is not None:
+            self.start_memory = current_memory()
+        return self._next_interval()
+    
+    def _next_interval(self) -> int:
+        """下一次检查前能执行的语句数，步数预算快用完时缩短，保证正好在超限那一步停下"""
+        interval = self.check_interval
+        if self.max_steps is not None:
+            interval = max(1, min(interval, self.max_steps - self.steps + 1))
+        self._interval = interval
+        return interval
+    
+    def checkpoint(self) -> int:
+        """完整检查一次，超限时抛出 ResourceLimitError，否则返回下一段倒计数"""
+        self.steps += self._interval
+        
+        if self.max_steps is not None and self.steps > self.max_steps:
+            raise ResourceLimitError('steps', self.max_steps,
+                                     f"执行步数超出预算: 最多 {self.max_steps} 条语句")
+        
+        self.check_time()
+        
+        if self.max_memory is not None:
+            growth = current_memory() - self.start_memory
+            if growth > self.max_memory:
+                raise ResourceLimitError('memory', self.max_memory,
+                                         f"内存增长超出预算: 最多 {self.max_memory // (1024 * 1024)} MB")
+        
+        return self._next_interval()
+    
+    def executed(self, countdown: int) -> int:
+        """已经执行的语句数：完整检查过的几段，加上这一段倒计数用掉的"""
+        return self.steps + self._interval - countdown
+    
+    def check_time(self, extra: float = 0.0) -> None:
+        """检查运行时间，extra 是马上要花掉的时间（比如 撒宽 的休眠）"""
+        if self.max_time is None:
+            return
+        if time.monotonic() + extra - self.start_time > self.max_time:
+            raise ResourceLimitError('time', self.max_time,
+                                     f"运行时间超出预算: 最多 {self.max_time} 秒")
+    
+    def depth_exceeded(self) -> ResourceLimitError:
+        """调用深度超限的错误"""
+        return ResourceLimitError('depth', self.max_depth,
+                                  f"函数调用层数超出预算: 最多 {self.max_depth} 层")
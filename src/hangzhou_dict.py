@@ -17,10 +17,9 @@ from keywords import (
     HANGZHOU_QUESTIONS,
     HANGZHOU_MEASURE,
     HANGZHOU_PHRASES,
-    search_hangzhou_words,
-    get_hangzhou_meaning,
     get_word_category
 )
+from ngram_index import build_index
 
 SPECIAL_WORDS = {
     "62": {
@@ -51,9 +50,16 @@ SPECIAL_WORDS = {
 }
 
 class HangzhouDict:
-    """杭州话词典类"""
+    """
+    杭州话词典类
+    words 默认是内置的全部词汇，也可以传扩充过的大词典（词 → 释义）；
+    模糊搜索第一次用到时建 n-gram 索引，给了 index_path 就存到那里，下次直接读。
+    """
     
-    def __init__(self):
+    def __init__(self, words=None, index_path=None):
+        self.words = words if words is not None else ALL_HANGZHOU_WORDS
+        self.index_path = index_path
+        self.index = None
         self.categories = {
             "关键字": HANGZHOU_KEYWORDS,
             "时间表达": HANGZHOU_TIME,
@@ -68,8 +74,8 @@ class HangzhouDict:
     
     def search_word(self, word):
         """搜索特定词汇"""
-        if word in ALL_HANGZHOU_WORDS:
-            meaning = get_hangzhou_meaning(word)
+        if word in self.words:
+            meaning = self.words[word]
             category = get_word_category(word)
             return {
                 'word': word,
@@ -81,9 +87,10 @@ class HangzhouDict:
             return {'found': False}
     
     def search_pattern(self, pattern):
-        """模糊搜索"""
-        results = search_hangzhou_words(pattern)
-        return results
+        """模糊搜索：词或者释义里含 pattern 的词条，完全对上的排前面"""
+        if self.index is None:
+            self.index = build_index(self.words.items(), self.index_path)
+        return self.index.search(pattern)
     
     def list_category(self, category_name):
         """列出指定分类的所有词汇"""
@@ -173,10 +180,11 @@ def main():
     parser.add_argument('-a', '--all', action='store_true', help='显示所有词汇')
     parser.add_argument('--stats', action='store_true', help='显示统计信息')
     parser.add_argument('-i', '--interactive', action='store_true', help='交互模式')
+    parser.add_argument('--index', help='模糊搜索用的索引文件，没有或者过期了就建一个存进去')
     
     args = parser.parse_args()
     
-    dict_tool = HangzhouDict()
+    dict_tool = HangzhouDict(index_path=args.index)
     
     if args.search:
         # 精确搜索
@@ -7,23 +7,57 @@ Hangzhou Dialect Programming Language Main Program
 
 import sys
 import os
-import argparse
+import math
+import time
+from collections import OrderedDict
 from typing import List, Optional
-from interpreter import interpret_text, HangzhouInterpreter
-from lexer import tokenize, HangzhouLexer
-from parser import parse_text
+from interpreter import interpret_text, HangzhouInterpreter, HangzhouFunction, DEFAULT_MEMO_SIZE
+from governor import ResourceGovernor, peak_memory
+from lexer import tokenize
+from optimizer import analyze_functions, count_nodes
+from output import create_sink
+from parser import Program, parse, parse_text
+from timing import PhaseTimer
+
+# argparse、采样分析器都只在用到的时候导入：
+# 最常见的 `hangzhoulang 文件.hz` 只要解析和执行，启动越快越好
+
+# 交互模式记住多少条输入解析好的语法树
+PARSE_CACHE_SIZE = 256
+
+# 计时 不给次数时，至少跑这么久（秒）再报告，最多跑 TIMEIT_MAX_RUNS 遍
+TIMEIT_TARGET = 0.2
+TIMEIT_MAX_RUNS = 1000000
+
+def format_duration(seconds: float) -> str:
+    """耗时换成合适的单位"""
+    for unit, scale in (('秒', 1), ('毫秒', 1e-3), ('微秒', 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3g} {unit}"
+    return f"{seconds / 1e-9:.3g} 纳秒"
+
+def percentile(ordered: List[float], fraction: float) -> float:
+    """排好序的样本里的分位数（最近秩）"""
+    rank = max(1, math.ceil(len(ordered) * fraction))
+    return ordered[min(len(ordered), rank) - 1]
 
 class HangzhouREPL:
-    """杭州话交互式解释器（摆话模式）"""
+    """
+    杭州话交互式解释器（摆话模式）
+    一直用同一个解释器，前面定义的变量和函数后面都能用；一样的输入只解析一次，
+    解析好的语法树（连同特化过的运算节点）留在 parse_cache 里。
+    """
     
     def __init__(self):
         self.interpreter = HangzhouInterpreter()
         self.history = []
+        self.parse_cache: 'OrderedDict[str, Program]' = OrderedDict()
     
     def run(self) -> None:
         """启动交互模式"""
         print("欢迎使用杭州话编程语言！")
         print("你要跟 hangzhoulang 话啊？开始好嘞！要是一句话太长的话你就用\\拆开来说。")
+        print("冒号结尾的行后面接着写代码块，空一行算写完。")
         print("输入'拜拜'或'完了'退出。")
         print()
         
@@ -51,6 +85,10 @@ class HangzhouREPL:
                 elif line.strip() == '帮助':
                     self._show_help()
                     continue
+                elif line.strip() == '计时' or line.strip().startswith('计时 '):
+                    self._timeit(line.strip()[2:])
+                    self.history.append(line)
+                    continue
                 
                 # 执行代码
                 self._execute_line(line)
@@ -75,17 +113,123 @@ class HangzhouREPL:
             continuation = input("你还要话啥？ ")
             line += continuation
         
+        # 冒号结尾是代码块的开头，一直读到空行
+        if line.rstrip().endswith(('：', ':')):
+            lines = [line]
+            while True:
+                continuation = input("你还要话啥？ ")
+                if not continuation.strip():
+                    break
+                lines.append(continuation)
+            line = '\n'.join(lines)
+        
         return line
     
+    def _compile(self, source: str) -> Program:
+        """解析输入；一样的输入直接用上次解析好的语法树"""
+        program = self.parse_cache.get(source)
+        if program is not None:
+            self.parse_cache.move_to_end(source)
+            return program
+        program = parse_text(source)
+        self.parse_cache[source] = program
+        if len(self.parse_cache) > PARSE_CACHE_SIZE:
+            self.parse_cache.popitem(last=False)
+        return program
+    
+    def _timeit(self, text: str) -> None:
+        """
+        计时 [次数] 语句：在当前会话里把语句跑很多遍，报告平均和分位数延迟
+        不给次数时跑到 TIMEIT_TARGET 秒为止；跑的时候 话说 不输出，也不查纯函数缓存，
+        不然从第二遍起量到的都是缓存命中
+        """
+        text = text.strip()
+        runs = None
+        first, _, rest = text.partition(' ')
+        if first.isdigit():
+            runs, text = max(1, int(first)), rest.strip()
+        if not text:
+            print("用法: 计时 [次数] 语句，比如 计时 1000 斐波那契（15）")
+            return
+        
+        interpreter = self.interpreter
+        saved_output = interpreter.output
+        saved_memo_size = interpreter.memo_size
+        saved_caches = self._suspend_memo()
+        samples = []
+        try:
+            program = self._compile(text)
+            interpreter.memo_size = 0
+            interpreter.output = create_sink('discard')
+            interpreter.output_buffer = interpreter.output.reset()
+            clock = time.perf_counter
+            elapsed = 0.0
+            while True:
+                start = clock()
+                for statement in program.statements:
+                    interpreter.execute_statement(statement)
+                sample = clock() - start
+                samples.append(sample)
+                elapsed += sample
+                if runs is not None:
+                    if len(samples) >= runs:
+                        break
+                elif elapsed >= TIMEIT_TARGET or len(samples) >= TIMEIT_MAX_RUNS:
+                    break
+        except Exception as e:
+            print(f"错误: {e}")
+            return
+        finally:
+            interpreter.output = saved_output
+            interpreter.memo_size = saved_memo_size
+            self._resume_memo(saved_caches)
+        
+        ordered = sorted(samples)
+        mean = elapsed / len(samples)
+        print(f"跑了 {len(samples)} 遍，平均 {format_duration(mean)}")
+        print(f"  最快 {format_duration(ordered[0])}  中位数 {format_duration(percentile(ordered, 0.5))}  "
+              f"p90 {format_duration(percentile(ordered, 0.9))}  p99 {format_duration(percentile(ordered, 0.99))}  "
+              f"最慢 {format_duration(ordered[-1])}")
+    
+    def _session_functions(self) -> List[HangzhouFunction]:
+        """会话全局环境和导入过的模块里的函数"""
+        environments = [self.interpreter.global_env] + list(self.interpreter.modules.values())
+        return [value for env in environments for value in env.variables.values()
+                if isinstance(value, HangzhouFunction)]
+    
+    def _suspend_memo(self) -> dict:
+        """把会话里函数的结果缓存先收起来，返回 {函数: (缓存, 确定纯度时查到的函数)}"""
+        saved = {}
+        for function in self._session_functions():
+            saved[function] = (function.cache, function.callees)
+            function.cache = None
+        return saved
+    
+    def _resume_memo(self, saved: dict) -> None:
+        """
+        计时完把缓存放回去；计时的时候才第一次调用、或者重新确定过纯度的函数
+        （memo_size 是 0，没配缓存）下次调用时重新确定
+        """
+        for function in self._session_functions():
+            cache, callees = saved.get(function, (None, None))
+            if function.callees is callees and function.pure is not None:
+                function.cache = cache
+            else:
+                function.pure = None
+                function.cache = None
+    
     def _execute_line(self, line: str) -> None:
-        """执行一行代码"""
+        """执行一行代码（或者一整个代码块）"""
         try:
             # 解析并执行
-            program = parse_text(line)
-            self.interpreter.output_buffer = []
+            program = self._compile(line)
+            self.interpreter.output_buffer = self.interpreter.output.reset()
             
-            for statement in program.statements:
-                self.interpreter.execute_statement(statement)
+            try:
+                for statement in program.statements:
+                    self.interpreter.execute_statement(statement)
+            finally:
+                self.interpreter.output.flush()
             
             # 如果没有输出，尝试作为表达式求值
             if not self.interpreter.output_buffer and program.statements:
@@ -105,7 +249,7 @@ class HangzhouREPL:
         
         print("历史记录:")
         for i, line in enumerate(self.history, 1):
-            print(f"{i:3d}: {line}")
+            print(f"{i:3d}: " + line.replace('\n', '\n     '))
     
     def _show_help(self) -> None:
         """显示帮助信息"""
@@ -114,6 +258,7 @@ class HangzhouREPL:
         print("  历史         - 显示命令历史")
         print("  清空         - 清空命令历史")
         print("  帮助         - 显示此帮助信息")
+        print("  计时 [次数] 语句 - 把语句跑很多遍，报告平均和分位数耗时（不查纯函数缓存）")
         print()
         print("语法示例:")
         print("  老倌 张三 装 25              # 变量声明")
@@ -122,12 +267,56 @@ class HangzhouREPL:
         print("      话说：\"张三年纪大\"")
         print("  会做事 算账（老倌 甲，老倌 乙）：  # 函数定义")
         print("      有数 甲 加 乙")
+        print("                                  # 空一行，代码块写完")
+
+def print_memo_stats(interpreter: HangzhouInterpreter) -> None:
+    """输出纯函数缓存的命中统计"""
+    stats = interpreter.get_memo_stats()
+    print("记忆化统计:")
+    if not stats:
+        print("  没有记忆化的函数")
+        return
+    
+    for item in stats:
+        calls = item['hits'] + item['misses']
+        rate = item['hits'] / calls if calls else 0.0
+        print(f"  {item['name']}: 命中 {item['hits']} 次，未命中 {item['misses']} 次，"
+              f"命中率 {rate:.1%}，缓存 {item['caches']} 个（每个最多 {item['maxsize']} 条）")
 
-def run_file(filename: str, debug: bool = False) -> None:
-    """运行杭州话程序文件"""
+def print_quicken_stats(interpreter: HangzhouInterpreter) -> None:
+    """输出二元运算节点的特化命中统计"""
+    stats = interpreter.get_quicken_stats()
+    print("特化统计:")
+    if not stats:
+        print("  没有特化的运算")
+        return
+    
+    for item in sorted(stats, key=lambda item: (item['line'], item['operator'])):
+        print(f"  第{item['line']}行 {item['operator']} → {item['specialization']}: "
+              f"命中 {item['hits']} 次，未命中 {item['misses']} 次，命中率 {item['hit_rate']:.1%}")
+
+def run_file(filename: str, debug: bool = False, memo_stats: bool = False,
+             memo_size: int = DEFAULT_MEMO_SIZE, governor: Optional[ResourceGovernor] = None,
+             output_mode: str = 'stream', profile: bool = False,
+             profile_rate: Optional[int] = None, profile_output: Optional[str] = None,
+             profile_top: int = 10, quicken_stats: bool = False,
+             time_format: Optional[str] = None) -> None:
+    """
+    运行杭州话程序文件
+    output_mode: capture 执行完一次性输出，stream 边跑边成块输出，
+                 tee 两样都做，discard 不输出
+    profile: 开采样分析，折叠栈写到 profile_output（默认 <文件名>.collapsed），
+             每秒采样 profile_rate 次（默认 profiler.DEFAULT_SAMPLE_RATE）
+    time_format: table 或 json，跑完以后往标准错误输出分阶段计时和计数
+    """
+    timer = PhaseTimer()
     try:
-        with open(filename, 'r', encoding='utf-8') as f:
-            content = f.read()
+        with timer.phase('read', '读文件'):
+            with open(filename, 'r', encoding='utf-8') as f:
+                content = f.read()
+        
+        with timer.phase('lex', '词法分析'):
+            tokens = tokenize(content)
         
         if debug:
             print(f"正在执行文件: {filename}")
@@ -137,18 +326,69 @@ def run_file(filename: str, debug: bool = False) -> None:
             
             # 显示词法分析结果
             print("词法分析结果:")
-            tokens = tokenize(content)
             for token in tokens:
                 print(f"  {token}")
             print()
         
         # 执行程序
-        results = interpret_text(content)
+        if debug and output_mode == 'stream':
+            output_mode = 'tee'  # 调试模式要显示执行结果
+        interpreter = HangzhouInterpreter(memo_size=memo_size, governor=governor,
+                                          output=create_sink(output_mode))
+        interpreter.search_path.insert(0, os.path.dirname(os.path.abspath(filename)))  # 先找脚本旁边的模块
+        with timer.phase('parse', '语法分析'):
+            program = parse(tokens)
+        with timer.phase('optimize', '分析优化'):
+            analyzed = analyze_functions(program.statements)
+        
+        profiler = None
+        if profile:
+            from profiler import SamplingProfiler, DEFAULT_SAMPLE_RATE
+            profiler = SamplingProfiler(interpreter, profile_rate or DEFAULT_SAMPLE_RATE)
+            profiler.start()
+        try:
+            with timer.phase('execute', '执行'):
+                results = interpreter.interpret(program)
+        finally:
+            if profiler:
+                profiler.stop()
+        
+        if output_mode == 'capture':
+            # 出错时 interpret 在最后加了一行错误信息，下面会统一打印“执行错误”，和 stream 模式一样只打一遍
+            captured = results[:-1] if interpreter.last_error is not None else results
+            sys.stdout.write(''.join(line + '\n' for line in captured))
         
         if debug and results:
             print("执行结果:")
             for result in results:
                 print(result)
+        
+        if memo_stats:
+            print_memo_stats(interpreter)
+        
+        if quicken_stats:
+            print_quicken_stats(interpreter)
+        
+        if profiler:
+            if profile_output is None:
+                profile_output = os.path.splitext(os.path.basename(filename))[0] + '.collapsed'
+            profiler.write_collapsed(profile_output)
+            profiler.print_report(profile_top)
+            print(f"折叠栈已写到 {profile_output}，可以用 flamegraph.pl 或 speedscope 画火焰图")
+        
+        if time_format:
+            timer.count('tokens', len(tokens))
+            timer.count('ast_nodes', count_nodes(program.statements))
+            timer.count('functions_analyzed', analyzed)
+            timer.count('statements', interpreter.statements_executed())
+            timer.count('calls', interpreter.calls)
+            timer.count('peak_rss_bytes', peak_memory())
+            sys.stdout.flush()
+            print(timer.format(time_format), file=sys.stderr)
+        
+        if interpreter.last_error is not None:
+            print(f"执行错误: {interpreter.last_error}")
+            sys.exit(1)
     
     except FileNotFoundError:
         print(f"错误: 找不到文件 '{filename}'")
@@ -273,8 +513,14 @@ def run_example(example_name: str) -> None:
     except Exception as e:
         print(f"执行错误: {e}")
 
-def main() -> None:
-    """主函数"""
+def build_arg_parser() -> 'argparse.ArgumentParser':
+    """命令行参数解析器（只有带选项的时候才建）"""
+    import argparse
+    from governor import DEFAULT_CHECK_INTERVAL
+    from output import OUTPUT_MODES
+    from profiler import DEFAULT_SAMPLE_RATE
+    from timing import TIME_FORMATS
+    
     parser = argparse.ArgumentParser(
         description='杭州话编程语言解释器',
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -284,24 +530,89 @@ def main() -> None:
   hangzhoulang hello.hz           # 运行程序文件
   hangzhoulang --example hello    # 运行内置示例
   hangzhoulang --debug hello.hz   # 调试模式运行
+  hangzhoulang --memo-stats fib.hz  # 运行后显示纯函数缓存命中统计
+  hangzhoulang --quicken-stats loop.hz  # 运行后显示二元运算特化命中统计
+  hangzhoulang --max-steps 100000 --timeout 5 user.hz  # 限制资源运行
+  hangzhoulang --profile slow.hz  # 采样分析，输出火焰图数据
+  hangzhoulang --time slow.hz     # 各阶段耗时和计数（--time-format json 输出 JSON）
+  hangzhoulang run-many '*.hz'    # 用进程池批量运行（详见 run-many --help）
+  hangzhoulang serve &            # 常驻守护进程（详见 serve --help）
+  hangzhoulang client hello.hz    # 让守护进程跑（详见 client --help）
         '''
     )
     
     parser.add_argument('file', nargs='?', help='要执行的杭州话程序文件')
     parser.add_argument('--debug', '-d', action='store_true', help='启用调试模式')
     parser.add_argument('--example', '-e', help='运行内置示例')
+    parser.add_argument('--memo-stats', action='store_true', help='运行结束后显示纯函数缓存命中统计')
+    parser.add_argument('--memo-size', type=int, default=DEFAULT_MEMO_SIZE,
+                        help=f'每个纯函数结果缓存的容量，0 表示不缓存（默认 {DEFAULT_MEMO_SIZE}）')
+    parser.add_argument('--quicken-stats', action='store_true', help='运行结束后显示二元运算特化的命中统计')
+    parser.add_argument('--output', '-o', choices=OUTPUT_MODES, default='stream',
+                        help='话说 的输出方式：capture 跑完一起输出，stream 成块输出（默认），'
+                             'tee 收集同时输出，discard 不输出')
+    parser.add_argument('--profile', action='store_true', help='采样分析杭州话函数和行的耗时')
+    parser.add_argument('--profile-rate', type=int, default=DEFAULT_SAMPLE_RATE,
+                        help=f'每秒采样次数（默认 {DEFAULT_SAMPLE_RATE}）')
+    parser.add_argument('--profile-output', help='折叠栈输出文件（默认 <文件名>.collapsed）')
+    parser.add_argument('--profile-top', type=int, default=10, help='分析报告显示前几名（默认 10）')
+    parser.add_argument('--time', action='store_true',
+                        help='跑完以后往标准错误输出各阶段的墙钟/CPU时间和计数（词元、节点、语句、调用、峰值内存）')
+    parser.add_argument('--time-format', choices=TIME_FORMATS, default='table',
+                        help='--time 的格式：table 表格（默认），json 一行 JSON')
+    parser.add_argument('--max-steps', type=int, help='最多执行的语句数')
+    parser.add_argument('--max-depth', type=int, help='最深的函数调用层数')
+    parser.add_argument('--timeout', type=float, help='最长运行时间（秒）')
+    parser.add_argument('--max-memory', type=int, help='最多增长的内存（MB）')
+    parser.add_argument('--check-interval', type=int, default=DEFAULT_CHECK_INTERVAL,
+                        help=f'每执行多少条语句检查一次资源（默认 {DEFAULT_CHECK_INTERVAL}）')
     parser.add_argument('--version', '-v', action='version', version='杭州话编程语言 v1.0.0')
+    return parser
+
+def main() -> None:
+    """主函数"""
+    # 子命令
+    if len(sys.argv) > 1 and sys.argv[1] == 'run-many':
+        from batch import main as run_many_main
+        sys.exit(run_many_main(sys.argv[2:]))
+    if len(sys.argv) > 1 and sys.argv[1] == 'serve':
+        from server import main as serve_main
+        sys.exit(serve_main(sys.argv[2:]))
+    if len(sys.argv) > 1 and sys.argv[1] == 'client':
+        from client import main as client_main
+        sys.exit(client_main(sys.argv[2:]))
+    
+    # 不带选项的两种用法直接办，不用导入 argparse
+    if len(sys.argv) == 1:
+        HangzhouREPL().run()
+        return
+    if len(sys.argv) == 2 and not sys.argv[1].startswith('-'):
+        run_file(sys.argv[1])
+        return
     
-    args = parser.parse_args()
+    args = build_arg_parser().parse_args()
     
     # 运行示例
     if args.example:
         run_example(args.example)
         return
     
+    # 资源管控
+    governor = None
+    if any(limit is not None for limit in (args.max_steps, args.max_depth, args.timeout, args.max_memory)):
+        governor = ResourceGovernor(
+            max_steps=args.max_steps,
+            max_depth=args.max_depth,
+            max_time=args.timeout,
+            max_memory=args.max_memory * 1024 * 1024 if args.max_memory is not None else None,
+            check_interval=args.check_interval,
+        )
+    
     # 运行文件
     if args.file:
-        run_file(args.file, args.debug)
+        run_file(args.file, args.debug, args.memo_stats, args.memo_size, governor, args.output,
+                 args.profile, args.profile_rate, args.profile_output, args.profile_top,
+                 args.quicken_stats, args.time_format if args.time else None)
         return
     
     # 交互模式
@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+"""
+杭州话编程语言执行钩子
+Hangzhou Dialect Programming Language Tracing Hooks
+"""
+
+from typing import Callable, Dict, List
+
+# 事件名和回调参数
+STATEMENT = 'statement'        # callback(interpreter, stmt)            执行每条语句前
+CALL = 'call'                  # callback(interpreter, function, args)  调用用户函数前
+RETURN = 'return'              # callback(interpreter, function, value) 用户函数返回后
+BUILTIN_CALL = 'builtin_call'  # callback(interpreter, name, args)      调用内置函数前
+ERROR = 'error'                # callback(interpreter, error)           interpret 遇到错误后
+
+EVENTS = (STATEMENT, CALL, RETURN, BUILTIN_CALL, ERROR)
+
+class HookRegistry:
+    """按事件登记的回调"""
+    
+    def __init__(self):
+        self.callbacks: Dict[str, List[Callable]] = {event: [] for event in EVENTS}
+    
+    def register(self, event: str, callback: Callable) -> None:
+        """登记回调"""
+        if event not in self.callbacks:
+            raise ValueError(f"未知的钩子事件: {event}，可选: {', '.join(EVENTS)}")
+        self.callbacks[event].append(callback)
+    
+    def unregister(self, event: str, callback: Callable) -> None:
+        """注销回调"""
+        if event not in self.callbacks or callback not in self.callbacks[event]:
+            raise ValueError(f"没有登记过的钩子: {event}")
+        self.callbacks[event].remove(callback)
+    
+    def active(self) -> bool:
+        """是否还有登记着的回调"""
+        return any(self.callbacks.values())
@@ -4,28 +4,121 @@
 Hangzhou Dialect Programming Language Interpreter
 """
 
-from typing import Any, Dict, List, Optional, Union
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
 from parser import (
     ASTNode, Program, Statement, Expression,
-    VarDeclaration, Assignment, PrintStatement, IfStatement, WhileStatement,
-    FunctionDef, ReturnStatement, BinaryOp, UnaryOp, Literal, Identifier, FunctionCall
+    VarDeclaration, Assignment, PrintStatement, ExpressionStatement, IfStatement, WhileStatement,
+    ForStatement, ImportStatement, FunctionDef, ReturnStatement, IndexAssignment, BinaryOp, UnaryOp, Literal, Identifier, FunctionCall,
+    ListLiteral, IndexExpression, SliceExpression, DictLiteral, SetLiteral, InterpolatedString
 )
 from keywords import HANGZHOU_KEYWORDS
-import random
+from optimizer import analyze_function
+from quicken import QUICKEN_THRESHOLD, DEOPT_THRESHOLD, QuickState, find_specialization
+from governor import ResourceGovernor
+from output import OutputSink, create_sink
+from hooks import HookRegistry, STATEMENT, CALL, RETURN, BUILTIN_CALL, ERROR
+from utils import ResourceLimitError
+from lists import HangzhouList
+from strings import StringBuilder, StringRope
+from modules import MODULE_CACHE, LazyName, default_search_path, find_module
+from arrays import NumericArray, elementwise, make_array, array_range, total, minimum, maximum, mean
+import os
+import sys
 import time
 
+# 有副作用的内置函数，调用了它们的函数不能记忆化
+IMPURE_BUILTINS = {'撒宽', '撒子儿', '塞进', '拿掉'}
+
+# 可以改的值，纯函数返回它们时不进缓存（不然改了一个调用方拿到的，别的调用方也跟着变）
+MUTABLE_TYPES = (HangzhouList, NumericArray, dict, set, StringBuilder)
+
+# 往后拼出来的字符串到这么长才换成 StringRope，短的直接拼更省
+ROPE_THRESHOLD = 256
+
+# 每个纯函数结果缓存的默认容量
+DEFAULT_MEMO_SIZE = 1024
+
+def _member_key(value: Any) -> Tuple:
+    """集合元素的排序键：空的、真假、数字、字符串各排一堆，不同类型不用互相比"""
+    if value is None:
+        return (0, 0)
+    elif isinstance(value, bool):
+        return (1, value)
+    elif isinstance(value, (int, float)):
+        return (2, value)
+    elif isinstance(value, str):
+        return (3, value)
+    return (4, type(value).__name__, str(value))
+
+def set_members(values: set) -> List[Any]:
+    """
+    集合的元素排好序：Python 集合的顺序跟着哈希走，字符串的哈希每次运行都不一样，
+    打印、挨个走、转列表都用这个顺序，同一个程序每次结果都一样
+    """
+    return sorted(values, key=_member_key)
+
+def _to_list(values: Any) -> HangzhouList:
+    """转列表：集合按 set_members 的顺序"""
+    return HangzhouList(set_members(values) if isinstance(values, set) else list(values))
+
 class ReturnException(Exception):
     """用于函数返回的异常"""
     def __init__(self, value: Any):
         self.value = value
 
+class TailCallException(Exception):
+    """用于尾调用的异常：把下一次调用交还给外层的 call_user_function 循环"""
+    def __init__(self, function: 'HangzhouFunction', args: List[Any]):
+        self.function = function
+        self.args = args
+
+class MemoStats:
+    """同名纯函数缓存的累计命中统计（函数对象没了统计还在）"""
+    def __init__(self, name: str, maxsize: int):
+        self.name = name
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.caches = 0  # 建过几个缓存（每定义一次函数一个，调用到的函数被重新定义了也要重建）
+
+class MemoCache:
+    """纯函数结果的LRU缓存"""
+    def __init__(self, maxsize: int, stats: MemoStats):
+        self.maxsize = maxsize
+        self.entries: 'OrderedDict[Tuple, Any]' = OrderedDict()
+        self.stats = stats
+        stats.caches += 1
+    
+    def lookup(self, key: Tuple) -> Tuple[bool, Any]:
+        """查缓存，返回 (是否命中, 值)"""
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.stats.hits += 1
+            return True, self.entries[key]
+        self.stats.misses += 1
+        return False, None
+    
+    def store(self, key: Tuple, value: Any) -> None:
+        """存入缓存，超出容量时丢掉最久没用的"""
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
 class HangzhouFunction:
     """杭州话函数对象"""
-    def __init__(self, name: str, params: List[str], body: List[Statement], closure: Dict[str, Any]):
+    def __init__(self, name: str, params: List[str], body: List[Statement], closure: 'Environment',
+                 pure_calls: Optional[set] = None, annotated_pure: bool = False):
         self.name = name
         self.params = params
         self.body = body
-        self.closure = closure
+        self.closure = closure  # 定义函数时所在的环境，只存引用不拷贝
+        self.pure_calls = pure_calls  # 纯度分析结果，见 optimizer.analyze_purity
+        self.annotated_pure = annotated_pure  # 用 清爽 标注过
+        self.pure: Optional[bool] = None  # 第一次调用时才确定
+        self.cache: Optional[MemoCache] = None
+        self.callees: List[Tuple['Environment', str, Any]] = []  # 确定纯度时查到的 (环境, 名字, 值)
 
 class Environment:
     """变量环境"""
@@ -59,16 +152,117 @@ class Environment:
         """检查变量是否存在"""
         return name in self.variables or (self.parent and self.parent.has(name))
 
+class OverlayEnvironment(Environment):
+    """
+    写时复制的全局环境，叠在解释器模板的全局环境上面
+    读的时候先看自己再看模板；写只写自己，模板永远不变，所以克隆一个解释器
+    不用拷贝模板里的东西。模板里定义的函数第一次被读到时，复制一份把闭包
+    换成这个环境，免得它改全局变量时改到模板里去；列表、字典这些能就地改的值
+    也是第一次读到时复制一份，不然 塞进 之类的会改到模板，别的克隆也跟着变。
+    """
+    def __init__(self, base: Environment):
+        super().__init__()
+        self.base = base
+        self.copies: Dict[int, Any] = {}  # 模板里的值 id -> 这个环境里的副本，几个变量指着同一个值时副本也是同一个
+    
+    def get(self, name: str) -> Any:
+        """获取变量值"""
+        if name in self.variables:
+            return self.variables[name]
+        if name in self.base.variables:
+            value = self.base.variables[name]
+            if isinstance(value, HangzhouFunction) and value.closure is self.base:
+                value = HangzhouFunction(value.name, value.params, value.body, self,
+                                         value.pure_calls, value.annotated_pure)
+                self.variables[name] = value
+            elif isinstance(value, MUTABLE_TYPES):
+                value = self.copy_value(value)
+                self.variables[name] = value
+            return value
+        raise NameError(f"未定义的变量: {name}")
+    
+    def copy_value(self, value: Any) -> Any:
+        """深拷贝模板里能就地改的值，里面套着的列表、字典也拷，不能改的值原样返回"""
+        if not isinstance(value, MUTABLE_TYPES):
+            return value
+        copied = self.copies.get(id(value))
+        if copied is not None:
+            return copied
+        if isinstance(value, HangzhouList):
+            copied = HangzhouList()
+            self.copies[id(value)] = copied  # 先登记，列表里装着自己也不会无限递归
+            copied.items = [self.copy_value(item) for item in value]
+        elif isinstance(value, dict):
+            copied = {}
+            self.copies[id(value)] = copied
+            for key, item in value.items():
+                copied[key] = self.copy_value(item)
+        elif isinstance(value, set):
+            copied = set(value)  # 集合里只有不能改的值
+        elif isinstance(value, NumericArray):
+            copied = value.slice()  # 数组切片本来就复制
+        else:
+            copied = StringBuilder(value.build())
+        self.copies[id(value)] = copied
+        return copied
+    
+    def set(self, name: str, value: Any) -> None:
+        """设置变量值，模板里的变量在这里另存一份"""
+        self.variables[name] = value
+    
+    def has(self, name: str) -> bool:
+        """检查变量是否存在"""
+        return name in self.variables or name in self.base.variables
+
 class HangzhouInterpreter:
     """杭州话解释器"""
     
-    def __init__(self):
-        self.global_env = Environment()
+    def __init__(self, memo_size: int = DEFAULT_MEMO_SIZE, governor: Optional[ResourceGovernor] = None,
+                 output: Optional[OutputSink] = None, global_env: Optional[Environment] = None,
+                 quick_states: Optional[Dict[BinaryOp, QuickState]] = None):
+        # 传入 global_env（比如叠在模板上的 OverlayEnvironment）时，纯内置函数已经在里面了
+        shared_builtins = global_env is not None
+        self.global_env = global_env if shared_builtins else Environment()
         self.current_env = self.global_env
-        self.output_buffer = []  # 用于存储输出
+        
+        # 输出目的地，默认收集到 output_buffer 同时写到控制台
+        self.output = output if output is not None else create_sink('tee')
+        self.output_buffer = self.output.reset()  # 用于存储输出
+        self.last_error: Optional[Exception] = None  # interpret 最后一次遇到的错误
+        
+        # 资源管控：没有管控时倒计数永远减不到0
+        self.governor = governor
+        self.call_depth = 0
+        self.calls = 0  # 调用过几次用户函数（尾调用也算，每次换函数算一次），--time 报告用
+        self._max_depth = governor.max_depth if governor and governor.max_depth is not None else sys.maxsize
+        self._budget_countdown = governor.start() if governor else sys.maxsize
+        
+        # 执行钩子，登记了回调才切换到带钩子的子类
+        self.hooks = HookRegistry()
+        
+        # 杭州话层面的调用栈：(函数名, 调用处行号)，给采样分析器看
+        self.call_stack: List[Tuple[str, int]] = []
+        self.current_line = 0
+        
+        # 这个解释器特化过的二元运算节点（共享节点是它的 QuickState），报告命中率用
+        self.quickened: List[Union[BinaryOp, QuickState]] = []
+        # 共享节点（见 BinaryOp.shared）的特化状态
+        self.quick_states: Dict[BinaryOp, QuickState] = quick_states if quick_states is not None else {}
+        
+        # 模块：搜索路径、执行过的模块的全局环境（按路径）、正在执行的模块（查循环导入）
+        self.search_path: List[str] = default_search_path()
+        self.modules: Dict[str, Environment] = {}
+        self.loading_modules: List[str] = []
+        
+        # 纯函数记忆化
+        self.memo_size = memo_size
+        self.memo_stats: Dict[str, MemoStats] = {}
         
         # 内置函数
-        self._setup_builtins()
+        if shared_builtins:
+            self._setup_bound_builtins()
+        else:
+            self._setup_builtins()
         
         self._easter_egg_counter = 0
         self._secret_62_messages = [
@@ -104,7 +298,39 @@ class HangzhouInterpreter:
         self.global_env.define('是数字', lambda x: isinstance(x, (int, float)))
         self.global_env.define('是字符串', lambda x: isinstance(x, str))
         self.global_env.define('是布尔', lambda x: isinstance(x, bool))
+        self.global_env.define('是列表', lambda x: isinstance(x, HangzhouList))
+        self.global_env.define('是数组', lambda x: isinstance(x, NumericArray))
+        self.global_env.define('是字典', lambda x: isinstance(x, dict))
+        self.global_env.define('是集合', lambda x: isinstance(x, set))
+        
+        # 列表函数
+        self.global_env.define('塞进', self._builtin_append)     # append - 塞到末尾（集合是加进去）
+        
+        # 拼串：循环里拼长字符串用，不用每次复制
+        self.global_env.define('拼串', lambda text='': StringBuilder(text))
+        self.global_env.define('拼好', self._builtin_build)
+        
+        # 字典和集合函数
+        self.global_env.define('集合', lambda x=(): set(x))     # 从列表建集合
+        self.global_env.define('键', _to_list)                                 # 字典的全部键
+        self.global_env.define('值', lambda x: HangzhouList(list(x.values()))) # 字典的全部值
+        self.global_env.define('取', self._builtin_get)          # 取（字典，键，没有时的默认值）
+        self.global_env.define('有没有', self._builtin_contains) # 有没有（容器，值）
+        self.global_env.define('拿掉', self._builtin_remove)     # 拿掉（字典或集合，键）
+        
+        # 数值数组：加减乘除整个数组一次算完
+        self.global_env.define('数组', self._builtin_array)       # 从列表建数组
+        self.global_env.define('等差数组', array_range)           # 等差数组（开始，结束，步长）
+        self.global_env.define('转列表', _to_list)
+        self.global_env.define('求和', total)
+        self.global_env.define('最小', minimum)
+        self.global_env.define('最大', maximum)
+        self.global_env.define('平均', mean)
 
+        self._setup_bound_builtins()
+    
+    def _setup_bound_builtins(self) -> None:
+        """设置要用到解释器本身的内置函数（每个解释器各有一份）"""
         # 系统函数
         self.global_env.define('撒宽', self._builtin_sleep)      # sleep - 随意放松
         self.global_env.define('撒子儿', self._builtin_random)   # random - 玩耍/随机
@@ -116,8 +342,90 @@ class HangzhouInterpreter:
         """
         if not isinstance(ms, (int, float)):
             raise TypeError("撒宽的参数必须是数字（毫秒）")
+        if self.governor:
+            self.governor.check_time(ms / 1000)
+        self.output.flush()  # 睏觉前先把攒着的输出写出去
         time.sleep(ms / 1000)
 
+    @staticmethod
+    def _builtin_append(target: Union[HangzhouList, set, StringBuilder], value: Any) -> Any:
+        """
+        塞进 - 在列表末尾加一个元素，均摊 O(1)；集合就是把值加进去；拼串就是往后拼
+        用法: 塞进(列表, 值)，返回列表本身
+        """
+        if isinstance(target, HangzhouList):
+            target.append(value)
+        elif isinstance(target, set):
+            target.add(value)
+        elif isinstance(target, StringBuilder):
+            if type(value) is str:
+                target.append(value)
+            elif type(value) is int or type(value) is float:
+                target.append(str(value))
+            else:
+                raise TypeError("拼串里只能塞字符串和数字")
+        else:
+            raise TypeError("塞进的第一个参数必须是列表、集合或者拼串")
+        return target
+
+    @staticmethod
+    def _builtin_build(builder: StringBuilder) -> str:
+        """
+        拼好 - 把拼串拼成一个字符串
+        用法: 拼好(拼串)
+        """
+        if not isinstance(builder, StringBuilder):
+            raise TypeError("拼好的参数必须是拼串")
+        return builder.build()
+
+    @staticmethod
+    def _builtin_get(target: dict, key: Any, default: Any = None) -> Any:
+        """
+        取 - 按键取字典里的值，没有这个键就返回默认值
+        用法: 取(字典, 键) 或 取(字典, 键, 默认值)
+        """
+        if not isinstance(target, dict):
+            raise TypeError("取的第一个参数必须是字典")
+        return target.get(key, default)
+
+    @staticmethod
+    def _builtin_contains(container: Any, value: Any) -> bool:
+        """
+        有没有 - 字典（看键）、集合、列表、字符串里有没有这个值
+        字典和集合是 O(1)，列表要一个一个比
+        """
+        if isinstance(container, (dict, set)):
+            return value in container
+        if isinstance(container, str):
+            return isinstance(value, str) and value in container
+        if isinstance(container, (HangzhouList, NumericArray)):
+            return value in container
+        raise TypeError("有没有的第一个参数必须是字典、集合、列表或者字符串")
+
+    @staticmethod
+    def _builtin_remove(target: Union[dict, set], key: Any) -> Union[dict, set]:
+        """
+        拿掉 - 从字典里拿掉一个键，或者从集合里拿掉一个值，没有也不出错
+        用法: 拿掉(字典, 键)，返回字典本身
+        """
+        if isinstance(target, dict):
+            target.pop(key, None)
+        elif isinstance(target, set):
+            target.discard(key)
+        else:
+            raise TypeError("拿掉的第一个参数必须是字典或者集合")
+        return target
+
+    @staticmethod
+    def _builtin_array(values: Any) -> NumericArray:
+        """
+        数组 - 从列表建一个数值数组（全是整数就是整数数组，否则是小数数组）
+        用法: 数组(列表)
+        """
+        if not isinstance(values, (HangzhouList, NumericArray)):
+            raise TypeError("数组的参数必须是列表")
+        return make_array(values)
+
     def _builtin_random(self, *args) -> Union[int, float]:
         """
         撒子儿 - 随机数函数
@@ -126,6 +434,7 @@ class HangzhouInterpreter:
           撒子儿(max)     -> 0到max之间的随机整数
           撒子儿(min,max) -> min到max之间的随机整数
         """
+        import random  # 用到才导入，省启动时间
         if len(args) == 0:
             return random.random()
         elif len(args) == 1:
@@ -135,13 +444,37 @@ class HangzhouInterpreter:
         else:
             raise TypeError("撒子儿最多接受两个参数")
 
+    def register_hook(self, event: str, callback: Callable) -> None:
+        """登记执行钩子，事件见 hooks.EVENTS"""
+        self.hooks.register(event, callback)
+        self._update_instrumentation()
+    
+    def unregister_hook(self, event: str, callback: Callable) -> None:
+        """注销执行钩子，全部注销后回到不带钩子的执行路径"""
+        self.hooks.unregister(event, callback)
+        self._update_instrumentation()
+    
+    def _update_instrumentation(self) -> None:
+        """
+        有钩子时把实例换成带钩子的子类，没有时换回来，
+        所以从没登记过钩子的解释器执行路径上一点额外开销都没有。
+        （CPython 改过 __class__ 的实例属性访问会稍慢一点，所以类不变时不去改它）
+        """
+        base = getattr(type(self), '_uninstrumented_class', type(self))
+        target = traced_class(base) if self.hooks.active() else base
+        if type(self) is not target:
+            self.__class__ = target
+    
     def error(self, message: str) -> None:
         """抛出运行时错误"""
         raise RuntimeError(f"运行时错误: {message}")
     
     def interpret(self, program: Program) -> List[str]:
         """解释执行程序"""
-        self.output_buffer = []
+        self.output_buffer = self.output.reset()
+        self.last_error = None
+        self._budget_countdown = self.governor.start() if self.governor else sys.maxsize
+        self.calls = 0
         
         try:
             for statement in program.statements:
@@ -150,12 +483,27 @@ class HangzhouInterpreter:
             # 在全局作用域遇到return，忽略
             pass
         except Exception as e:
+            # 资源超限是 ResourceLimitError，调用方可以从 last_error 区分
+            self.last_error = e
             self.output_buffer.append(f"错误: {str(e)}")
+        finally:
+            self.output.flush()
         
         return self.output_buffer
     
+    def statements_executed(self) -> int:
+        """这次 interpret 执行了多少条语句，从资源管控的倒计数推出来，不另外计数"""
+        if self.governor:
+            return self.governor.executed(self._budget_countdown)
+        return sys.maxsize - self._budget_countdown
+    
     def execute_statement(self, stmt: Statement) -> None:
         """执行语句"""
+        self._budget_countdown -= 1
+        if self._budget_countdown <= 0:
+            self._budget_countdown = self.governor.checkpoint() if self.governor else sys.maxsize
+        self.current_line = stmt.line
+        
         if isinstance(stmt, VarDeclaration):
             self.execute_var_declaration(stmt)
         elif isinstance(stmt, Assignment):
@@ -166,10 +514,19 @@ class HangzhouInterpreter:
             self.execute_if_statement(stmt)
         elif isinstance(stmt, WhileStatement):
             self.execute_while_statement(stmt)
+        elif isinstance(stmt, ForStatement):
+            self.execute_for_statement(stmt)
+        elif isinstance(stmt, ImportStatement):
+            self.execute_import_statement(stmt)
         elif isinstance(stmt, FunctionDef):
             self.execute_function_def(stmt)
         elif isinstance(stmt, ReturnStatement):
             self.execute_return_statement(stmt)
+        elif isinstance(stmt, ExpressionStatement):
+            self.evaluate_expression(stmt.expression)
+        elif isinstance(stmt, IndexAssignment):
+            self.assign_index(self.evaluate_expression(stmt.target), self.evaluate_expression(stmt.index),
+                              self.evaluate_expression(stmt.value))
         else:
             self.error(f"未知的语句类型: {type(stmt)}")
     
@@ -182,21 +539,54 @@ class HangzhouInterpreter:
     
     def execute_assignment(self, stmt: Assignment) -> None:
         """执行赋值语句"""
+        if stmt.append_value is not None:
+            self.execute_append_assignment(stmt)
+            return
         value = self.evaluate_expression(stmt.value)
         self.current_env.set(stmt.name, value)
     
+    def execute_append_assignment(self, stmt: Assignment) -> None:
+        """
+        执行 `名字 装 名字 加 表达式`
+        两边都是字符串、拼出来又够长时，变量里存 StringRope，往后拼只是塞一个片段，
+        不再每次复制整个字符串；读这个变量的时候才拼成 str。
+        """
+        env = self.current_env
+        current = env.get(stmt.name)
+        current_type = type(current)
+        if current_type is not str and current_type is not StringRope:
+            env.set(stmt.name, self.evaluate_expression(stmt.value))
+            return
+        
+        size = len(current)
+        value = self.evaluate_expression(stmt.append_value)
+        if type(value) is not str:
+            left = current if current_type is str else current.build()[:size]
+            env.set(stmt.name, self.binary_operation(stmt.value.operator, left, value))
+            return
+        
+        if current_type is str:
+            if size + len(value) < ROPE_THRESHOLD:
+                env.set(stmt.name, current + value)
+                return
+            current = StringRope(current)
+        elif len(current) != size:
+            # 求右边的时候这个变量自己又被往后拼过了，按原来那一段算
+            current = StringRope(current.build()[:size])
+        current.append(value)
+        env.set(stmt.name, current)
+    
     def execute_print_statement(self, stmt: PrintStatement) -> None:
         """执行输出语句"""
         value = self.evaluate_expression(stmt.expression)
-        output = self.stringify(value)
-        self.output_buffer.append(output)
-        print(output)  # 同时输出到控制台
+        self.output.write(self.stringify(value))
     
     def execute_if_statement(self, stmt: IfStatement) -> None:
         """执行条件语句"""
         condition_value = self.evaluate_expression(stmt.condition)
         
-        if self.is_truthy(condition_value):
+        # 条件多半是比较运算，结果是 真的/假的 时不必再调 is_truthy
+        if condition_value is True or (condition_value is not False and self.is_truthy(condition_value)):
             for statement in stmt.then_branch:
                 self.execute_statement(statement)
         elif stmt.else_branch:
@@ -206,20 +596,138 @@ class HangzhouInterpreter:
     def execute_while_statement(self, stmt: WhileStatement) -> None:
         """执行循环语句"""
         while True:
+            self.current_line = stmt.line  # 条件算在 一息息 这一行上
             condition_value = self.evaluate_expression(stmt.condition)
-            if not self.is_truthy(condition_value):
+            if condition_value is False or (condition_value is not True and not self.is_truthy(condition_value)):
                 break
             
             for statement in stmt.body:
                 self.execute_statement(statement)
     
+    def execute_for_statement(self, stmt: ForStatement) -> None:
+        """
+        执行挨个循环
+        直接用 Python 的 for 走 range 或者列表，循环变量直接写进当前环境的字典，
+        不用每趟算一遍条件、加一遍 1、再顺着环境链找变量。
+        """
+        source = self.evaluate_expression(stmt.source)
+        stop = self.evaluate_expression(stmt.stop) if stmt.stop is not None else None
+        variables = self.current_env.variables
+        name = stmt.name
+        body = stmt.body
+        for value in self.loop_values(stmt, source, stop):
+            variables[name] = value
+            for statement in body:
+                self.execute_statement(statement)
+    
+    def loop_values(self, stmt: ForStatement, source: Any, stop: Any) -> Iterable[Any]:
+        """挨个循环要走的值：从 ... 直到 ... 是 range，不然走列表、字符串、数组、字典的键、集合"""
+        if stmt.stop is not None:
+            if type(source) is not int or type(stop) is not int:
+                self.error(f"从 ... 直到 ... 两头都要是整数，不是 {self.stringify(source)} 和 {self.stringify(stop)}")
+            return range(source, stop)
+        if isinstance(source, (HangzhouList, str)):
+            return source
+        elif isinstance(source, dict):
+            return list(source)  # 先拷一份键，循环里改字典也不会出错
+        elif isinstance(source, set):
+            return set_members(source)
+        elif isinstance(source, NumericArray):
+            return source.tolist()
+        self.error(f"{self.stringify(source)} 不能挨个走")
+    
+    def execute_import_statement(self, stmt: ImportStatement) -> None:
+        """
+        执行导入：找到模块、取解析好的语法树（一个进程只解析一次），
+        把名字绑成 LazyName，模块等第一次用到其中一个名字时才执行
+        """
+        search_path = self.search_path
+        if self.loading_modules:
+            # 模块里的导入先在模块自己的目录里找
+            search_path = [os.path.dirname(self.loading_modules[-1])] + search_path
+        try:
+            path = find_module(stmt.module, search_path)
+            source = MODULE_CACHE.load(stmt.module, path)
+        except (ImportError, OSError, SyntaxError) as e:
+            self.error(f"导入 {stmt.module} 时出错: {e}")
+        
+        names = stmt.names if stmt.names is not None else source.exports
+        for name in names:
+            if name not in source.exports:
+                self.error(f"模块 {stmt.module} 里没有 {name}")
+        
+        module_env = self.modules.get(path)
+        for name in names:
+            value = module_env.get(name) if module_env is not None else LazyName(path, name)
+            self.current_env.define(name, value)
+    
+    def resolve_lazy(self, name: str, lazy: LazyName) -> Any:
+        """第一次读导入进来的名字：执行模块，把占位换成真的值"""
+        value = self.load_module(lazy.path).get(lazy.name)
+        if type(value) is StringRope:
+            value = value.build()
+        env = self.current_env
+        while env is not None and env.variables.get(name) is not lazy:
+            env = env.parent
+        (env or self.global_env).variables[name] = value
+        return value
+    
+    def load_module(self, path: str) -> Environment:
+        """执行模块（每个解释器一次），返回它的全局环境；模块执行到一半又要用自己就是循环导入"""
+        module_env = self.modules.get(path)
+        if module_env is not None:
+            return module_env
+        if path in self.loading_modules:
+            cycle = self.loading_modules[self.loading_modules.index(path):] + [path]
+            self.error("循环导入: " + " → ".join(os.path.basename(p) for p in cycle))
+        
+        source = MODULE_CACHE.load(os.path.splitext(os.path.basename(path))[0], path)
+        module_env = self._new_module_environment()
+        previous_env = self.current_env
+        previous_line = self.current_line
+        self.current_env = module_env
+        self.loading_modules.append(path)
+        self.call_stack.append((f'<模块 {source.name}>', previous_line))
+        try:
+            for statement in source.program.statements:
+                self.execute_statement(statement)
+        except ReturnException:
+            pass
+        finally:
+            self.call_stack.pop()
+            self.loading_modules.pop()
+            self.current_env = previous_env
+            self.current_line = previous_line
+        
+        self.modules[path] = module_env
+        return module_env
+    
+    def _new_module_environment(self) -> Environment:
+        """模块自己的全局环境：只有内置函数，看不到导入它的程序的变量"""
+        saved = self.global_env
+        self.global_env = Environment()
+        try:
+            self._setup_builtins()
+            return self.global_env
+        finally:
+            self.global_env = saved
+    
     def execute_function_def(self, stmt: FunctionDef) -> None:
         """执行函数定义"""
-        function = HangzhouFunction(stmt.name, stmt.params, stmt.body, dict(self.current_env.variables))
+        if not stmt.analyzed:
+            analyze_function(stmt)
+        function = HangzhouFunction(stmt.name, stmt.params, stmt.body, self.current_env,
+                                    stmt.pure_calls, stmt.pure)
         self.current_env.define(stmt.name, function)
     
     def execute_return_statement(self, stmt: ReturnStatement) -> None:
         """执行返回语句"""
+        if stmt.tail_call:
+            function = self.current_env.get(stmt.value.name)
+            if isinstance(function, HangzhouFunction):
+                args = [self.evaluate_expression(arg) for arg in stmt.value.args]
+                raise TailCallException(function, args)
+        
         value = None
         if stmt.value:
             value = self.evaluate_expression(stmt.value)
@@ -230,18 +738,64 @@ class HangzhouInterpreter:
         if isinstance(expr, Literal):
             return expr.value
         elif isinstance(expr, Identifier):
-            return self.current_env.get(expr.name)
+            value = self.current_env.get(expr.name)
+            value_type = type(value)
+            if value_type is StringRope:
+                return value.build()
+            elif value_type is LazyName:
+                return self.resolve_lazy(expr.name, value)
+            return value
         elif isinstance(expr, BinaryOp):
             return self.evaluate_binary_op(expr)
+        elif isinstance(expr, InterpolatedString):
+            stringify = self.stringify
+            return ''.join([part if type(part) is str else stringify(self.evaluate_expression(part))
+                            for part in expr.parts])
         elif isinstance(expr, UnaryOp):
             return self.evaluate_unary_op(expr)
         elif isinstance(expr, FunctionCall):
             return self.evaluate_function_call(expr)
+        elif isinstance(expr, IndexExpression):
+            return self.index_value(self.evaluate_expression(expr.target), self.evaluate_expression(expr.index))
+        elif isinstance(expr, ListLiteral):
+            return HangzhouList([self.evaluate_expression(element) for element in expr.elements])
+        elif isinstance(expr, DictLiteral):
+            return self.build_dict([(self.evaluate_expression(key), self.evaluate_expression(value))
+                                    for key, value in expr.entries])
+        elif isinstance(expr, SetLiteral):
+            return self.build_set([self.evaluate_expression(element) for element in expr.elements])
+        elif isinstance(expr, SliceExpression):
+            return self.slice_value(self.evaluate_expression(expr.target),
+                                    self.evaluate_expression(expr.start) if expr.start else None,
+                                    self.evaluate_expression(expr.stop) if expr.stop else None)
         else:
             self.error(f"未知的表达式类型: {type(expr)}")
     
     def evaluate_binary_op(self, expr: BinaryOp) -> Any:
         """求值二元运算"""
+        # 特化过的节点：两边类型对得上就直接算
+        quick = expr.quick
+        if quick is not None:
+            left = self.evaluate_expression(expr.left)
+            right = self.evaluate_expression(expr.right)
+            if type(left) is quick.left_type and type(right) is quick.right_type:
+                expr.hits += 1
+                return quick.function(left, right)
+            
+            expr.misses += 1
+            if expr.misses > DEOPT_THRESHOLD and expr.misses > expr.hits:
+                expr.quick = None  # 类型老是对不上，退回通用路径，不再特化
+            return self.binary_operation(expr.operator, left, right)
+        
+        # 共享节点的特化状态不在节点上，在 quick_states 里
+        state = expr
+        if expr.shared:
+            state = self.quick_states.get(expr)
+            if state is None:
+                state = self.quick_states[expr] = QuickState(expr.operator)
+            if state.quick is not None:
+                return self._evaluate_shared_quick(expr, state)
+        
         left = self.evaluate_expression(expr.left)
         
         # 短路求值
@@ -256,59 +810,192 @@ class HangzhouInterpreter:
         
         right = self.evaluate_expression(expr.right)
         
+        state.executions += 1
+        if state.executions == QUICKEN_THRESHOLD:
+            self._quicken(state, left, right)
+        return self.binary_operation(expr.operator, left, right)
+    
+    def _evaluate_shared_quick(self, expr: BinaryOp, state: QuickState) -> Any:
+        """共享节点特化过以后的快路径，和 evaluate_binary_op 开头一样，只是计数记在 state 上"""
+        quick = state.quick
+        left = self.evaluate_expression(expr.left)
+        right = self.evaluate_expression(expr.right)
+        if type(left) is quick.left_type and type(right) is quick.right_type:
+            state.hits += 1
+            return quick.function(left, right)
+        
+        state.misses += 1
+        if state.misses > DEOPT_THRESHOLD and state.misses > state.hits:
+            state.quick = None
+        return self.binary_operation(expr.operator, left, right)
+    
+    def _quicken(self, state: Union[BinaryOp, QuickState], left: Any, right: Any) -> None:
+        """按这次的操作数类型给节点换上特化版本"""
+        quick = find_specialization(state.operator, left, right)
+        if quick is not None:
+            state.quick = quick
+            state.line = self.current_line
+            self.quickened.append(state)
+    
+    def get_quicken_stats(self) -> List[Dict[str, Any]]:
+        """获取特化过的二元运算节点的命中统计（节点在共用语法树的解释器之间共享计数）"""
+        stats = []
+        for expr in self.quickened:
+            total = expr.hits + expr.misses
+            stats.append({
+                'line': expr.line,
+                'operator': expr.operator,
+                'specialization': expr.quick.name if expr.quick is not None else '已退回',
+                'hits': expr.hits,
+                'misses': expr.misses,
+                'hit_rate': expr.hits / total if total else 0.0,
+            })
+        return stats
+    
+    def binary_operation(self, operator: str, left: Any, right: Any) -> Any:
+        """对两个已经求好的值做二元运算（短路运算在求值时处理）"""
+        # 有一边是数组，整个交给向量化的内核
+        if type(left) is NumericArray or type(right) is NumericArray:
+            return self.array_operation(operator, left, right)
+        
         # 算术运算
-        if expr.operator in ['+', '加']:
+        if operator in ['+', '加']:
             return left + right
-        elif expr.operator in ['-', '减']:
+        elif operator in ['-', '减']:
             return left - right
-        elif expr.operator in ['*', '乘']:
+        elif operator in ['*', '乘']:
             return left * right
-        elif expr.operator in ['/', '除']:
+        elif operator in ['/', '除']:
             if right == 0:
                 self.error("除零错误")
             return left / right
         
         # 比较运算
-        elif expr.operator in ['>', '大过']:
+        elif operator in ['>', '大过']:
             return left > right
-        elif expr.operator in ['<', '小过']:
+        elif operator in ['<', '小过']:
             return left < right
-        elif expr.operator in ['>=', '大等于']:
+        elif operator in ['>=', '大等于']:
             return left >= right
-        elif expr.operator in ['<=', '小等于']:
+        elif operator in ['<=', '小等于']:
             return left <= right
-        elif expr.operator in ['==', '等于']:
+        elif operator in ['==', '等于']:
             return left == right
-        elif expr.operator in ['!=', '不等']:
+        elif operator in ['!=', '不等']:
             return left != right
         
         else:
-            self.error(f"未知的二元运算符: {expr.operator}")
+            self.error(f"未知的二元运算符: {operator}")
+    
+    def array_operation(self, operator: str, left: Any, right: Any) -> Any:
+        """数组的二元运算：加减乘除逐元素算（数字广播到每个元素），等于/不等比较整个数组"""
+        if operator in ['==', '等于']:
+            return left == right
+        elif operator in ['!=', '不等']:
+            return left != right
+        try:
+            return elementwise(operator, left, right)
+        except KeyError:
+            self.error(f"数组不支持 {operator} 运算")
+        except (TypeError, ValueError, ZeroDivisionError, OverflowError) as e:
+            self.error(str(e))
     
     def evaluate_unary_op(self, expr: UnaryOp) -> Any:
         """求值一元运算"""
         operand = self.evaluate_expression(expr.operand)
-        
-        if expr.operator == '-':
+        return self.unary_operation(expr.operator, operand)
+    
+    def unary_operation(self, operator: str, operand: Any) -> Any:
+        """对已经求好的值做一元运算"""
+        if operator == '-':
             return -operand
-        elif expr.operator in ['不是', 'not']:
+        elif operator in ['不是', 'not']:
             return not self.is_truthy(operand)
         else:
-            self.error(f"未知的一元运算符: {expr.operator}")
+            self.error(f"未知的一元运算符: {operator}")
+    
+    def build_dict(self, entries: List[Tuple[Any, Any]]) -> dict:
+        """
+        用求好的键值对建字典，键要能哈希
+        和 Python 一样，相等的键算同一个：1、1.0 和 真的 是一个键，留第一次的键、最后一次的值
+        """
+        result = {}
+        for key, value in entries:
+            try:
+                result[key] = value
+            except TypeError:
+                self.error(f"{self.stringify(key)} 不能当键")
+        return result
+    
+    def build_set(self, elements: List[Any]) -> set:
+        """用求好的元素建集合，1、1.0 和 真的 相等，只留第一个"""
+        try:
+            return set(elements)
+        except TypeError:
+            self.error("列表、数组、字典和集合不能放进集合")
+    
+    def index_value(self, target: Any, index: Any) -> Any:
+        """取下标：列表、数组和字符串都可以，负数从末尾数；字典按键取"""
+        if type(target) is dict:
+            try:
+                return target[index]
+            except KeyError:
+                self.error(f"字典里没有这个键: {self._stringify_element(index)}")
+            except TypeError:
+                self.error(f"{self.stringify(index)} 不能当键")
+        if type(index) is not int:
+            self.error(f"下标必须是整数，不是 {self.stringify(index)}")
+        if isinstance(target, (HangzhouList, NumericArray)):
+            try:
+                return target.get(index)
+            except IndexError as e:
+                self.error(str(e))
+        elif isinstance(target, str):
+            if not -len(target) <= index < len(target):
+                self.error(f"下标超出范围: {index}（长度 {len(target)}）")
+            return target[index]
+        self.error(f"{self.stringify(target)} 不能取下标")
+    
+    def slice_value(self, target: Any, start: Any, stop: Any) -> Any:
+        """切片：列表返回不复制的视图，数组复制一段，字符串返回子串"""
+        for bound in (start, stop):
+            if bound is not None and type(bound) is not int:
+                self.error(f"切片的位置必须是整数，不是 {self.stringify(bound)}")
+        if isinstance(target, (HangzhouList, NumericArray)):
+            return target.slice(start, stop)
+        elif isinstance(target, str):
+            return target[start:stop]
+        self.error(f"{self.stringify(target)} 不能切片")
+    
+    def assign_index(self, target: Any, index: Any, value: Any) -> None:
+        """下标赋值，只有列表、数组和字典可以改"""
+        if type(target) is dict:
+            try:
+                target[index] = value
+            except TypeError:
+                self.error(f"{self.stringify(index)} 不能当键")
+            return
+        if not isinstance(target, (HangzhouList, NumericArray)):
+            self.error(f"{self.stringify(target)} 不能按下标赋值")
+        if type(index) is not int:
+            self.error(f"下标必须是整数，不是 {self.stringify(index)}")
+        try:
+            target.set(index, value)
+        except (IndexError, TypeError) as e:
+            self.error(str(e))
     
     def evaluate_function_call(self, expr: FunctionCall) -> Any:
         """求值函数调用"""
         function = self.current_env.get(expr.name)
+        if type(function) is LazyName:
+            function = self.resolve_lazy(expr.name, function)
         
         # 求值参数
         args = [self.evaluate_expression(arg) for arg in expr.args]
         
         # 内置函数（Python函数）
         if callable(function) and not isinstance(function, HangzhouFunction):
-            try:
-                return function(*args)
-            except Exception as e:
-                self.error(f"调用内置函数 {expr.name} 时出错: {str(e)}")
+            return self.call_builtin(expr.name, function, args)
         
         # 用户定义函数
         elif isinstance(function, HangzhouFunction):
@@ -317,60 +1004,218 @@ class HangzhouInterpreter:
         else:
             self.error(f"{expr.name} 不是一个函数")
     
+    def call_builtin(self, name: str, function: Callable, args: List[Any]) -> Any:
+        """调用内置函数"""
+        try:
+            return function(*args)
+        except ResourceLimitError:
+            raise
+        except Exception as e:
+            self.error(f"调用内置函数 {name} 时出错: {str(e)}")
+    
     def call_user_function(self, function: HangzhouFunction, args: List[Any]) -> Any:
-        """调用用户定义的函数"""
-        if len(args) != len(function.params):
-            self.error(f"函数 {function.name} 期望 {len(function.params)} 个参数，但提供了 {len(args)} 个")
-        
-        # 创建新的环境
-        function_env = Environment(self.current_env)
-        
-        # 绑定参数
-        for param, arg in zip(function.params, args):
-            function_env.define(param, arg)
+        """
+        调用用户定义的函数
+        尾调用不递归，而是在这里循环：换成新的函数和参数，复用同一个Python帧，
+        自递归和互相递归都不会再撞到Python的递归上限。
+        纯函数先查结果缓存，最外层这次调用的结果算好后存进去。
+        """
+        # 调用深度
+        self.calls += 1
+        self.call_depth += 1
+        if self.call_depth > self._max_depth:
+            self.call_depth -= 1
+            raise self.governor.depth_exceeded()
         
-        # 保存当前环境，切换到函数环境
+        # 保存当前环境，压入杭州话调用栈
         previous_env = self.current_env
-        self.current_env = function_env
+        call_line = self.current_line
+        self.call_stack.append((function.name, call_line))
+        memo_cache = None
+        memo_key = None
         
         try:
-            # 执行函数体
-            for statement in function.body:
-                self.execute_statement(statement)
-            
-            # 如果没有显式返回，返回None
-            return None
-        
-        except ReturnException as ret:
-            return ret.value
+            while True:
+                if len(args) != len(function.params):
+                    self.error(f"函数 {function.name} 期望 {len(function.params)} 个参数，但提供了 {len(args)} 个")
+                
+                # 查纯函数缓存
+                if function.pure is None or (function.pure and self._callees_changed(function)):
+                    self._setup_memo(function)
+                if function.cache is not None:
+                    key = self._memo_key(args)
+                    if key is not None:
+                        hit, result = function.cache.lookup(key)
+                        if hit:
+                            break
+                        if memo_cache is None:
+                            memo_cache, memo_key = function.cache, key
+                
+                # 创建新的环境，挂在函数定义时的环境下面（词法作用域）
+                function_env = Environment(function.closure)
+                
+                # 绑定参数
+                for param, arg in zip(function.params, args):
+                    function_env.define(param, arg)
+                
+                # 切换到函数环境
+                self.current_env = function_env
+                
+                try:
+                    # 执行函数体
+                    for statement in function.body:
+                        self.execute_statement(statement)
+                    
+                    # 如果没有显式返回，返回None
+                    result = None
+                    break
+                
+                except TailCallException as call:
+                    function, args = call.function, call.args
+                    self.call_stack[-1] = (function.name, call_line)
+                    self.calls += 1
+                
+                except ReturnException as ret:
+                    result = ret.value
+                    break
         
         finally:
             # 恢复环境
             self.current_env = previous_env
+            self.call_depth -= 1
+            self.call_stack.pop()
+            self.current_line = call_line
+        
+        if memo_cache is not None and not isinstance(result, MUTABLE_TYPES):
+            memo_cache.store(memo_key, result)
+        return result
+    
+    def _setup_memo(self, function: HangzhouFunction) -> None:
+        """
+        第一次调用时确定函数纯不纯，纯的话给它配一个结果缓存
+        调用到的函数后来被重新定义了，再调用时重新确定一遍，旧缓存整个丢掉
+        """
+        function.callees = []
+        function.cache = None
+        function.pure = self._resolve_purity(function)
+        if function.pure and self.memo_size > 0:
+            stats = self.memo_stats.get(function.name)
+            if stats is None:
+                stats = self.memo_stats[function.name] = MemoStats(function.name, self.memo_size)
+            function.cache = MemoCache(self.memo_size, stats)
+    
+    def _resolve_purity(self, function: HangzhouFunction) -> bool:
+        """判断函数连同它调用到的所有函数是不是都是纯的"""
+        if function.annotated_pure:
+            return True
+        
+        seen = {function}
+        pending = [function]
+        while pending:
+            current = pending.pop()
+            if current.pure_calls is None:
+                return False
+            
+            for name in current.pure_calls:
+                if name in IMPURE_BUILTINS or not current.closure.has(name):
+                    return False
+                callee = current.closure.get(name)
+                function.callees.append((current.closure, name, callee))
+                if isinstance(callee, HangzhouFunction):
+                    if not callee.annotated_pure and callee not in seen:
+                        seen.add(callee)
+                        pending.append(callee)
+                elif not callable(callee) or getattr(callee, 'has_side_effects', False):
+                    return False
+        
+        return True
+    
+    def _callees_changed(self, function: HangzhouFunction) -> bool:
+        """确定纯度时查到的函数有没有哪个被重新定义过"""
+        for env, name, callee in function.callees:
+            try:
+                if env.get(name) is not callee:
+                    return True
+            except NameError:
+                return True
+        return False
+    
+    def _memo_key(self, args: List[Any]) -> Optional[Tuple]:
+        """缓存键：带上类型，免得 1、1.0 和 真的 混在一起；参数不能哈希时返回None"""
+        key = tuple((type(arg), arg) for arg in args)
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+    
+    def get_memo_stats(self) -> List[Dict[str, Any]]:
+        """获取纯函数缓存的命中统计"""
+        return [
+            {
+                'name': stats.name,
+                'hits': stats.hits,
+                'misses': stats.misses,
+                'caches': stats.caches,
+                'maxsize': stats.maxsize,
+            }
+            for stats in self.memo_stats.values()
+        ]
     
     def is_truthy(self, value: Any) -> bool:
         """判断值的真假"""
+        # 最常见的几种确切类型先判断（比较运算的结果都是 bool）
+        value_type = type(value)
+        if value_type is bool:
+            return value
+        elif value_type is int or value_type is float:
+            return value != 0
+        
         if value is None:
             return False
         elif isinstance(value, bool):
             return value
         elif isinstance(value, (int, float)):
             return value != 0
-        elif isinstance(value, str):
+        elif isinstance(value, (str, HangzhouList, NumericArray, dict, set, StringBuilder)):
             return len(value) > 0
         else:
             return True
     
     def stringify(self, value: Any) -> str:
         """将值转换为字符串"""
+        # 最常见的几种确切类型先判断
+        value_type = type(value)
+        if value_type is str:
+            return value
+        elif value_type is int or value_type is float:
+            return str(value)
+        
         if value is None:
             return "空的"
         elif isinstance(value, bool):
             return "真的" if value else "假的"
         elif isinstance(value, str):
             return value
+        elif isinstance(value, HangzhouList):
+            return '[' + ', '.join(self._stringify_element(item) for item in value) + ']'
+        elif isinstance(value, NumericArray):
+            return '数组[' + ', '.join(str(item) for item in value.tolist()) + ']'
+        elif isinstance(value, StringBuilder):
+            return value.build()
+        elif isinstance(value, dict):
+            return '{' + ', '.join(self._stringify_element(key) + ': ' + self._stringify_element(item)
+                                   for key, item in value.items()) + '}'
+        elif isinstance(value, set):
+            return '集合{' + ', '.join(self._stringify_element(item) for item in set_members(value)) + '}'
         else:
             return str(value)
+    
+    def _stringify_element(self, value: Any) -> str:
+        """列表里的元素：字符串带上引号，免得和数字分不清"""
+        if isinstance(value, str):
+            return '"' + value + '"'
+        return self.stringify(value)
 
     def _check_62_easter_egg(self):
         """
@@ -379,6 +1224,7 @@ class HangzhouInterpreter:
         self._easter_egg_counter += 1
         if self._easter_egg_counter % 62 == 0:
             # 每62次操作触发一次彩蛋
+            import random
             message = random.choice(self._secret_62_messages)
             print(f"\n🥚 [62彩蛋] {message}")
 
@@ -386,6 +1232,7 @@ class HangzhouInterpreter:
         """
         十三点彩蛋：随机触发有趣的杭州话提示
         """
+        import random
         if random.random() < 0.13:  # 13%的概率触发
             message = random.choice(self._secret_13_messages)
             print(f"\n🥚 [十三点彩蛋] {message}")
@@ -399,6 +1246,48 @@ class HangzhouInterpreter:
         # 原有的执行逻辑
         ...
 
+class TracingMixin:
+    """带钩子的执行路径，只在登记了钩子的解释器上用"""
+    
+    def interpret(self, program: Program) -> List[str]:
+        output = super().interpret(program)
+        if self.last_error is not None:
+            for callback in self.hooks.callbacks[ERROR]:
+                callback(self, self.last_error)
+        return output
+    
+    def execute_statement(self, stmt: Statement) -> None:
+        for callback in self.hooks.callbacks[STATEMENT]:
+            callback(self, stmt)
+        super().execute_statement(stmt)
+    
+    def call_builtin(self, name: str, function: Callable, args: List[Any]) -> Any:
+        for callback in self.hooks.callbacks[BUILTIN_CALL]:
+            callback(self, name, args)
+        return super().call_builtin(name, function, args)
+    
+    def call_user_function(self, function: HangzhouFunction, args: List[Any]) -> Any:
+        """尾调用在同一帧里循环，只算一次调用"""
+        for callback in self.hooks.callbacks[CALL]:
+            callback(self, function, args)
+        value = super().call_user_function(function, args)
+        for callback in self.hooks.callbacks[RETURN]:
+            callback(self, function, value)
+        return value
+
+_traced_classes: Dict[type, type] = {}
+
+def traced_class(base: type) -> type:
+    """
+    给解释器类（包括用户的子类）生成带钩子的子类，生成一次就缓存起来
+    解释器类可以用 tracing_mixin 属性换一个带钩子的混入类（比如异步解释器）。
+    """
+    if base not in _traced_classes:
+        mixin = getattr(base, 'tracing_mixin', TracingMixin)
+        _traced_classes[base] = type(f"Traced{base.__name__}", (mixin, base),
+                                     {'_uninstrumented_class': base})
+    return _traced_classes[base]
+
 def interpret(program: Program) -> List[str]:
     """便捷函数：解释执行程序"""
     interpreter = HangzhouInterpreter()
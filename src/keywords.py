@@ -24,6 +24,7 @@ HANGZHOU_KEYWORDS = {
     
     # 循环
     '一息息': 'while',    # 一会儿
+    '挨个': 'for',        # 一个一个来
     '直到': 'until',
     
     # 函数
@@ -32,6 +33,7 @@ HANGZHOU_KEYWORDS = {
     '介个套': 'def',      # 怎么办 → 定义一个办法
     '有数': 'return',     # 懂了、明白了
     '晓得': 'return',     # 知道
+    '清爽': 'pure',       # 干净 → 纯函数标注
     
     # 逻辑运算
     '大过': '>',
@@ -83,6 +85,9 @@ HANGZHOU_KEYWORDS = {
     '拎起来': 'raise',    # 提起来
 }
 
+# 同时是内置函数名的关键字，后面跟括号时按函数调用处理
+HANGZHOU_BUILTIN_FUNCTIONS = {'撒宽', '撒子儿'}
+
 # 杭州话数字映射
 HANGZHOU_NUMBERS = {
     '零': '0', '一': '1', '二': '2', '三': '3', '四': '4',
@@ -90,139 +95,6 @@ HANGZHOU_NUMBERS = {
     '十': '10', '百': '100', '千': '1000', '万': '10000'
 }
 
-# 杭州话时间表达
-HANGZHOU_TIME = {
-    '早上': 'morning',
-    '早半日': 'morning',     # 上午
-    '日里': 'day',           # 白天
-    '日中': 'noon',          # 中午
-    '晚快边儿': 'evening',   # 傍晚
-    '夜里头': 'night',       # 夜晚
-    '晚上头': 'night',       # 夜晚
-    '头毛': 'just_now',      # 刚才
-    '葛毛': 'now',           # 现在
-    '格毛': 'now',           # 现在（另一种写法）
-    '上毛': 'before',        # 前回
-    '上毛子': 'before',      # 前回
-    '旧年子': 'last_year',   # 去年
-    '辰光': 'time',          # 时候
-    '时光': 'time',          # 时候
-}
-
-# 杭州话家庭称谓
-HANGZHOU_FAMILY = {
-    '男人家': 'man',         # 男人
-    '女人家': 'woman',       # 女人
-    '小伢儿': 'child',       # 小孩子
-    '男伢儿': 'boy',         # 男孩子
-    '女伢儿': 'girl',        # 女孩子
-    '阿爸': 'father',        # 父亲
-    '姆妈': 'mother',        # 母亲
-    '爹爹': 'grandfather',   # 祖父
-    '奶奶': 'grandmother',   # 祖母
-    '阿哥': 'brother',       # 兄
-    '阿弟': 'brother',       # 弟
-    '阿姐': 'sister',        # 姐
-    '阿妹': 'sister',        # 妹
-    '老公': 'husband',       # 丈夫
-    '老婆': 'wife',          # 妻子
-}
-
-# 杭州话程度副词
-HANGZHOU_DEGREE = {
-    '尽该': 'very',          # 很
-    '蛮蛮': 'very',          # 很
-    '木佬佬': 'very',        # 很
-    '蹩脚': 'bad',           # 差
-    '起泡': 'bad',           # 差
-    '推板': 'bad',           # 差
-    '一滴滴': 'little',      # 一点儿
-    '一息息': 'while',       # 一会儿
-    '慢慢交': 'slowly',      # 慢慢地
-    '好好交': 'well',        # 好好地
-}
-
-# 杭州话动作词汇
-HANGZHOU_ACTIONS = {
-    '做事体': 'work',        # 干活儿
-    '吃酒': 'drink',         # 喝酒
-    '吃烟': 'smoke',         # 抽烟
-    '吃茶': 'tea',           # 喝茶
-    '洗浴': 'bath',          # 洗澡
-    '汏浴': 'bath',          # 洗澡
-    '睏觉': 'sleep',         # 睡觉
-    '歇力': 'rest',          # 休息
-    '耍子': 'play',          # 玩儿
-    '闹架儿': 'argue',       # 吵架
-    '寻事儿': 'trouble',     # 找茬
-    '看病': 'doctor',        # 看医生
-    '讨老婆': 'marry',       # 娶媳妇
-    '嫁老公': 'marry',       # 出嫁
-}
-
-# 杭州话形容词
-HANGZHOU_ADJECTIVES = {
-    '好看': 'beautiful',     # 美
-    '难看': 'ugly',          # 丑
-    '发靥': 'funny',         # 可笑、好笑
-    '难为情': 'shy',         # 害臊
-    '滥滥湿': 'wet',         # 很湿
-    '冰冰瀴': 'cold',        # 很凉
-    '墨墨黑': 'dark',        # 漆黑
-    '糊达达': 'sticky',      # 粘粘糊糊
-    '糊里达喇': 'sticky',    # 粘粘糊糊
-    '不乖': 'naughty',       # 顽皮
-    '吃力': 'tired',         # 累
-}
-
-# 杭州话疑问词
-HANGZHOU_QUESTIONS = {
-    '啥时光': 'when',        # 什么时候
-    '啥地方': 'where',       # 什么地方
-    '啥花头': 'what',        # 什么花样，什么东西
-    '做啥': 'what_do',       # 做什么
-}
-
-# 杭州话量词
-HANGZHOU_MEASURE = {
-    '一毛': 'once',          # 一次
-    '两毛': 'twice',         # 两次
-    '一道': 'together',      # 一块儿
-    '一床被': 'one_quilt',   # 一条被
-    '一部车': 'one_car',     # 一辆车
-    '一桄鱼': 'one_fish',    # 一条鱼
-}
-
-# 杭州话常用短语
-HANGZHOU_PHRASES = {
-    '格毛': 'now',           # 现在
-    '头毛': 'just',          # 刚才
-    '日里': 'day',           # 白天
-    '夜到头': 'night',       # 夜晚
-    '蛮蛮': 'very',          # 很
-    '木老老': 'very',        # 很
-    '尽该': 'very',          # 很
-    '蹩脚': 'bad',           # 差
-    '起泡': 'bad',           # 差
-    '推板': 'bad',           # 差
-    '晏歇会': 'see_later',   # 等会儿见
-    '葛个老倌': 'this_person', # 这个人
-    '那个老倌': 'that_person', # 那个人
-}
-
-# 合并所有词汇表
-ALL_HANGZHOU_WORDS = {
-    **HANGZHOU_KEYWORDS,
-    **HANGZHOU_TIME,
-    **HANGZHOU_FAMILY,
-    **HANGZHOU_DEGREE,
-    **HANGZHOU_ACTIONS,
-    **HANGZHOU_ADJECTIVES,
-    **HANGZHOU_QUESTIONS,
-    **HANGZHOU_MEASURE,
-    **HANGZHOU_PHRASES
-}
-
 # 获取Python对应的关键字
 def get_python_keyword(hangzhou_word):
     """将杭州话关键字转换为Python关键字"""
@@ -233,50 +105,32 @@ def is_hangzhou_keyword(word):
     """检查是否为杭州话关键字"""
     return word in HANGZHOU_KEYWORDS
 
-# 检查是否为杭州话词汇
-def is_hangzhou_word(word):
-    """检查是否为杭州话词汇"""
-    return word in ALL_HANGZHOU_WORDS
-
 # 获取所有杭州话关键字
 def get_all_keywords():
     """获取所有杭州话关键字列表"""
     return list(HANGZHOU_KEYWORDS.keys())
 
-# 获取杭州话词汇释义
-def get_hangzhou_meaning(word):
-    """获取杭州话词汇的含义"""
-    return ALL_HANGZHOU_WORDS.get(word, word)
-
-# 搜索杭州话词汇
-def search_hangzhou_words(pattern):
-    """搜索包含特定模式的杭州话词汇"""
-    results = []
-    for word, meaning in ALL_HANGZHOU_WORDS.items():
-        if pattern in word or pattern in meaning:
-            results.append((word, meaning))
-    return results
+# 词法分析只用上面几张表；其余词汇表在 vocabulary 里，第一次用到才导入，
+# 跑脚本的时候不用建
+_VOCABULARY_NAMES = {
+    'HANGZHOU_TIME',
+    'HANGZHOU_FAMILY',
+    'HANGZHOU_DEGREE',
+    'HANGZHOU_ACTIONS',
+    'HANGZHOU_ADJECTIVES',
+    'HANGZHOU_QUESTIONS',
+    'HANGZHOU_MEASURE',
+    'HANGZHOU_PHRASES',
+    'ALL_HANGZHOU_WORDS',
+    'is_hangzhou_word',
+    'get_hangzhou_meaning',
+    'search_hangzhou_words',
+    'get_word_category',
+}
 
-# 获取词汇分类信息
-def get_word_category(word):
-    """获取词汇所属的分类"""
-    if word in HANGZHOU_KEYWORDS:
-        return "关键字"
-    elif word in HANGZHOU_TIME:
-        return "时间表达"
-    elif word in HANGZHOU_FAMILY:
-        return "家庭称谓"
-    elif word in HANGZHOU_DEGREE:
-        return "程度副词"
-    elif word in HANGZHOU_ACTIONS:
-        return "动作词汇"
-    elif word in HANGZHOU_ADJECTIVES:
-        return "形容词"
-    elif word in HANGZHOU_QUESTIONS:
-        return "疑问词"
-    elif word in HANGZHOU_MEASURE:
-        return "量词"
-    elif word in HANGZHOU_PHRASES:
-        return "常用短语"
-    else:
-        return "未分类" 
\ No newline at end of file
+def __getattr__(name):
+    """keywords.HANGZHOU_TIME 这类名字转到 vocabulary 模块"""
+    if name in _VOCABULARY_NAMES:
+        import vocabulary
+        return getattr(vocabulary, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
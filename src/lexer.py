@@ -4,9 +4,8 @@
 Hangzhou Dialect Programming Language Lexer
 """
 
-import re
 import enum
-from typing import List, NamedTuple, Optional
+from typing import List, NamedTuple, Optional, Tuple, Union
 from keywords import HANGZHOU_KEYWORDS, HANGZHOU_NUMBERS, is_hangzhou_keyword
 
 class TokenType(enum.Enum):
@@ -16,6 +15,7 @@ class TokenType(enum.Enum):
     IDENTIFIER = "IDENTIFIER"  # 标识符
     NUMBER = "NUMBER"          # 数字
     STRING = "STRING"          # 字符串
+    TEMPLATE_STRING = "TEMPLATE_STRING"  # 带 {表达式} 的字符串
     
     # 运算符
     PLUS = "PLUS"              # +
@@ -45,13 +45,24 @@ class TokenType(enum.Enum):
     
     # 特殊
     NEWLINE = "NEWLINE"        # 换行
+    INDENT = "INDENT"          # 缩进
+    DEDENT = "DEDENT"          # 取消缩进
     EOF = "EOF"                # 文件结束
     COMMENT = "COMMENT"        # 注释
 
+# 全角标点，和半角一样当分隔符，不能算进标识符里
+FULLWIDTH_PUNCTUATION = {
+    '（': TokenType.LPAREN,
+    '）': TokenType.RPAREN,
+    '，': TokenType.COMMA,
+    '：': TokenType.COLON,
+    '；': TokenType.SEMICOLON,
+}
+
 class Token(NamedTuple):
     """Token数据结构"""
     type: TokenType
-    value: str
+    value: Union[str, Tuple[str, ...]]  # TEMPLATE_STRING 是 (文字, 表达式源码, 文字, ...)
     line: int
     column: int
 
@@ -64,6 +75,8 @@ class HangzhouLexer:
         self.line = 1
         self.column = 1
         self.tokens: List[Token] = []
+        self.indent_stack = [0]
+        self.at_line_start = True
     
     def error(self, message: str) -> None:
         """抛出词法分析错误"""
@@ -97,14 +110,31 @@ class HangzhouLexer:
         while self.current_char() and self.current_char() in ' \t\r':
             self.advance()
     
-    def read_string(self) -> str:
-        """读取字符串字面量"""
+    def read_string(self) -> Union[str, Tuple[str, ...]]:
+        """
+        读取字符串字面量
+        里面有 {表达式} 的话在这里就切好，返回 (文字, 表达式源码, 文字, ...)，
+        单数位置是表达式。{{ 和 }} 是大括号本身，\\{ 也是。
+        """
         quote_char = self.current_char()  # " 或 '
         self.advance()  # 跳过开始的引号
         
         value = ""
+        parts: List[str] = []
         while self.current_char() and self.current_char() != quote_char:
-            if self.current_char() == '\\':
+            if self.current_char() == '{' and self.peek_char() == '{':
+                value += '{'
+                self.advance()
+                self.advance()
+            elif self.current_char() == '}' and self.peek_char() == '}':
+                value += '}'
+                self.advance()
+                self.advance()
+            elif self.current_char() == '{':
+                parts.append(value)
+                parts.append(self.read_interpolation(quote_char))
+                value = ""
+            elif self.current_char() == '\\':
                 self.advance()
                 if self.current_char():
                     # 处理转义字符
@@ -122,8 +152,33 @@ class HangzhouLexer:
             self.error("字符串未正确结束")
         
         self.advance()  # 跳过结束的引号
+        if parts:
+            parts.append(value)
+            return tuple(parts)
         return value
     
+    def read_interpolation(self, quote_char: str) -> str:
+        """读取字符串里 {...} 中间的表达式源码（里面可以再有字典的大括号）"""
+        self.advance()  # 跳过 '{'
+        source = ""
+        depth = 0
+        while self.current_char() and self.current_char() not in (quote_char, '\n'):
+            if self.current_char() == '{':
+                depth += 1
+            elif self.current_char() == '}':
+                if depth == 0:
+                    break
+                depth -= 1
+            source += self.current_char()
+            self.advance()
+        
+        if self.current_char() != '}':
+            self.error("字符串里的 { 没有配对的 }，要写大括号本身用 {{")
+        if not source.strip():
+            self.error("字符串里的 {} 中间要有表达式")
+        self.advance()  # 跳过 '}'
+        return source
+    
     def read_number(self) -> str:
         """读取数字"""
         value = ""
@@ -153,18 +208,52 @@ class HangzhouLexer:
         
         return result
     
+    def is_identifier_char(self, char: Optional[str]) -> bool:
+        """判断字符能否出现在标识符中"""
+        return bool(char) and (char.isalnum() or char == '_' or
+                               (ord(char) > 127 and char not in FULLWIDTH_PUNCTUATION))  # 支持中文字符
+    
+    def peek_identifier(self) -> str:
+        """向前查看标识符，不移动位置"""
+        end = self.pos
+        while end < len(self.text) and self.is_identifier_char(self.text[end]):
+            end += 1
+        return self.text[self.pos:end]
+    
     def read_identifier(self) -> str:
         """读取标识符或关键字"""
         value = ""
-        while (self.current_char() and 
-               (self.current_char().isalnum() or 
-                self.current_char() in '_' or 
-                ord(self.current_char()) > 127)):  # 支持中文字符
+        while self.is_identifier_char(self.current_char()):
             value += self.current_char()
             self.advance()
         
         return value
     
+    def read_indentation(self) -> None:
+        """在行首处理缩进，生成INDENT/DEDENT"""
+        self.at_line_start = False
+        width = 0
+        offset = 0
+        while self.peek_char(offset) in (' ', '\t'):
+            width += 4 if self.peek_char(offset) == '\t' else 1
+            offset += 1
+        
+        # 空行和注释行不影响缩进
+        if self.peek_char(offset) in (None, '\n', '\r', '#'):
+            return
+        
+        if width > self.indent_stack[-1]:
+            self.indent_stack.append(width)
+            self.tokens.append(Token(TokenType.INDENT, '', self.line, self.column))
+            return
+        
+        while width < self.indent_stack[-1]:
+            self.indent_stack.pop()
+            self.tokens.append(Token(TokenType.DEDENT, '', self.line, self.column))
+        
+        if width != self.indent_stack[-1]:
+            self.error("缩进对不齐")
+    
     def read_comment(self) -> str:
         """读取注释"""
         value = ""
@@ -179,6 +268,10 @@ class HangzhouLexer:
     def tokenize(self) -> List[Token]:
         """将输入文本转换为token列表"""
         while self.current_char():
+            # 行首缩进
+            if self.at_line_start:
+                self.read_indentation()
+            
             # 跳过空白字符
             if self.current_char() in ' \t\r':
                 self.skip_whitespace()
@@ -188,6 +281,7 @@ class HangzhouLexer:
             if self.current_char() == '\n':
                 self.tokens.append(Token(TokenType.NEWLINE, '\n', self.line, self.column))
                 self.advance()
+                self.at_line_start = True
                 continue
             
             # 注释
@@ -199,7 +293,8 @@ class HangzhouLexer:
             # 字符串
             if self.current_char() in '"\'':
                 string_value = self.read_string()
-                self.tokens.append(Token(TokenType.STRING, string_value, self.line, self.column))
+                token_type = TokenType.TEMPLATE_STRING if isinstance(string_value, tuple) else TokenType.STRING
+                self.tokens.append(Token(token_type, string_value, self.line, self.column))
                 continue
             
             # 数字
@@ -208,8 +303,9 @@ class HangzhouLexer:
                 self.tokens.append(Token(TokenType.NUMBER, number, self.line, self.column))
                 continue
             
-            # 中文数字
-            if self.current_char() in HANGZHOU_NUMBERS:
+            # 中文数字（一息息这种以数字开头的关键字除外）
+            if (self.current_char() in HANGZHOU_NUMBERS and
+                    not is_hangzhou_keyword(self.peek_identifier())):
                 chinese_number = self.read_chinese_number()
                 self.tokens.append(Token(TokenType.NUMBER, chinese_number, self.line, self.column))
                 continue
@@ -254,8 +350,8 @@ class HangzhouLexer:
                 ']': TokenType.RBRACKET,
                 ',': TokenType.COMMA,
                 ':': TokenType.COLON,
-                '：': TokenType.COLON,  # 中文冒号
                 ';': TokenType.SEMICOLON,
+                **FULLWIDTH_PUNCTUATION,
             }
             
             if self.current_char() in single_char_tokens:
@@ -265,9 +361,7 @@ class HangzhouLexer:
                 continue
             
             # 标识符和关键字（包括中文）
-            if (self.current_char().isalpha() or 
-                self.current_char() == '_' or 
-                ord(self.current_char()) > 127):
+            if self.is_identifier_char(self.current_char()):
                 identifier = self.read_identifier()
                 
                 # 检查是否为杭州话关键字
@@ -280,6 +374,11 @@ class HangzhouLexer:
             # 未知字符
             self.error(f"未知字符: '{self.current_char()}'")
         
+        # 文件结束时关闭所有缩进块
+        while len(self.indent_stack) > 1:
+            self.indent_stack.pop()
+            self.tokens.append(Token(TokenType.DEDENT, '', self.line, self.column))
+        
         # 添加EOF token
         self.tokens.append(Token(TokenType.EOF, '', self.line, self.column))
         return self.tokens
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""
+杭州话编程语言列表
+Hangzhou Dialect Programming Language Lists
+"""
+
+from typing import Any, Iterator, List, Optional
+
+class HangzhouList:
+    """
+    杭州话的列表
+    底下是一个 Python 列表，塞进 均摊 O(1)。切片不复制，返回共用同一个底层列表的视图；
+    谁要改共用着的底层列表，谁先复制一份自己的（写时复制），所以切片看起来和复制出来的一样。
+    """
+    __slots__ = ('items', 'start', 'stop', 'shared')
+
+    def __init__(self, items: Optional[List[Any]] = None):
+        self.items = items if items is not None else []
+        self.start = 0
+        self.stop: Optional[int] = None  # None 表示一直到底层列表末尾
+        self.shared = False  # 底层列表有没有和别的列表（视图）共用
+
+    def __len__(self) -> int:
+        if self.stop is None:
+            return len(self.items) - self.start
+        return self.stop - self.start
+
+    def __iter__(self) -> Iterator[Any]:
+        if self.start == 0 and self.stop is None:
+            return iter(self.items)
+        return iter(self.items[self.start:self.stop])
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, HangzhouList):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    __hash__ = None
+
+    def __add__(self, other: Any) -> 'HangzhouList':
+        if not isinstance(other, HangzhouList):
+            return NotImplemented
+        return HangzhouList(self.to_list() + other.to_list())
+
+    def _position(self, index: int) -> int:
+        """下标换算成底层列表里的位置，负数从末尾数"""
+        length = len(self)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError(f"下标超出范围: {index}（长度 {length}）")
+        return self.start + index
+
+    def get(self, index: int) -> Any:
+        """取第 index 个元素"""
+        return self.items[self._position(index)]
+
+    def _own(self) -> None:
+        """要改之前：底层列表和别人共用着，或者自己只是一段视图，就复制一份自己的"""
+        if self.shared or self.start != 0 or self.stop is not None:
+            self.items = self.items[self.start:self.stop]
+            self.start = 0
+            self.stop = None
+            self.shared = False
+
+    def set(self, index: int, value: Any) -> None:
+        """把第 index 个元素换成 value"""
+        position = self._position(index)
+        if self.shared or self.start != 0 or self.stop is not None:
+            offset = self.start
+            self._own()
+            position -= offset
+        self.items[position] = value
+
+    def append(self, value: Any) -> None:
+        """在末尾塞一个元素"""
+        if self.shared or self.start != 0 or self.stop is not None:
+            self._own()
+        self.items.append(value)
+
+    def slice(self, start: Optional[int] = None, stop: Optional[int] = None) -> 'HangzhouList':
+        """切片，按 Python 的规矩处理负数和越界，返回视图不复制"""
+        begin, end, _ = slice(start, stop).indices(len(self))
+        view = HangzhouList.__new__(HangzhouList)
+        view.items = self.items
+        view.start = self.start + begin
+        view.stop = self.start + max(begin, end)
+        view.shared = True
+        self.shared = True
+        return view
+
+    def to_list(self) -> List[Any]:
+        """复制成普通的 Python 列表"""
+        return self.items[self.start:self.stop]
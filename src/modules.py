@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+"""
+杭州话编程语言模块
+Hangzhou Dialect Programming Language Modules
+
+`进来 工具` / `从 工具 进来 甲，乙` 从搜索路径上找 工具.hz。
+每个进程里一个文件只解析一次；解析好的语法树还会存到旁边的 __hzcache__ 目录，
+下一个进程文件没改过就直接读回来，不再解析。缓存文件是只含数据的 JSON，
+读回来时只用语法树节点类重建，不执行任何代码，别人往目录里塞的文件最多是读不出来。
+导入的时候只绑上占位的 LazyName，第一次用到其中一个名字才真的执行模块。
+"""
+
+import os
+import struct
+import sys
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from optimizer import walk_statements
+from parser import ASTNode, FunctionDef, ImportStatement, Program, VarDeclaration, parse_text
+
+MODULE_SUFFIX = '.hz'
+CACHE_DIRECTORY = '__hzcache__'
+CACHE_SUFFIX = '.hzc'
+
+# 语法树的结构或者缓存格式变了，旧的缓存文件就不认
+CACHE_MAGIC = f'HZC2-py{sys.version_info[0]}.{sys.version_info[1]}\n'.encode('ascii')
+_CACHE_HEADER = struct.Struct('<qq32s')  # 源文件的修改时间（纳秒）、大小、内容的 SHA-256
+
+
+# 搜索路径的环境变量，和 PYTHONPATH 一样用 os.pathsep 分隔
+SEARCH_PATH_VARIABLE = 'HANGZHOULANG_PATH'
+
+# 设了这个环境变量就只读缓存文件不写（和 PYTHONDONTWRITEBYTECODE 一样）
+DONT_WRITE_CACHE_VARIABLE = 'HANGZHOULANG_DONT_WRITE_CACHE'
+
+def default_search_path() -> List[str]:
+    """默认的模块搜索路径：当前目录，加上 HANGZHOULANG_PATH 里的目录"""
+    path = [os.getcwd()]
+    extra = os.environ.get(SEARCH_PATH_VARIABLE, '')
+    path.extend(directory for directory in extra.split(os.pathsep) if directory)
+    return path
+
+def find_module(name: str, search_path: List[str]) -> str:
+    """在搜索路径上找 名字.hz，返回绝对路径"""
+    for directory in search_path:
+        candidate = os.path.join(directory, name + MODULE_SUFFIX)
+        if os.path.isfile(candidate):
+            return os.path.abspath(candidate)
+    raise ImportError(f"找不到模块 {name}（找过: {', '.join(search_path)}）")
+
+def module_exports(program: Program) -> List[str]:
+    """
+    模块在最外层定义的名字（函数、老倌 变量、从 别的模块 进来 的名字），
+    导入时不执行模块就晓得有哪些
+    """
+    names = []
+    for stmt in walk_statements(program.statements):
+        if isinstance(stmt, (FunctionDef, VarDeclaration)):
+            defined = [stmt.name]
+        elif isinstance(stmt, ImportStatement) and stmt.names:
+            defined = stmt.names
+        else:
+            continue
+        names.extend(name for name in defined if name not in names)
+    return names
+
+class ModuleSource(NamedTuple):
+    """解析好的模块文件"""
+    name: str
+    path: str
+    program: Program
+    exports: List[str]
+
+class LazyName:
+    """导入进来、模块还没执行时占着位置的名字，第一次读它时换成模块里真的值"""
+    __slots__ = ('path', 'name')
+
+    def __init__(self, path: str, name: str):
+        self.path = path
+        self.name = name
+
+def _node_classes(base: type = ASTNode) -> Dict[str, type]:
+    """ASTNode 的所有子类，按类名"""
+    classes = {}
+    for subclass in base.__subclasses__():
+        classes[subclass.__name__] = subclass
+        classes.update(_node_classes(subclass))
+    return classes
+
+# 缓存文件里能重建的节点类：语法树节点，别的名字一概不认
+NODE_CLASSES = _node_classes()
+
+# 缓存文件里节点、元组、集合都是 JSON 对象，这个键放类名（元组、集合是下面两个名字）
+_KIND = ''
+_TUPLE = '元组'
+_SET = '集合'
+
+def encode_tree(value: Any) -> Any:
+    """
+    语法树换成 JSON 能存的数据：节点是 {"": 类名, 属性: 值, ...}，元组和集合是 {"": "元组", "项": [...]}，
+    列表、数字、字符串、真假、空的原样存
+    """
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, ASTNode):
+        data = {name: encode_tree(item) for name, item in vars(value).items()}
+        data[_KIND] = type(value).__name__
+        return data
+    if isinstance(value, list):
+        return [encode_tree(item) for item in value]
+    if isinstance(value, tuple):
+        return {_KIND: _TUPLE, '项': [encode_tree(item) for item in value]}
+    if isinstance(value, (set, frozenset)):
+        return {_KIND: _SET, '项': [encode_tree(item) for item in value]}
+    raise TypeError(f"语法树里有存不下来的值: {type(value).__name__}")
+
+def _decode_object(data: Dict[str, Any]) -> Any:
+    """json.loads 的 object_hook：里面的对象先解码，所以一趟就把整棵树建好；不认识的抛 ValueError"""
+    kind = data.pop(_KIND, None)
+    if kind == _TUPLE:
+        return tuple(data['项'])
+    if kind == _SET:
+        return set(data['项'])
+    cls = NODE_CLASSES.get(kind)
+    if cls is None:
+        raise ValueError(f"缓存文件里有不认识的节点: {kind!r}")
+    node = cls.__new__(cls)
+    node.__dict__.update(data)  # 只有节点类和数据，不调用任何别的代码
+    return node
+
+def decode_tree(text: str) -> Any:
+    """encode_tree 存下来的 JSON 文本建回语法树"""
+    import json
+    return json.loads(text, object_hook=_decode_object)
+
+def _source_digest(path: str) -> bytes:
+    """源文件内容的 SHA-256，缓存文件对不上源文件就不用"""
+    import hashlib
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).digest()
+
+class CompiledModuleCache:
+    """
+    模块语法树的缓存，一个进程一份
+    内存里按 (路径, 修改时间, 大小) 存；内存里没有先读 __hzcache__ 下的缓存文件，
+    文件头里的修改时间、大小和源文件内容的 SHA-256 都对得上才用，不然重新解析并写回去。
+    """
+
+    def __init__(self):
+        self.entries: Dict[str, ModuleSource] = {}
+        self.keys: Dict[str, tuple] = {}
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.parses = 0
+
+    @staticmethod
+    def cache_path(path: str) -> str:
+        """模块对应的缓存文件路径"""
+        directory, filename = os.path.split(path)
+        stem = os.path.splitext(filename)[0]
+        return os.path.join(directory, CACHE_DIRECTORY, stem + CACHE_SUFFIX)
+
+    def load(self, name: str, path: str) -> ModuleSource:
+        """取解析好的模块，文件改过就重新解析"""
+        stat = os.stat(path)
+        key = (stat.st_mtime_ns, stat.st_size)
+        if self.keys.get(path) == key:
+            self.memory_hits += 1
+            return self.entries[path]
+
+        digest = _source_digest(path)
+        program = self._read_cache(path, key + (digest,))
+        if program is not None:
+            self.disk_hits += 1
+        else:
+            with open(path, 'r', encoding='utf-8') as f:
+                program = parse_text(f.read())
+            self.parses += 1
+            self._write_cache(path, key + (digest,), program)
+
+        source = ModuleSource(name, path, program, module_exports(program))
+        self.entries[path] = source
+        self.keys[path] = key
+        return source
+
+    def _read_cache(self, path: str, header_key: tuple) -> Optional[Program]:
+        """读缓存文件，没有、过期了、和源文件对不上或者坏了都返回None"""
+        header_size = len(CACHE_MAGIC) + _CACHE_HEADER.size
+        try:
+            with open(self.cache_path(path), 'rb') as f:
+                header = f.read(header_size)
+                if (header[:len(CACHE_MAGIC)] != CACHE_MAGIC or
+                        _CACHE_HEADER.unpack(header[len(CACHE_MAGIC):]) != header_key):
+                    return None
+                program = decode_tree(f.read().decode('utf-8'))
+        except (OSError, struct.error, ValueError, KeyError, TypeError, RecursionError):
+            return None  # json 的解析错误和编码错误都是 ValueError
+        return program if isinstance(program, Program) else None
+
+    def _write_cache(self, path: str, header_key: tuple, program: Program) -> None:
+        """写缓存文件；目录写不进去就算了，下次再解析"""
+        if os.environ.get(DONT_WRITE_CACHE_VARIABLE):
+            return
+        import json  # 只有用到模块才导入，跑不导入模块的脚本省得启动时加载
+        cache_path = self.cache_path(path)
+        temporary = f'{cache_path}.{os.getpid()}.tmp'
+        try:
+            data = json.dumps(encode_tree(program), ensure_ascii=False, separators=(',', ':'))
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            with open(temporary, 'wb') as f:
+                f.write(CACHE_MAGIC + _CACHE_HEADER.pack(*header_key))
+                f.write(data.encode('utf-8'))
+            os.replace(temporary, cache_path)  # 别的进程不会读到写了一半的文件
+        except (OSError, TypeError, ValueError, RecursionError):
+            try:
+                os.unlink(temporary)
+            except OSError:
+                pass
+
+# 整个进程共用的模块缓存
+MODULE_CACHE = CompiledModuleCache()
@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+"""
+杭州话词典的 n-gram 倒排索引
+Hangzhou Dialect Dictionary N-gram Inverted Index
+
+把每个词条的词和释义切成 1～3 个字的片段，每个片段记下出现在哪些词条里（按词条编号排好的列表）。
+查子串时，三个字以内直接取那个片段的列表；更长的把查询切成三字片段，几个列表求交集得到候选，
+再逐个用 in 核对。结果和一条一条扫描完全一样，只是不用扫整本词典。
+"""
+
+import os
+import struct
+import sys
+import zlib
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# 最长的片段；查询比这个长时取交集再核对
+MAX_GRAM = 3
+
+# 索引文件：INDEX_MAGIC、两个长度（JSON 头、编号数据的字节数）、JSON 头、所有片段的编号数组首尾相接。
+# 只有数据没有代码，文件被人换掉了最多是读不出来或者查出来的东西不对，不会执行任何东西。
+INDEX_MAGIC = b'HZI2\n'
+_INDEX_SIZES = struct.Struct('<QQ')
+
+def grams(text: str, size: int) -> Iterable[str]:
+    """text 里所有长度为 size 的片段"""
+    return (text[i:i + size] for i in range(len(text) - size + 1))
+
+def fingerprint(entries: List[Tuple[str, str]]) -> int:
+    """词条内容的校验和，读存下来的索引时看词典有没有变过"""
+    checksum = 0
+    for word, meaning in entries:
+        checksum = zlib.crc32(f'{word}\0{meaning}\0'.encode('utf-8'), checksum)
+    return checksum ^ len(entries)
+
+class NgramIndex:
+    """
+    词条 (词, 释义) 上的子串索引
+    postings[片段] 是含这个片段的词条编号（array('I')），从小到大；编号就是词条加进来的顺序。
+    """
+
+    def __init__(self, entries: Iterable[Tuple[str, str]]):
+        self.entries: List[Tuple[str, str]] = list(entries)
+        self.fingerprint = fingerprint(self.entries)
+        postings: Dict[str, List[int]] = {}
+        for number, (word, meaning) in enumerate(self.entries):
+            seen = set()
+            for text in (word, meaning):
+                for size in range(1, MAX_GRAM + 1):
+                    seen.update(grams(text, size))
+            for gram in seen:
+                postings.setdefault(gram, []).append(number)
+        # 整数数组比列表省内存，存盘读盘也快得多
+        self.postings: Dict[str, array] = {gram: array('I', numbers) for gram, numbers in postings.items()}
+
+    def candidates(self, pattern: str) -> Iterable[int]:
+        """可能含 pattern 的词条编号，从小到大；pattern 不超过三个字时就是确切结果"""
+        if len(pattern) <= MAX_GRAM:
+            return self.postings.get(pattern, ())
+        lists = []
+        for gram in set(grams(pattern, MAX_GRAM)):
+            posting = self.postings.get(gram)
+            if posting is None:
+                return []
+            lists.append(posting)
+        lists.sort(key=len)
+        found = set(lists[0]).intersection(*lists[1:])
+        return sorted(found)
+
+    def search(self, pattern: str) -> List[Tuple[str, str]]:
+        """
+        词或者释义里含 pattern 的词条，排好序：
+        词就是 pattern、词以 pattern 开头、词里含 pattern、只有释义里含 pattern，
+        同一档按词条原来的顺序，所以每次结果都一样
+        """
+        if not pattern:
+            numbers = range(len(self.entries))
+        elif len(pattern) <= MAX_GRAM:
+            numbers = self.candidates(pattern)
+        else:
+            numbers = [number for number in self.candidates(pattern)
+                       if pattern in self.entries[number][0] or pattern in self.entries[number][1]]
+
+        def rank(number: int) -> Tuple[int, int]:
+            word = self.entries[number][0]
+            if word == pattern:
+                tier = 0
+            elif word.startswith(pattern):
+                tier = 1
+            elif pattern in word:
+                tier = 2
+            else:
+                tier = 3
+            return tier, number
+
+        return [self.entries[number] for number in sorted(numbers, key=rank)]
+
+    def save(self, path: str) -> None:
+        """存到文件，下次 load 就不用再建"""
+        import json
+        order = list(self.postings)
+        header = json.dumps({
+            'fingerprint': self.fingerprint,
+            'entries': self.entries,
+            'grams': order,
+            'lengths': [len(self.postings[gram]) for gram in order],
+            'itemsize': array('I').itemsize,
+            'byteorder': sys.byteorder,
+        }, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        temporary = f'{path}.{os.getpid()}.tmp'
+        try:
+            with open(temporary, 'wb') as f:
+                f.write(INDEX_MAGIC)
+                data_size = sum(len(posting) for posting in self.postings.values()) * array('I').itemsize
+                f.write(_INDEX_SIZES.pack(len(header), data_size))
+                f.write(header)
+                for gram in order:
+                    self.postings[gram].tofile(f)
+            os.replace(temporary, path)  # 别的进程不会读到写了一半的文件
+        except OSError:
+            try:
+                os.unlink(temporary)
+            except OSError:
+                pass
+            raise
+
+    @classmethod
+    def load(cls, path: str, entries: Optional[List[Tuple[str, str]]] = None) -> Optional['NgramIndex']:
+        """
+        读 save 存下来的索引；文件没有、坏了，或者给了 entries 而词典已经变了，都返回None
+        """
+        import json
+        try:
+            with open(path, 'rb') as f:
+                if f.read(len(INDEX_MAGIC)) != INDEX_MAGIC:
+                    return None
+                header_size, data_size = _INDEX_SIZES.unpack(f.read(_INDEX_SIZES.size))
+                header = json.loads(f.read(header_size).decode('utf-8'))
+                numbers = array('I')
+                if header['itemsize'] != numbers.itemsize or data_size % numbers.itemsize:
+                    return None
+                numbers.frombytes(f.read(data_size))
+                if len(numbers) * numbers.itemsize != data_size or f.read(1):
+                    return None
+            saved_fingerprint = header['fingerprint']
+            saved_entries = [(word, meaning) for word, meaning in header['entries']]
+            order, lengths = header['grams'], header['lengths']
+            if header['byteorder'] != sys.byteorder:
+                numbers.byteswap()
+        except (OSError, EOFError, struct.error, ValueError, KeyError, TypeError):
+            return None  # json 的解析错误和编码错误都是 ValueError
+        if not all(isinstance(word, str) and isinstance(meaning, str) for word, meaning in saved_entries):
+            return None
+        if (len(order) != len(lengths) or sum(lengths) != len(numbers) or
+                (numbers and max(numbers) >= len(saved_entries))):
+            return None
+        if entries is not None and fingerprint(entries) != saved_fingerprint:
+            return None
+        postings = {}
+        start = 0
+        for gram, length in zip(order, lengths):
+            if not isinstance(gram, str) or not isinstance(length, int) or length < 0:
+                return None
+            postings[gram] = numbers[start:start + length]
+            start += length
+        index = cls.__new__(cls)
+        index.entries = saved_entries
+        index.fingerprint = saved_fingerprint
+        index.postings = postings
+        return index
+
+def build_index(entries: Iterable[Tuple[str, str]], path: Optional[str] = None) -> NgramIndex:
+    """建索引；给了 path 就先试着读存下来的，读不到再建并存回去"""
+    entries = list(entries)
+    if path is not None:
+        index = NgramIndex.load(path, entries)
+        if index is not None:
+            return index
+    index = NgramIndex(entries)
+    if path is not None:
+        try:
+            index.save(path)
+        except OSError:
+            pass  # 存不下来就算了，下次再建
+    return index
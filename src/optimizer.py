@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+"""
+杭州话编程语言语法树分析与优化
+Hangzhou Dialect Programming Language AST Analysis
+"""
+
+from typing import Iterator, List, Optional, Set
+from parser import (
+    ASTNode, Statement, Expression, FunctionDef, ReturnStatement, IfStatement, WhileStatement,
+    ForStatement, ImportStatement, VarDeclaration, Assignment, PrintStatement, ExpressionStatement, IndexAssignment,
+    BinaryOp, UnaryOp, Identifier, FunctionCall, ListLiteral, IndexExpression, SliceExpression,
+    DictLiteral, SetLiteral, InterpolatedString
+)
+
+def walk_statements(statements: List[Statement], into_functions: bool = False) -> Iterator[Statement]:
+    """遍历语句列表及其中嵌套的代码块"""
+    for stmt in statements:
+        yield stmt
+        if isinstance(stmt, IfStatement):
+            yield from walk_statements(stmt.then_branch, into_functions)
+            if stmt.else_branch:
+                yield from walk_statements(stmt.else_branch, into_functions)
+        elif isinstance(stmt, (WhileStatement, ForStatement)):
+            yield from walk_statements(stmt.body, into_functions)
+        elif isinstance(stmt, FunctionDef) and into_functions:
+            yield from walk_statements(stmt.body, into_functions)
+
+def statement_expressions(stmt: Statement) -> List[Expression]:
+    """语句里直接出现的表达式（不含嵌套代码块）"""
+    if isinstance(stmt, (VarDeclaration, Assignment, ReturnStatement)):
+        return [stmt.value] if stmt.value else []
+    elif isinstance(stmt, (PrintStatement, ExpressionStatement)):
+        return [stmt.expression]
+    elif isinstance(stmt, (IfStatement, WhileStatement)):
+        return [stmt.condition]
+    elif isinstance(stmt, ForStatement):
+        return [stmt.source, stmt.stop] if stmt.stop else [stmt.source]
+    elif isinstance(stmt, IndexAssignment):
+        return [stmt.target, stmt.index, stmt.value]
+    return []
+
+def walk_expression(expr: Expression) -> Iterator[Expression]:
+    """遍历表达式及其全部子表达式"""
+    yield expr
+    if isinstance(expr, BinaryOp):
+        yield from walk_expression(expr.left)
+        yield from walk_expression(expr.right)
+    elif isinstance(expr, UnaryOp):
+        yield from walk_expression(expr.operand)
+    elif isinstance(expr, FunctionCall):
+        for arg in expr.args:
+            yield from walk_expression(arg)
+    elif isinstance(expr, (ListLiteral, SetLiteral)):
+        for element in expr.elements:
+            yield from walk_expression(element)
+    elif isinstance(expr, InterpolatedString):
+        for part in expr.parts:
+            if not isinstance(part, str):
+                yield from walk_expression(part)
+    elif isinstance(expr, DictLiteral):
+        for key, value in expr.entries:
+            yield from walk_expression(key)
+            yield from walk_expression(value)
+    elif isinstance(expr, IndexExpression):
+        yield from walk_expression(expr.target)
+        yield from walk_expression(expr.index)
+    elif isinstance(expr, SliceExpression):
+        yield from walk_expression(expr.target)
+        if expr.start:
+            yield from walk_expression(expr.start)
+        if expr.stop:
+            yield from walk_expression(expr.stop)
+
+def mark_tail_calls(function_def: FunctionDef) -> None:
+    """
+    标记函数体中处于尾调用位置的 有数 语句
+    函数体里任何 `有数 某函数（...）` 执行完调用就直接返回，
+    所以调用可以复用当前帧，不必再压一层Python栈。
+    嵌套函数在它自己被定义时再分析。
+    """
+    for stmt in walk_statements(function_def.body):
+        if isinstance(stmt, ReturnStatement):
+            stmt.tail_call = isinstance(stmt.value, FunctionCall)
+
+def analyze_purity(function_def: FunctionDef) -> Optional[Set[str]]:
+    """
+    纯度分析：函数体不话说、不改外面的变量、不读外面的变量、不定义嵌套函数、不改列表，
+    就只剩下它调用的那些函数要看。返回被调用的函数名集合，本身就不纯时返回None。
+    被调用的函数纯不纯要到运行时按名字查到函数对象以后才晓得。
+    
+    只有参数和读写之前一定已经 老倌 过的名字才算局部变量：要是 分支里、循环里声明的，
+    没走进去时读和 装 都会落到外面的同名变量上，所以按顺序跟着走，分支合流时取两边都声明了的，
+    循环体可能一趟都不走，循环后面不算声明过；挨个 的循环变量只在循环体里算。
+    """
+    declared_anywhere = set(function_def.params)
+    for stmt in walk_statements(function_def.body):
+        if isinstance(stmt, (VarDeclaration, ForStatement)):
+            declared_anywhere.add(stmt.name)
+    
+    called_names: Set[str] = set()
+    
+    def check_expression(expr: Optional[Expression], declared: Set[str]) -> bool:
+        if expr is None:
+            return True
+        for node in walk_expression(expr):
+            if isinstance(node, Identifier) and node.name not in declared:
+                return False
+            if isinstance(node, FunctionCall):
+                if node.name in declared_anywhere:
+                    return False  # 调用局部变量里放的函数，查不到是哪个
+                called_names.add(node.name)
+        return True
+    
+    def check_block(statements: List[Statement], declared: Set[str]) -> bool:
+        """按顺序检查一段代码，declared 是一定已经声明过的名字，走完以后更新成这段代码后面的"""
+        for stmt in statements:
+            if isinstance(stmt, (PrintStatement, FunctionDef, IndexAssignment, ImportStatement)):
+                return False
+            if isinstance(stmt, IfStatement):
+                if not check_expression(stmt.condition, declared):
+                    return False
+                then_declared, else_declared = set(declared), set(declared)
+                if not check_block(stmt.then_branch, then_declared):
+                    return False
+                if stmt.else_branch and not check_block(stmt.else_branch, else_declared):
+                    return False
+                declared |= then_declared & else_declared  # 两边都声明了的才一定声明过
+            elif isinstance(stmt, WhileStatement):
+                if not check_expression(stmt.condition, declared):
+                    return False
+                if not check_block(stmt.body, set(declared)):
+                    return False
+            elif isinstance(stmt, ForStatement):
+                if not (check_expression(stmt.source, declared) and check_expression(stmt.stop, declared)):
+                    return False
+                if not check_block(stmt.body, declared | {stmt.name}):
+                    return False
+            else:
+                for root in statement_expressions(stmt):
+                    if not check_expression(root, declared):
+                        return False
+                if isinstance(stmt, VarDeclaration):
+                    declared.add(stmt.name)
+                elif isinstance(stmt, Assignment) and stmt.name not in declared:
+                    return False
+        return True
+    
+    if not check_block(function_def.body, set(function_def.params)):
+        return None
+    return called_names
+
+def analyze_function(function_def: FunctionDef) -> None:
+    """函数第一次被定义时做一遍分析，结果记在语法树节点上"""
+    mark_tail_calls(function_def)
+    function_def.pure_calls = analyze_purity(function_def)
+    function_def.analyzed = True
+
+def may_suspend(node: ASTNode) -> bool:
+    """
+    异步模式下这条语句或这个表达式执行时会不会让出事件循环
+    只有函数调用才可能碰到异步内置函数，不含调用的子树直接走同步的执行路径。
+    嵌套的函数定义只是定义，不算。结果记在节点上。
+    """
+    if node.suspends is None:
+        if isinstance(node, Statement):
+            node.suspends = any(
+                isinstance(expr, FunctionCall)
+                for stmt in walk_statements([node])
+                for root in statement_expressions(stmt)
+                for expr in walk_expression(root)
+            )
+        else:
+            node.suspends = any(isinstance(expr, FunctionCall) for expr in walk_expression(node))
+    return node.suspends
+
+def analyze_functions(statements: List[Statement]) -> int:
+    """把所有函数定义的分析提前做完（本来第一次执行定义时才做），返回分析了几个"""
+    count = 0
+    for stmt in walk_statements(statements, into_functions=True):
+        if isinstance(stmt, FunctionDef) and not stmt.analyzed:
+            analyze_function(stmt)
+            count += 1
+    return count
+
+def count_nodes(statements: List[Statement]) -> int:
+    """语法树里语句和表达式节点的总数"""
+    return sum(1 + sum(1 for root in statement_expressions(stmt) for _ in walk_expression(root))
+               for stmt in walk_statements(statements, into_functions=True))
+
+def prepare_program(statements: List[Statement], shared: bool = False) -> None:
+    """
+    把本来第一次执行时才做的分析提前做完（函数分析、异步让出分析）
+    预先 fork 的服务在父进程里做，子进程执行时就不会再去改语法树节点，
+    节点所在的内存页能一直和父进程共享。shared 为真时再把二元运算节点标成共享，
+    特化的计数不往节点上写。
+    """
+    for stmt in walk_statements(statements, into_functions=True):
+        if isinstance(stmt, FunctionDef) and not stmt.analyzed:
+            analyze_function(stmt)
+        may_suspend(stmt)
+        for root in statement_expressions(stmt):
+            for expr in walk_expression(root):
+                may_suspend(expr)
+                if shared and isinstance(expr, BinaryOp):
+                    expr.shared = True
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""
+杭州话编程语言输出目的地
+Hangzhou Dialect Programming Language Output Sinks
+"""
+
+import sys
+from typing import List, Optional, TextIO
+
+# 流式输出攒够多少字符写一次
+DEFAULT_BUFFER_SIZE = 1 << 16
+
+# 可选的输出模式
+OUTPUT_MODES = ('capture', 'stream', 'tee', 'discard')
+
+class OutputSink:
+    """话说 的输出目的地基类"""
+    
+    def reset(self) -> List[str]:
+        """开始一次新的执行，返回收集输出的列表（不收集的返回空列表）"""
+        return []
+    
+    def write(self, line: str) -> None:
+        """写一行输出"""
+        pass
+    
+    def flush(self) -> None:
+        """把还没写出去的输出写出去"""
+        pass
+
+class CaptureSink(OutputSink):
+    """只收集到内存里"""
+    
+    def __init__(self):
+        self.lines: List[str] = []
+    
+    def reset(self) -> List[str]:
+        self.lines = []
+        return self.lines
+    
+    def write(self, line: str) -> None:
+        self.lines.append(line)
+
+class StreamSink(OutputSink):
+    """攒成大块再写到流里，不是每行一次系统调用"""
+    
+    def __init__(self, stream: Optional[TextIO] = None, buffer_size: int = DEFAULT_BUFFER_SIZE):
+        self.stream = stream  # None 表示写的时候才取 sys.stdout，方便重定向
+        self.buffer_size = buffer_size
+        self.pending: List[str] = []
+        self.pending_size = 0
+    
+    def write(self, line: str) -> None:
+        self.pending.append(line)
+        self.pending_size += len(line) + 1
+        if self.pending_size >= self.buffer_size:
+            self.flush()
+    
+    def flush(self) -> None:
+        stream = self.stream or sys.stdout
+        if self.pending:
+            self.pending.append('')
+            stream.write('\n'.join(self.pending))
+            self.pending = []
+            self.pending_size = 0
+        stream.flush()
+
+class TeeSink(OutputSink):
+    """同时写到几个目的地"""
+    
+    def __init__(self, *sinks: OutputSink):
+        self.sinks = sinks
+    
+    def reset(self) -> List[str]:
+        captured = []
+        for sink in self.sinks:
+            lines = sink.reset()
+            if isinstance(sink, CaptureSink):
+                captured = lines
+        return captured
+    
+    def write(self, line: str) -> None:
+        for sink in self.sinks:
+            sink.write(line)
+    
+    def flush(self) -> None:
+        for sink in self.sinks:
+            sink.flush()
+
+class NullSink(OutputSink):
+    """丢掉所有输出"""
+    pass
+
+def create_sink(mode: str, stream: Optional[TextIO] = None,
+                buffer_size: int = DEFAULT_BUFFER_SIZE) -> OutputSink:
+    """按模式名创建输出目的地"""
+    if mode == 'capture':
+        return CaptureSink()
+    elif mode == 'stream':
+        return StreamSink(stream, buffer_size)
+    elif mode == 'tee':
+        return TeeSink(CaptureSink(), StreamSink(stream, buffer_size))
+    elif mode == 'discard':
+        return NullSink()
+    else:
+        raise ValueError(f"未知的输出模式: {mode}，可选: {', '.join(OUTPUT_MODES)}")
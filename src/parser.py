@@ -4,13 +4,13 @@
 Hangzhou Dialect Programming Language Parser
 """
 
-from typing import List, Optional, Union, Any
+from typing import List, Optional, Tuple, Union, Any
 from lexer import Token, TokenType, tokenize
-from keywords import get_python_keyword, HANGZHOU_KEYWORDS
+from keywords import get_python_keyword, HANGZHOU_KEYWORDS, HANGZHOU_BUILTIN_FUNCTIONS
 
 class ASTNode:
     """抽象语法树节点基类"""
-    pass
+    suspends = None  # 异步模式下是否可能让出事件循环，第一次执行时由 optimizer.may_suspend 填写
 
 class Program(ASTNode):
     """程序根节点"""
@@ -19,7 +19,7 @@ class Program(ASTNode):
 
 class Statement(ASTNode):
     """语句基类"""
-    pass
+    line = 0  # 语句所在的行号，由语法分析器填写
 
 class Expression(ASTNode):
     """表达式基类"""
@@ -36,6 +36,11 @@ class Assignment(Statement):
     def __init__(self, name: str, value: Expression):
         self.name = name
         self.value = value
+        # `名字 装 名字 加 表达式` 往后拼的写法，记下要拼上去的表达式，解释器可以不复制整个字符串
+        self.append_value = None
+        if (isinstance(value, BinaryOp) and value.operator in ('+', '加') and
+                isinstance(value.left, Identifier) and value.left.name == name):
+            self.append_value = value.right
 
 class PrintStatement(Statement):
     """输出语句"""
@@ -56,20 +61,58 @@ class WhileStatement(Statement):
         self.condition = condition
         self.body = body
 
+class ForStatement(Statement):
+    """挨个循环：挨个 名字 从 列表，或者 挨个 名字 从 开始 直到 结束（不含结束）"""
+    def __init__(self, name: str, source: Expression, stop: Optional[Expression], body: List[Statement]):
+        self.name = name
+        self.source = source
+        self.stop = stop
+        self.body = body
+
+class ImportStatement(Statement):
+    """导入：进来 模块（模块最外层的名字全部进来），或者 从 模块 进来 甲，乙"""
+    def __init__(self, module: str, names: Optional[List[str]] = None):
+        self.module = module
+        self.names = names
+
 class FunctionDef(Statement):
     """函数定义语句"""
     def __init__(self, name: str, params: List[str], body: List[Statement]):
         self.name = name
         self.params = params
         self.body = body
+        self.pure = False  # 是否标注为纯函数（清爽）
+        self.analyzed = False  # 是否已做过尾调用等分析
+        self.pure_calls = None  # 纯度分析结果：函数体调用到的函数名，不纯时为None
 
 class ReturnStatement(Statement):
     """返回语句"""
     def __init__(self, value: Optional[Expression] = None):
         self.value = value
+        self.tail_call = False  # 是否处于尾调用位置
+
+class ExpressionStatement(Statement):
+    """表达式语句，比如单独一行的函数调用"""
+    def __init__(self, expression: Expression):
+        self.expression = expression
+
+class IndexAssignment(Statement):
+    """下标赋值语句：列表[下标] 装 值"""
+    def __init__(self, target: Expression, index: Expression, value: Expression):
+        self.target = target
+        self.index = index
+        self.value = value
 
 class BinaryOp(Expression):
     """二元运算表达式"""
+    # 自适应特化的状态，见 quicken.py
+    quick = None      # 当前的特化，None 表示走通用路径
+    executions = 0    # 通用路径执行次数
+    hits = 0          # 特化守卫通过次数
+    misses = 0        # 特化守卫失败次数
+    line = 0          # 特化时所在的行号，报告用
+    shared = False    # 和别的进程共享的节点，特化状态记在解释器的 quick_states 里，不写节点
+    
     def __init__(self, left: Expression, operator: str, right: Expression):
         self.left = left
         self.operator = operator
@@ -86,6 +129,11 @@ class Literal(Expression):
     def __init__(self, value: Union[str, int, float, bool]):
         self.value = value
 
+class InterpolatedString(Expression):
+    """带 {表达式} 的字符串："现在是{现在时光}"，parts 里是文字和表达式，解析时就切好"""
+    def __init__(self, parts: List[Union[str, Expression]]):
+        self.parts = parts
+
 class Identifier(Expression):
     """标识符表达式"""
     def __init__(self, name: str):
@@ -97,6 +145,34 @@ class FunctionCall(Expression):
         self.name = name
         self.args = args
 
+class ListLiteral(Expression):
+    """列表字面量：[a，b，c]"""
+    def __init__(self, elements: List[Expression]):
+        self.elements = elements
+
+class DictLiteral(Expression):
+    """字典字面量：{键：值，键：值}，{} 是空字典"""
+    def __init__(self, entries: List[Tuple[Expression, Expression]]):
+        self.entries = entries
+
+class SetLiteral(Expression):
+    """集合字面量：{a，b，c}"""
+    def __init__(self, elements: List[Expression]):
+        self.elements = elements
+
+class IndexExpression(Expression):
+    """下标表达式：列表[下标]"""
+    def __init__(self, target: Expression, index: Expression):
+        self.target = target
+        self.index = index
+
+class SliceExpression(Expression):
+    """切片表达式：列表[开始:结束]，两头都可以省略"""
+    def __init__(self, target: Expression, start: Optional[Expression], stop: Optional[Expression]):
+        self.target = target
+        self.start = start
+        self.stop = stop
+
 class HangzhouParser:
     """杭州话语法分析器"""
     
@@ -156,10 +232,18 @@ class HangzhouParser:
         return Program(statements)
     
     def parse_statement(self) -> Optional[Statement]:
-        """解析语句"""
+        """解析语句，并记下语句开头的行号"""
         if not self.current_token:
             return None
         
+        line = self.current_token.line
+        stmt = self.parse_statement_body()
+        if stmt:
+            stmt.line = line
+        return stmt
+    
+    def parse_statement_body(self) -> Optional[Statement]:
+        """按开头的token分派到具体的语句解析"""
         # 变量声明：老倌 name 装 value
         if self.match(TokenType.KEYWORD) and self.current_token.value == '老倌':
             return self.parse_var_declaration()
@@ -176,10 +260,27 @@ class HangzhouParser:
         elif self.match(TokenType.KEYWORD) and self.current_token.value == '一息息':
             return self.parse_while_statement()
         
+        # 挨个循环：挨个 name 从 iterable [直到 stop]
+        elif self.match(TokenType.KEYWORD) and self.current_token.value == '挨个':
+            return self.parse_for_statement()
+        
+        # 导入：进来 module / 从 module 进来 name，name
+        elif self.match(TokenType.KEYWORD) and self.current_token.value in ['进来', '从']:
+            return self.parse_import_statement()
+        
         # 函数定义：会做事/做事体/介个套 name(params)
         elif self.match(TokenType.KEYWORD) and self.current_token.value in ['会做事', '做事体', '介个套']:
             return self.parse_function_def()
         
+        # 纯函数标注：清爽 会做事 name(params)
+        elif self.match(TokenType.KEYWORD) and self.current_token.value == '清爽':
+            self.advance()  # 消费 '清爽'
+            if not (self.match(TokenType.KEYWORD) and self.current_token.value in ['会做事', '做事体', '介个套']):
+                self.error("'清爽' 后面要跟函数定义")
+            function_def = self.parse_function_def()
+            function_def.pure = True
+            return function_def
+        
         # 返回语句：有数 expression
         elif self.match(TokenType.KEYWORD) and self.current_token.value == '有数':
             return self.parse_return_statement()
@@ -188,6 +289,10 @@ class HangzhouParser:
         elif self.match(TokenType.IDENTIFIER):
             return self.parse_assignment_or_expression()
         
+        # 内置函数调用语句：撒宽（100）
+        elif self.match(TokenType.KEYWORD) and self.current_token.value in HANGZHOU_BUILTIN_FUNCTIONS:
+            return ExpressionStatement(self.parse_expression())
+        
         else:
             # 跳过未知token
             self.advance()
@@ -206,16 +311,20 @@ class HangzhouParser:
         return VarDeclaration(name_token.value, value)
     
     def parse_assignment_or_expression(self) -> Statement:
-        """解析赋值语句或表达式语句"""
-        name_token = self.consume(TokenType.IDENTIFIER)
+        """解析赋值语句（变量或下标）或表达式语句"""
+        expr = self.parse_expression()
         
         if self.match(TokenType.KEYWORD) and self.current_token.value == '装':
             self.advance()  # 消费 '装'
             value = self.parse_expression()
-            return Assignment(name_token.value, value)
-        else:
-            # 这是一个表达式语句，暂时忽略
-            return None
+            if isinstance(expr, Identifier):
+                return Assignment(expr.name, value)
+            elif isinstance(expr, IndexExpression):
+                return IndexAssignment(expr.target, expr.index, value)
+            self.error("'装' 左边只能是变量或者下标")
+        
+        # 表达式语句，比如单独一行的函数调用
+        return ExpressionStatement(expr)
     
     def parse_print_statement(self) -> PrintStatement:
         """解析输出语句"""
@@ -228,35 +337,55 @@ class HangzhouParser:
         expression = self.parse_expression()
         return PrintStatement(expression)
     
+    def parse_block(self) -> List[Statement]:
+        """解析代码块：冒号后换行缩进的多行块，或同一行里的语句"""
+        statements = []
+        
+        # 同一行的块：特为 甲 大过 1：话说 甲
+        if not self.match(TokenType.NEWLINE) and not self.match(TokenType.COMMENT):
+            while (self.current_token and
+                   not self.match(TokenType.NEWLINE) and
+                   not self.match(TokenType.EOF) and
+                   not self.match(TokenType.DEDENT) and
+                   not (self.match(TokenType.KEYWORD) and self.current_token.value == '不然')):
+                stmt = self.parse_statement()
+                if stmt:
+                    statements.append(stmt)
+            return statements
+        
+        while self.match(TokenType.NEWLINE) or self.match(TokenType.COMMENT):
+            self.advance()
+        
+        if not self.match(TokenType.INDENT):
+            return statements
+        self.advance()  # 消费 INDENT
+        
+        while (self.current_token and
+               not self.match(TokenType.DEDENT) and
+               not self.match(TokenType.EOF)):
+            stmt = self.parse_statement()
+            if stmt:
+                statements.append(stmt)
+            self.skip_newlines()
+        
+        if self.match(TokenType.DEDENT):
+            self.advance()  # 消费 DEDENT
+        
+        return statements
+    
     def parse_if_statement(self) -> IfStatement:
         """解析条件语句"""
         self.consume(TokenType.KEYWORD)  # 消费 '特为' 或 '要是'
         condition = self.parse_expression()
         
         self.consume(TokenType.COLON, "期望 ':'")
-        self.skip_newlines()
-        
-        then_branch = []
-        while (self.current_token and 
-               not (self.match(TokenType.KEYWORD) and self.current_token.value in ['不然', 'EOF'])):
-            stmt = self.parse_statement()
-            if stmt:
-                then_branch.append(stmt)
-            self.skip_newlines()
+        then_branch = self.parse_block()
         
         else_branch = None
         if self.match(TokenType.KEYWORD) and self.current_token.value == '不然':
             self.advance()  # 消费 '不然'
             self.consume(TokenType.COLON, "期望 ':'")
-            self.skip_newlines()
-            
-            else_branch = []
-            while (self.current_token and 
-                   not self.match(TokenType.EOF)):
-                stmt = self.parse_statement()
-                if stmt:
-                    else_branch.append(stmt)
-                self.skip_newlines()
+            else_branch = self.parse_block()
         
         return IfStatement(condition, then_branch, else_branch)
     
@@ -266,17 +395,48 @@ class HangzhouParser:
         condition = self.parse_expression()
         
         self.consume(TokenType.COLON, "期望 ':'")
-        self.skip_newlines()
-        
-        body = []
-        while (self.current_token and not self.match(TokenType.EOF)):
-            stmt = self.parse_statement()
-            if stmt:
-                body.append(stmt)
-            self.skip_newlines()
+        body = self.parse_block()
         
         return WhileStatement(condition, body)
     
+    def parse_for_statement(self) -> ForStatement:
+        """解析挨个循环"""
+        self.consume(TokenType.KEYWORD)  # 消费 '挨个'
+        name_token = self.consume(TokenType.IDENTIFIER, "期望循环变量名")
+        if not (self.match(TokenType.KEYWORD) and self.current_token.value == '从'):
+            self.error("期望 '从'")
+        self.advance()  # 消费 '从'
+        source = self.parse_expression()
+        
+        stop = None
+        if self.match(TokenType.KEYWORD) and self.current_token.value == '直到':
+            self.advance()  # 消费 '直到'
+            stop = self.parse_expression()
+        
+        self.consume(TokenType.COLON, "期望 ':'")
+        body = self.parse_block()
+        
+        return ForStatement(name_token.value, source, stop, body)
+    
+    def parse_import_statement(self) -> ImportStatement:
+        """解析导入语句"""
+        if self.current_token.value == '进来':
+            self.advance()  # 消费 '进来'
+            module_token = self.consume(TokenType.IDENTIFIER, "期望模块名")
+            return ImportStatement(module_token.value)
+        
+        self.advance()  # 消费 '从'
+        module_token = self.consume(TokenType.IDENTIFIER, "期望模块名")
+        if not (self.match(TokenType.KEYWORD) and self.current_token.value == '进来'):
+            self.error("期望 '进来'")
+        self.advance()  # 消费 '进来'
+        
+        names = [self.consume(TokenType.IDENTIFIER, "期望要导入的名字").value]
+        while self.match(TokenType.COMMA):
+            self.advance()
+            names.append(self.consume(TokenType.IDENTIFIER, "期望要导入的名字").value)
+        return ImportStatement(module_token.value, names)
+    
     def parse_function_def(self) -> FunctionDef:
         """解析函数定义"""
         self.consume(TokenType.KEYWORD)  # 消费 '会做事'
@@ -297,14 +457,7 @@ class HangzhouParser:
         
         self.consume(TokenType.RPAREN, "期望 ')'")
         self.consume(TokenType.COLON, "期望 ':'")
-        self.skip_newlines()
-        
-        body = []
-        while (self.current_token and not self.match(TokenType.EOF)):
-            stmt = self.parse_statement()
-            if stmt:
-                body.append(stmt)
-            self.skip_newlines()
+        body = self.parse_block()
         
         return FunctionDef(name_token.value, params, body)
     
@@ -313,7 +466,8 @@ class HangzhouParser:
         self.consume(TokenType.KEYWORD)  # 消费 '有数'
         
         value = None
-        if not self.match(TokenType.NEWLINE) and not self.match(TokenType.EOF):
+        if (not self.match(TokenType.NEWLINE) and not self.match(TokenType.EOF) and
+                not self.match(TokenType.DEDENT) and not self.match(TokenType.COMMENT)):
             value = self.parse_expression()
         
         return ReturnStatement(value)
@@ -352,7 +506,8 @@ class HangzhouParser:
         """解析等式表达式"""
         expr = self.parse_comparison()
         
-        while self.match(TokenType.EQUAL) or self.match(TokenType.NOT_EQUAL):
+        while (self.match(TokenType.EQUAL) or self.match(TokenType.NOT_EQUAL) or
+               (self.match(TokenType.KEYWORD) and self.current_token.value in ['等于', '不等'])):
             operator = self.current_token.value
             self.advance()
             right = self.parse_comparison()
@@ -409,7 +564,29 @@ class HangzhouParser:
             expr = self.parse_unary()
             return UnaryOp(operator, expr)
         
-        return self.parse_primary()
+        return self.parse_postfix()
+    
+    def parse_postfix(self) -> Expression:
+        """解析下标和切片：表达式[下标]、表达式[开始:结束]"""
+        expr = self.parse_primary()
+        
+        while self.match(TokenType.LBRACKET):
+            self.advance()  # 消费 '['
+            start = None
+            if not self.match(TokenType.COLON):
+                start = self.parse_expression()
+            
+            if self.match(TokenType.COLON):
+                self.advance()  # 消费 ':'
+                stop = None
+                if not self.match(TokenType.RBRACKET):
+                    stop = self.parse_expression()
+                expr = SliceExpression(expr, start, stop)
+            else:
+                expr = IndexExpression(expr, start)
+            self.consume(TokenType.RBRACKET, "期望 ']'")
+        
+        return expr
     
     def parse_primary(self) -> Expression:
         """解析基本表达式"""
@@ -425,6 +602,10 @@ class HangzhouParser:
             self.advance()
             return Literal(value)
         
+        # 带 {表达式} 的字符串
+        if self.match(TokenType.TEMPLATE_STRING):
+            return self.parse_interpolated_string()
+        
         # 布尔值
         if self.match(TokenType.KEYWORD) and self.current_token.value in ['真的', '假的']:
             value = self.current_token.value == '真的'
@@ -436,8 +617,9 @@ class HangzhouParser:
             self.advance()
             return Literal(None)
         
-        # 标识符或函数调用
-        if self.match(TokenType.IDENTIFIER):
+        # 标识符或函数调用（撒宽、撒子儿这些内置函数名也是关键字）
+        if (self.match(TokenType.IDENTIFIER) or
+                (self.match(TokenType.KEYWORD) and self.current_token.value in HANGZHOU_BUILTIN_FUNCTIONS)):
             name = self.current_token.value
             self.advance()
             
@@ -456,6 +638,23 @@ class HangzhouParser:
             else:
                 return Identifier(name)
         
+        # 列表字面量
+        if self.match(TokenType.LBRACKET):
+            self.advance()  # 消费 '['
+            elements = []
+            while not self.match(TokenType.RBRACKET):
+                elements.append(self.parse_expression())
+                if self.match(TokenType.COMMA):
+                    self.advance()
+                elif not self.match(TokenType.RBRACKET):
+                    self.error("期望 ',' 或 ']'")
+            self.consume(TokenType.RBRACKET, "期望 ']'")
+            return ListLiteral(elements)
+        
+        # 字典或集合字面量：第一个元素后面跟 ':' 就是字典
+        if self.match(TokenType.LBRACE):
+            return self.parse_brace_literal()
+        
         # 括号表达式
         if self.match(TokenType.LPAREN):
             self.advance()  # 消费 '('
@@ -465,6 +664,55 @@ class HangzhouParser:
         
         self.error("期望表达式")
 
+    def parse_interpolated_string(self) -> InterpolatedString:
+        """解析词法分析器切好的 (文字, 表达式源码, 文字, ...)，空的文字段不要"""
+        segments = self.current_token.value
+        self.advance()
+        parts: List[Union[str, Expression]] = []
+        for position, segment in enumerate(segments):
+            if position % 2 == 0:
+                if segment:
+                    parts.append(segment)
+                continue
+            try:
+                sub_parser = HangzhouParser(tokenize(segment.strip()))
+                expr = sub_parser.parse_expression()
+                sub_parser.skip_newlines()
+                if not sub_parser.match(TokenType.EOF):
+                    sub_parser.error("多出来的东西")
+            except SyntaxError as e:
+                self.error(f"字符串里的 {{{segment}}} 不是一个表达式（{e}）")
+            parts.append(expr)
+        return InterpolatedString(parts)
+    
+    def parse_brace_literal(self) -> Expression:
+        """解析 {键：值，...} 字典或者 {a，b，...} 集合"""
+        self.advance()  # 消费 '{'
+        if self.match(TokenType.RBRACE):
+            self.advance()
+            return DictLiteral([])
+        
+        first = self.parse_expression()
+        is_dict = self.match(TokenType.COLON)
+        entries = []
+        elements = []
+        key = first
+        while True:
+            if is_dict:
+                self.consume(TokenType.COLON, "期望 ':'")
+                entries.append((key, self.parse_expression()))
+            else:
+                elements.append(key)
+            if self.match(TokenType.COMMA):
+                self.advance()
+            elif not self.match(TokenType.RBRACE):
+                self.error("期望 ',' 或 '}'")
+            if self.match(TokenType.RBRACE):
+                break
+            key = self.parse_expression()
+        self.consume(TokenType.RBRACE, "期望 '}'")
+        return DictLiteral(entries) if is_dict else SetLiteral(elements)
+
 def parse(tokens: List[Token]) -> Program:
     """便捷函数：将token列表解析为AST"""
     parser = HangzhouParser(tokens)
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""
+杭州话编程语言预先 fork 的守护进程
+Hangzhou Dialect Programming Language Prefork Server
+
+hangzhoulang serve --workers N 的实现：父进程把解释器模板、关键字表和要预加载的程序
+都建好、分析好，调用 gc.freeze() 以后再 fork 出 N 个工作进程，大家在同一个套接字上接请求。
+gc.freeze() 把父进程里的对象挪到永久代，子进程的垃圾回收不会再去碰它们的对象头，
+这些内存页就能一直写时复制地共享着；引用计数的写入还是会弄脏一部分页，
+所以用 USS（只属于这个进程的内存）来确认共享了多少。
+"""
+
+import asyncio
+import gc
+import os
+import signal
+import sys
+import time
+from typing import Dict, Optional
+
+from governor import process_memory
+from optimizer import prepare_program
+from server import HangzhouServer
+
+class PreforkServer:
+    """父进程：准备共享状态、fork 工作进程、工作进程退出了就补一个"""
+
+    def __init__(self, server: HangzhouServer, workers: int, freeze: bool = True,
+                 memory_report: Optional[float] = None):
+        self.server = server
+        self.workers = workers
+        self.freeze = freeze
+        self.memory_report = memory_report
+        self.children: Dict[int, int] = {}  # pid -> 工作进程编号
+        self.stopping = False
+
+    def run(self) -> None:
+        """一直跑到收到 SIGINT/SIGTERM"""
+        sock = self.server.listen()
+        try:
+            self._prepare_shared_state()
+            signal.signal(signal.SIGINT, self._stop)
+            signal.signal(signal.SIGTERM, self._stop)
+
+            for number in range(self.workers):
+                self._spawn(number, sock)
+            print(f"杭州话守护进程 {os.getpid()} 在 {self.server.socket_path} 上，"
+                  f"{self.workers} 个工作进程", file=sys.stderr)
+
+            next_report = time.monotonic() + (self.memory_report or 0)
+            while not self.stopping:
+                self._reap(sock)
+                if self.memory_report and time.monotonic() >= next_report:
+                    self.report_memory()
+                    next_report = time.monotonic() + self.memory_report
+                time.sleep(0.2)
+        finally:
+            self._shutdown()
+            sock.close()
+            if os.path.exists(self.server.socket_path):
+                os.unlink(self.server.socket_path)
+
+    def _prepare_shared_state(self) -> None:
+        """
+        fork 前把要共享的东西都做完，再冻结
+        开场脚本和程序缓存里的程序（--preload 的）语法树都是工作进程共用的，
+        二元运算节点都标成共享，特化的计数记在每个工作进程自己的表里
+        """
+        if self.server.template.program is not None:
+            prepare_program(self.server.template.program.statements, shared=True)
+        for program in self.server.programs.entries.values():
+            prepare_program(program.statements, shared=True)
+        gc.collect()
+        if self.freeze:
+            gc.freeze()
+
+    def _spawn(self, number: int, sock) -> None:
+        pid = os.fork()
+        if pid == 0:
+            # 工作进程：信号交给事件循环处理
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            code = 0
+            try:
+                asyncio.run(self.server.serve_forever(sock))
+            except BaseException:
+                code = 1
+            finally:
+                os._exit(code)
+        self.children[pid] = number
+
+    def _reap(self, sock) -> None:
+        """收掉退出的工作进程，没在停机的话按原来的编号补一个"""
+        while self.children:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            number = self.children.pop(pid, None)
+            if number is not None and not self.stopping:
+                print(f"工作进程 {number}（{pid}）退出了，状态 {status}，重新 fork 一个", file=sys.stderr)
+                self._spawn(number, sock)
+
+    def _stop(self, signum, frame) -> None:
+        self.stopping = True
+
+    def _shutdown(self) -> None:
+        for pid in list(self.children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        for pid in list(self.children):
+            try:
+                os.waitpid(pid, 0)
+            except ChildProcessError:
+                pass
+        self.children.clear()
+
+    def report_memory(self) -> None:
+        """把父进程和每个工作进程的 USS/PSS/RSS 写到标准错误"""
+        rows = [('父进程', os.getpid())] + sorted(
+            ((f"工作进程{number}", pid) for pid, number in self.children.items()), key=lambda row: row[0])
+        for name, pid in rows:
+            memory = process_memory(pid)
+            if memory:
+                print(f"{name} {pid}: USS {memory['uss'] / 1048576:.1f} MB  "
+                      f"PSS {memory['pss'] / 1048576:.1f} MB  RSS {memory['rss'] / 1048576:.1f} MB",
+                      file=sys.stderr)
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""
+杭州话编程语言采样分析器
+Hangzhou Dialect Programming Language Sampling Profiler
+"""
+
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+# 默认每秒采样次数
+DEFAULT_SAMPLE_RATE = 1000
+
+# 主程序（不在任何函数里）在调用栈里的名字
+MAIN_FRAME = '<主程序>'
+
+class SamplingProfiler:
+    """
+    采样分析器
+    后台线程按固定频率读取解释器的杭州话调用栈（call_stack 加 current_line），
+    统计每条调用路径被采到的次数。解释器本身只需维护调用栈，不做计时。
+    """
+    
+    def __init__(self, interpreter, rate: int = DEFAULT_SAMPLE_RATE):
+        self.interpreter = interpreter
+        self.interval = 1.0 / max(1, rate)
+        self.samples: Counter = Counter()  # 调用路径 -> 采样次数
+        self.total = 0
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+        self._switch_interval = sys.getswitchinterval()
+    
+    def start(self) -> None:
+        """开始采样"""
+        # 线程切换间隔（默认5毫秒）比采样间隔长的话，采样线程根本抢不到GIL
+        self._switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(min(self._switch_interval, self.interval))
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name='hangzhou-profiler', daemon=True)
+        self._thread.start()
+    
+    def stop(self) -> None:
+        """停止采样"""
+        self._running = False
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        sys.setswitchinterval(self._switch_interval)
+    
+    def __enter__(self) -> 'SamplingProfiler':
+        self.start()
+        return self
+    
+    def __exit__(self, *exc) -> None:
+        self.stop()
+    
+    def _run(self) -> None:
+        """采样线程"""
+        while self._running:
+            time.sleep(self.interval)
+            self.sample()
+    
+    def sample(self) -> None:
+        """采一次样：把调用栈变成 ((函数名, 行号), ...)，最里层在最后"""
+        stack = list(self.interpreter.call_stack)
+        line = self.interpreter.current_line
+        
+        # 每一帧正在执行的行 = 下一层的调用处行号，最里层用 current_line
+        names = [MAIN_FRAME] + [name for name, _ in stack]
+        lines = [call_line for _, call_line in stack] + [line]
+        self.samples[tuple(zip(names, lines))] += 1
+        self.total += 1
+    
+    def collapsed_stacks(self) -> List[str]:
+        """折叠栈格式（flamegraph.pl、speedscope 等工具都认）"""
+        lines = []
+        for path, count in sorted(self.samples.items()):
+            frames = ';'.join(f"{name}:{line}" for name, line in path)
+            lines.append(f"{frames} {count}")
+        return lines
+    
+    def write_collapsed(self, filename: str) -> None:
+        """把折叠栈写到文件"""
+        with open(filename, 'w', encoding='utf-8') as f:
+            for line in self.collapsed_stacks():
+                f.write(line + '\n')
+    
+    def function_stats(self) -> List[Tuple[str, int, int]]:
+        """按函数统计：(函数名, 自身采样数, 累计采样数)，按自身采样数排序"""
+        self_counts: Dict[str, int] = Counter()
+        total_counts: Dict[str, int] = Counter()
+        for path, count in self.samples.items():
+            self_counts[path[-1][0]] += count
+            for name in set(name for name, _ in path):
+                total_counts[name] += count
+        return sorted(((name, self_counts[name], total_counts[name]) for name in total_counts),
+                      key=lambda item: (-item[1], -item[2], item[0]))
+    
+    def line_stats(self) -> List[Tuple[str, int, int]]:
+        """按行统计：(函数名, 行号, 自身采样数)，按采样数排序"""
+        counts: Dict[Tuple[str, int], int] = Counter()
+        for path, count in self.samples.items():
+            counts[path[-1]] += count
+        return sorted(((name, line, count) for (name, line), count in counts.items()),
+                      key=lambda item: (-item[2], item[0], item[1]))
+    
+    def print_report(self, top: int = 10) -> None:
+        """输出按函数和按行的前N名"""
+        print(f"采样分析: 共 {self.total} 次采样")
+        if not self.total:
+            return
+        
+        print("按函数（自身 / 累计）:")
+        for name, own, cumulative in self.function_stats()[:top]:
+            print(f"  {own / self.total:7.1%} {cumulative / self.total:7.1%}  {name}")
+        
+        print("按行:")
+        for name, line, count in self.line_stats()[:top]:
+            print(f"  {count / self.total:7.1%}  {name} 第{line}行")
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""
+杭州话编程语言守护进程协议
+Hangzhou Dialect Programming Language Daemon Protocol
+
+hangzhoulang serve 和 hangzhoulang client 之间走 Unix 域套接字，
+每一帧是 4 字节大端长度加上一个 UTF-8 的 JSON 对象。
+
+请求:
+  {"op": "run", "source": "...", "args": [...], "limits": {...}}   跑一段源码
+  {"op": "run", "path": "/绝对/路径.hz", "args": [...], "limits": {...}}  跑一个文件
+  {"op": "ping"}  /  {"op": "stats"}
+响应（run 会先来若干个 output 帧）:
+  {"type": "output", "text": "..."}
+  {"type": "done", "status": "ok"|"error"|"timeout", "error": ..., "elapsed_ms": ...}
+  {"type": "pong"}  /  {"type": "stats", ...}
+这个模块只用标准库，客户端导入它不必加载解释器。
+"""
+
+import json
+import os
+import socket
+import struct
+from typing import Any, Dict, Optional
+
+# 一帧最大字节数
+MAX_FRAME_SIZE = 64 * 1024 * 1024
+
+_HEADER = struct.Struct('>I')
+HEADER_SIZE = _HEADER.size
+
+def default_socket_path() -> str:
+    """
+    默认的套接字路径：环境变量 HANGZHOULANG_SOCKET，没有就放在运行时目录（或 /tmp）里按用户区分
+    （不用 tempfile，客户端启动时少导入几个模块）
+    """
+    path = os.environ.get('HANGZHOULANG_SOCKET')
+    if path:
+        return path
+    uid = os.getuid() if hasattr(os, 'getuid') else 0
+    directory = os.environ.get('XDG_RUNTIME_DIR') or os.environ.get('TMPDIR') or '/tmp'
+    return os.path.join(directory, f'hangzhoulang-{uid}.sock')
+
+def encode_frame(message: Dict[str, Any]) -> bytes:
+    """把消息编码成一帧"""
+    payload = json.dumps(message, ensure_ascii=False).encode('utf-8')
+    if len(payload) > MAX_FRAME_SIZE:
+        raise ValueError(f"消息太大了: {len(payload)} 字节")
+    return _HEADER.pack(len(payload)) + payload
+
+def decode_payload(payload: bytes) -> Dict[str, Any]:
+    """解码一帧的内容"""
+    message = json.loads(payload.decode('utf-8'))
+    if not isinstance(message, dict):
+        raise ValueError("消息必须是JSON对象")
+    return message
+
+def payload_size(header: bytes) -> int:
+    """从帧头取出内容长度"""
+    size = _HEADER.unpack(header)[0]
+    if size > MAX_FRAME_SIZE:
+        raise ValueError(f"消息太大了: {size} 字节")
+    return size
+
+def send_frame(sock: socket.socket, message: Dict[str, Any]) -> None:
+    """（阻塞套接字）发一帧"""
+    sock.sendall(encode_frame(message))
+
+def _recv_exactly(sock: socket.socket, size: int) -> Optional[bytes]:
+    chunks = []
+    while size:
+        chunk = sock.recv(min(size, 1 << 20))
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b''.join(chunks)
+
+def recv_frame(sock: socket.socket) -> Optional[Dict[str, Any]]:
+    """（阻塞套接字）收一帧，对方关闭连接时返回None"""
+    header = _recv_exactly(sock, HEADER_SIZE)
+    if header is None:
+        return None
+    payload = _recv_exactly(sock, payload_size(header))
+    if payload is None:
+        return None
+    return decode_payload(payload)
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""
+杭州话编程语言自适应特化（quickening）
+Hangzhou Dialect Programming Language Adaptive Specialization
+
+二元运算节点先走通用路径，执行满 QUICKEN_THRESHOLD 次以后按最后一次看到的操作数类型
+把自己换成特化版本（比如 整数加、字符串拼接、整数比较），只留一个类型检查做守卫；
+守卫不过就退回通用路径，一直不过就彻底退回去。
+"""
+
+import operator
+from typing import Any, Callable, Dict, NamedTuple, Optional, Tuple
+
+# 通用路径执行多少次以后尝试特化
+QUICKEN_THRESHOLD = 8
+
+# 守卫失败超过这么多次并且多过命中次数，就退回通用路径不再特化
+DEOPT_THRESHOLD = 64
+
+class Specialization(NamedTuple):
+    """一种特化：两个操作数的确切类型和直接调用的运算函数"""
+    name: str
+    left_type: type
+    right_type: type
+    function: Callable[[Any, Any], Any]
+
+# 运算符别名，特化表按第一个写法登记
+OPERATOR_ALIASES = {
+    '加': '+', '减': '-', '乘': '*',
+    '大过': '>', '小过': '<', '大等于': '>=', '小等于': '<=', '等于': '==', '不等': '!=',
+}
+
+_COMPARISONS = {
+    '>': ('gt', operator.gt), '<': ('lt', operator.lt),
+    '>=': ('ge', operator.ge), '<=': ('le', operator.le),
+    '==': ('eq', operator.eq), '!=': ('ne', operator.ne),
+}
+
+def _build_specializations() -> Dict[Tuple[str, type, type], Specialization]:
+    """
+    特化表：(运算符, 左类型, 右类型) -> 特化
+    除法要检查除数是不是0，不特化；真的/假的 的类型是 bool，不算整数，走通用路径。
+    """
+    table = {}
+
+    def add(op: str, name: str, left_type: type, right_type: type, function: Callable) -> None:
+        table[(op, left_type, right_type)] = Specialization(name, left_type, right_type, function)
+
+    for type_name, number_type in (('int', int), ('float', float)):
+        add('+', f'{type_name}-add', number_type, number_type, operator.add)
+        add('-', f'{type_name}-sub', number_type, number_type, operator.sub)
+        add('*', f'{type_name}-mul', number_type, number_type, operator.mul)
+        for op, (suffix, function) in _COMPARISONS.items():
+            add(op, f'{type_name}-{suffix}', number_type, number_type, function)
+
+    add('+', 'str-concat', str, str, operator.add)
+    for op in ('==', '!='):
+        suffix, function = _COMPARISONS[op]
+        add(op, f'str-{suffix}', str, str, function)
+    return table
+
+SPECIALIZATIONS = _build_specializations()
+
+class QuickState:
+    """
+    共享语法树节点的特化状态，字段和 BinaryOp 上的一样，只是存在节点外面
+    预先 fork 的服务里，模板的语法树节点在父进程里建好、和工作进程共享内存页，
+    工作进程把计数写在节点上，整页就被复制成私有的了。
+    """
+    __slots__ = ('operator', 'quick', 'executions', 'hits', 'misses', 'line')
+
+    def __init__(self, operator_name: str):
+        self.operator = operator_name
+        self.quick: Optional[Specialization] = None
+        self.executions = 0
+        self.hits = 0
+        self.misses = 0
+        self.line = 0
+
+def find_specialization(operator_name: str, left: Any, right: Any) -> Optional[Specialization]:
+    """按运算符和两个操作数的确切类型找特化，没有就返回None"""
+    operator_name = OPERATOR_ALIASES.get(operator_name, operator_name)
+    return SPECIALIZATIONS.get((operator_name, type(left), type(right)))
@@ -0,0 +1,342 @@
+# -*- coding: utf-8 -*-
+"""
+杭州话编程语言守护进程
+Hangzhou Dialect Programming Language Daemon
+
+hangzhoulang serve 的实现：常驻在后台，解释器模板和解析好的程序都留在内存里，
+通过 Unix 域套接字接收运行请求（协议见 protocol.py）。每个请求从模板克隆一个
+异步解释器，所以 撒宽 的脚本不会堵住别的请求。
+"""
+
+import argparse
+import asyncio
+import os
+import signal
+import socket
+import sys
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from async_interpreter import AsyncHangzhouInterpreter
+from governor import ResourceGovernor, process_memory
+from optimizer import prepare_program
+from output import OutputSink, DEFAULT_BUFFER_SIZE
+from parser import Program, parse_text
+from protocol import (
+    HEADER_SIZE, default_socket_path, encode_frame, decode_payload, payload_size
+)
+from template import InterpreterTemplate
+from utils import ResourceLimitError
+
+# 默认缓存多少个解析好的程序
+DEFAULT_CACHE_SIZE = 256
+
+# 发给客户端、还没被收走的输出最多攒多少字节；脚本大部分时候同步地跑，等不了 drain，
+# 客户端收得比脚本写得慢时到这个数就让请求失败，免得整个输出都堆在守护进程的内存里
+DEFAULT_MAX_PENDING = 8 << 20
+
+# 请求里可以设置的资源限制
+LIMIT_NAMES = ('max_time', 'max_steps', 'max_depth')
+
+class ProgramCache:
+    """
+    解析好的程序的LRU缓存
+    源码按内容缓存；文件按 (路径, 修改时间, 大小) 缓存，文件改了自然就失效。
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.entries: 'OrderedDict[Any, Program]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def _lookup(self, key: Any) -> Optional[Program]:
+        program = self.entries.get(key)
+        if program is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+        else:
+            self.misses += 1
+        return program
+
+    def _store(self, key: Any, program: Program) -> Program:
+        if self.maxsize > 0:
+            self.entries[key] = program
+            if len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+        return program
+
+    def from_source(self, source: str) -> Program:
+        """按源码取程序"""
+        key = ('source', source)
+        program = self._lookup(key)
+        if program is None:
+            program = self._store(key, parse_text(source))
+        return program
+
+    def preload(self, path: str) -> Program:
+        """预先解析一个文件，连同运行时才做的分析一起做完"""
+        program = self.from_path(path)
+        prepare_program(program.statements)
+        return program
+
+    def from_path(self, path: str) -> Program:
+        """按文件取程序，没改过的文件不再读、不再解析"""
+        stat = os.stat(path)
+        key = ('path', path, stat.st_mtime_ns, stat.st_size)
+        program = self._lookup(key)
+        if program is None:
+            with open(path, 'r', encoding='utf-8') as f:
+                program = self._store(key, parse_text(f.read()))
+        return program
+
+class FrameSink(OutputSink):
+    """
+    把 话说 的输出攒成块，作为 output 帧写给客户端
+    写完看一眼传输层里还没发出去的字节数，超过 max_pending 就抛 ResourceLimitError 结束脚本。
+    """
+
+    def __init__(self, writer: asyncio.StreamWriter, buffer_size: int = DEFAULT_BUFFER_SIZE,
+                 max_pending: int = DEFAULT_MAX_PENDING):
+        self.writer = writer
+        self.buffer_size = buffer_size
+        self.max_pending = max_pending
+        self.pending: List[str] = []
+        self.pending_size = 0
+
+    def write(self, line: str) -> None:
+        self.pending.append(line)
+        self.pending_size += len(line) + 1
+        if self.pending_size >= self.buffer_size:
+            self.flush()
+
+    def flush(self) -> None:
+        pending = self.pending
+        self.pending = []
+        self.pending_size = 0
+        if not pending or self.writer.is_closing():
+            return
+        pending.append('')
+        self.writer.write(encode_frame({'type': 'output', 'text': '\n'.join(pending)}))
+        if self.writer.transport.get_write_buffer_size() > self.max_pending:
+            raise ResourceLimitError('output', self.max_pending,
+                                     f"客户端收输出太慢，待发的输出超过 {self.max_pending // (1024 * 1024)} MB")
+
+class HangzhouServer:
+    """杭州话守护进程"""
+
+    def __init__(self, socket_path: str, prelude: Optional[str] = None,
+                 cache_size: int = DEFAULT_CACHE_SIZE, limits: Optional[Dict[str, Any]] = None,
+                 max_pending: int = DEFAULT_MAX_PENDING):
+        self.socket_path = socket_path
+        self.template = InterpreterTemplate(prelude)
+        self.programs = ProgramCache(cache_size)
+        self.limits = limits or {}  # 服务端的上限，请求只能往小里设
+        self.max_pending = max_pending
+        self.requests = 0
+        self.active = 0
+        self.started = time.time()
+
+    def _governor(self, requested: Dict[str, Any]) -> Optional[ResourceGovernor]:
+        """合并服务端上限和请求里的限制，取小的"""
+        limits = {}
+        for name in LIMIT_NAMES:
+            values = [value for value in (self.limits.get(name), requested.get(name)) if value is not None]
+            limits[name] = min(values) if values else None
+        if all(value is None for value in limits.values()):
+            return None
+        return ResourceGovernor(**limits)
+
+    def _load_program(self, request: Dict[str, Any]) -> Program:
+        if 'source' in request:
+            return self.programs.from_source(request['source'])
+        elif 'path' in request:
+            return self.programs.from_path(request['path'])
+        raise ValueError("请求里要有 source 或 path")
+
+    async def run(self, request: Dict[str, Any], writer: asyncio.StreamWriter) -> Dict[str, Any]:
+        """跑一个请求，输出边跑边发，返回 done 帧"""
+        start = time.perf_counter()
+        done: Dict[str, Any] = {'type': 'done', 'status': 'ok', 'error': None}
+
+        try:
+            program = self._load_program(request)
+            interpreter = self.template.clone(governor=self._governor(request.get('limits') or {}),
+                                              output=FrameSink(writer, max_pending=self.max_pending),
+                                              interpreter_class=AsyncHangzhouInterpreter)
+            if 'path' in request:
+                interpreter.search_path.insert(0, os.path.dirname(os.path.abspath(request['path'])))
+            define_arguments(interpreter, request.get('args') or [])
+            await interpreter.run_async(program)
+
+            error = interpreter.last_error
+            if error is not None:
+                done['status'] = 'timeout' if getattr(error, 'resource', None) == 'time' else 'error'
+                done['error'] = str(error)
+        except Exception as e:
+            done['status'] = 'error'
+            done['error'] = f"{type(e).__name__}: {e}"
+
+        done['elapsed_ms'] = round((time.perf_counter() - start) * 1000, 3)
+        return done
+
+    def stats(self) -> Dict[str, Any]:
+        """守护进程的运行统计"""
+        return {
+            'type': 'stats',
+            'pid': os.getpid(),
+            'uptime': round(time.time() - self.started, 3),
+            'requests': self.requests,
+            'active': self.active,
+            'cached_programs': len(self.programs.entries),
+            'cache_hits': self.programs.hits,
+            'cache_misses': self.programs.misses,
+            'memory': process_memory(),
+        }
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """一个连接上可以接连发多个请求"""
+        try:
+            while True:
+                try:
+                    header = await reader.readexactly(HEADER_SIZE)
+                except asyncio.IncompleteReadError:
+                    break
+
+                try:
+                    request = decode_payload(await reader.readexactly(payload_size(header)))
+                except (ValueError, asyncio.IncompleteReadError) as e:
+                    writer.write(encode_frame({'type': 'done', 'status': 'error', 'error': f"请求格式不对: {e}"}))
+                    break
+
+                op = request.get('op')
+                if op == 'run':
+                    self.requests += 1
+                    self.active += 1
+                    try:
+                        response = await self.run(request, writer)
+                    finally:
+                        self.active -= 1
+                elif op == 'ping':
+                    response = {'type': 'pong'}
+                elif op == 'stats':
+                    response = self.stats()
+                else:
+                    response = {'type': 'done', 'status': 'error', 'error': f"未知的请求: {op}"}
+
+                writer.write(encode_frame(response))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    def listen(self) -> socket.socket:
+        """建好监听的套接字，只有自己能连（能连上来就能跑代码）"""
+        remove_stale_socket(self.socket_path)
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        old_umask = os.umask(0o177)
+        try:
+            sock.bind(self.socket_path)
+        finally:
+            os.umask(old_umask)
+        sock.listen(128)
+        return sock
+
+    async def serve_forever(self, sock: Optional[socket.socket] = None) -> None:
+        """
+        在套接字上接收请求，收到 SIGINT/SIGTERM 时退出
+        没有传入 sock 时自己建套接字，退出时删掉套接字文件；
+        传入的（预先 fork 的工作进程）由父进程负责。
+        """
+        owns_socket = sock is None
+        if owns_socket:
+            sock = self.listen()
+        server = await asyncio.start_unix_server(self.handle_connection, sock=sock)
+
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, stop.set)
+
+        try:
+            async with server:
+                await stop.wait()
+        finally:
+            if owns_socket and os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+
+def define_arguments(interpreter: AsyncHangzhouInterpreter, args: List[Any]) -> None:
+    """把脚本参数定义成全局变量 参数个数、参数1、参数2……"""
+    interpreter.global_env.define('参数个数', len(args))
+    for number, value in enumerate(args, 1):
+        interpreter.global_env.define(f'参数{number}', value)
+
+def remove_stale_socket(path: str) -> None:
+    """上次没删掉的套接字文件：连不上就删掉，连得上说明已经有守护进程在跑了"""
+    if not os.path.exists(path):
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except OSError:
+        os.unlink(path)
+        return
+    finally:
+        probe.close()
+    raise RuntimeError(f"已经有守护进程在 {path} 上了")
+
+def main(argv: List[str]) -> int:
+    """hangzhoulang serve 命令行"""
+    parser = argparse.ArgumentParser(
+        prog='hangzhoulang serve',
+        description='常驻的杭州话守护进程，通过 Unix 域套接字接收运行请求',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='''
+使用示例:
+  hangzhoulang serve --socket /tmp/hz.sock &
+  hangzhoulang client --socket /tmp/hz.sock hello.hz   # 用热好的解释器跑
+  hangzhoulang serve --workers 8 --preload lib/*.hz --memory-report 60
+        '''
+    )
+    parser.add_argument('--socket', '-s', default=default_socket_path(),
+                        help='套接字路径（默认 $HANGZHOULANG_SOCKET 或临时目录下按用户区分）')
+    parser.add_argument('--prelude', help='预先加载的开场脚本')
+    parser.add_argument('--cache-size', type=int, default=DEFAULT_CACHE_SIZE,
+                        help=f'缓存多少个解析好的程序（默认 {DEFAULT_CACHE_SIZE}）')
+    parser.add_argument('--timeout', type=float, help='每个请求最长运行时间（秒）')
+    parser.add_argument('--max-steps', type=int, help='每个请求最多执行的语句数')
+    parser.add_argument('--max-depth', type=int, help='每个请求最深的函数调用层数')
+    parser.add_argument('--max-pending', type=int, default=DEFAULT_MAX_PENDING >> 20, metavar='MB',
+                        help=f'每个连接待发的输出最多多少 MB，客户端收得慢超过了就让请求失败'
+                             f'（默认 {DEFAULT_MAX_PENDING >> 20}）')
+    parser.add_argument('--workers', '-w', type=int, default=0,
+                        help='预先 fork 多少个工作进程（默认 0：只用一个进程）')
+    parser.add_argument('--preload', nargs='+', default=[], metavar='FILE',
+                        help='在父进程里预先解析好的程序文件')
+    parser.add_argument('--no-freeze', action='store_true', help='fork 前不调用 gc.freeze()（对比内存用）')
+    parser.add_argument('--memory-report', type=float, metavar='SECONDS',
+                        help='每隔多少秒把各工作进程的 USS/PSS 写到标准错误')
+    args = parser.parse_args(argv)
+
+    prelude = None
+    if args.prelude:
+        with open(args.prelude, 'r', encoding='utf-8') as f:
+            prelude = f.read()
+
+    limits = {'max_time': args.timeout, 'max_steps': args.max_steps, 'max_depth': args.max_depth}
+    server = HangzhouServer(args.socket, prelude, args.cache_size, limits, args.max_pending << 20)
+    for path in args.preload:
+        server.programs.preload(os.path.abspath(path))
+
+    try:
+        if args.workers > 0:
+            from prefork import PreforkServer
+            PreforkServer(server, args.workers, not args.no_freeze, args.memory_report).run()
+        else:
+            asyncio.run(server.serve_forever())
+    except RuntimeError as e:
+        print(f"启动失败: {e}", file=sys.stderr)
+        return 1
+    return 0
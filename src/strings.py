@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""
+杭州话编程语言字符串拼接
+Hangzhou Dialect Programming Language String Building
+
+`结果 装 结果 加 "..."` 每次都要把整个字符串复制一遍，循环里拼 n 次就是 O(n²)。
+这里的片段先攒在列表里，要用的时候一次 join，总共 O(n)。
+"""
+
+from typing import Any, List
+
+class StringBuilder:
+    """
+    拼串：显式的字符串拼接器
+    塞进去的片段攒在 parts 里，长度随时晓得，拼好（或者打印、比较）的时候才 join，
+    join 出来的结果留着当唯一的片段，再读不用重新拼。
+    """
+    __slots__ = ('parts', 'length')
+
+    def __init__(self, text: str = ''):
+        self.parts: List[str] = [text] if text else []
+        self.length = len(text)
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, StringBuilder):
+            return self.build() == other.build()
+        if isinstance(other, str):
+            return self.build() == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def append(self, text: str) -> None:
+        """往后拼一段"""
+        self.parts.append(text)
+        self.length += len(text)
+
+    def build(self) -> str:
+        """拼成一个 str"""
+        parts = self.parts
+        if len(parts) == 1:
+            return parts[0]
+        text = ''.join(parts)
+        self.parts = [text]
+        return text
+
+class StringRope(StringBuilder):
+    """
+    解释器自己用的拼接缓冲：变量反复 `装 自己 加 字符串` 时存在变量里的就是它，
+    读这个变量的时候拼成 str 交出去，杭州话程序里看到的永远是普通字符串。
+    """
+    __slots__ = ()
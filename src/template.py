@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""
+杭州话编程语言解释器模板
+Hangzhou Dialect Programming Language Interpreter Templates
+"""
+
+from typing import Dict, List, Optional, Type, Union
+from governor import ResourceGovernor
+from interpreter import HangzhouInterpreter, OverlayEnvironment, DEFAULT_MEMO_SIZE
+from quicken import QuickState
+from strings import StringRope
+from output import OutputSink, create_sink
+from parser import BinaryOp, Program, parse_text
+
+class InterpreterTemplate:
+    """
+    预先初始化好的解释器模板
+    内置函数和公共的开场脚本（函数定义、常量）只在建模板时跑一次，
+    以后每个请求用 clone() 拿一个互不影响的解释器，全局环境写时复制，
+    克隆的开销和开场脚本有多大没有关系。
+    """
+    
+    def __init__(self, prelude: Optional[Union[str, Program]] = None, memo_size: int = DEFAULT_MEMO_SIZE):
+        self.memo_size = memo_size
+        self.interpreter = HangzhouInterpreter(memo_size=memo_size, output=create_sink('capture'))
+        self.prelude_output: List[str] = []
+        # 开场脚本里共享节点的特化状态，这个进程里所有克隆共用（见 optimizer.prepare_program）
+        self.quick_states: Dict[BinaryOp, QuickState] = {}
+        self.program: Optional[Program] = None  # 解析好的开场脚本
+        
+        if prelude is not None:
+            program = parse_text(prelude) if isinstance(prelude, str) else prelude
+            self.program = program
+            self.prelude_output = self.interpreter.interpret(program)
+            if self.interpreter.last_error is not None:
+                raise self.interpreter.last_error
+        
+        self.global_env = self.interpreter.global_env
+        # 开场脚本往后拼出来的字符串先拼好，不然克隆出来的解释器会往同一个缓冲里拼
+        for name, value in self.global_env.variables.items():
+            if type(value) is StringRope:
+                self.global_env.variables[name] = value.build()
+    
+    def clone(self, governor: Optional[ResourceGovernor] = None,
+              output: Optional[OutputSink] = None,
+              interpreter_class: Type[HangzhouInterpreter] = HangzhouInterpreter) -> HangzhouInterpreter:
+        """克隆一个独立的解释器，interpreter_class 可以换成 AsyncHangzhouInterpreter 之类的子类"""
+        return interpreter_class(memo_size=self.memo_size, governor=governor, output=output,
+                                   global_env=OverlayEnvironment(self.global_env), quick_states=self.quick_states)
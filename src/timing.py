@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""
+杭州话编程语言分阶段计时
+Hangzhou Dialect Programming Language Phase Timing
+
+`hangzhoulang --time` 用：读文件、词法分析、语法分析、分析优化、执行各花了多少墙钟时间和 CPU 时间，
+外加词元数、语法树节点数、执行的语句数、函数调用次数和峰值内存。不用开采样分析器就晓得时间花在哪一段。
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, NamedTuple
+
+TIME_FORMATS = ('table', 'json')
+
+class Phase(NamedTuple):
+    """一个阶段的耗时（秒）"""
+    name: str
+    label: str
+    wall: float
+    cpu: float
+
+# 计数器的键和表格里显示的名字
+COUNTERS = (
+    ('tokens', '词元数'),
+    ('ast_nodes', '语法树节点数'),
+    ('functions_analyzed', '分析的函数数'),
+    ('statements', '执行的语句数'),
+    ('calls', '函数调用次数'),
+    ('peak_rss_bytes', '峰值内存'),
+)
+
+class PhaseTimer:
+    """按阶段记墙钟时间和 CPU 时间，再加几个计数器"""
+
+    def __init__(self):
+        self.phases: List[Phase] = []
+        self.counters: Dict[str, int] = {}
+
+    @contextmanager
+    def phase(self, name: str, label: str) -> Iterator[None]:
+        """with timer.phase('lex', '词法分析'): ... 里的代码算一个阶段，出了错也记下来"""
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            self.phases.append(Phase(name, label, time.perf_counter() - wall, time.process_time() - cpu))
+
+    def count(self, name: str, value: int) -> None:
+        self.counters[name] = value
+
+    def as_dict(self) -> Dict[str, Any]:
+        """JSON 用的字典，时间单位毫秒"""
+        return {
+            'phases': [{'name': phase.name, 'wall_ms': round(phase.wall * 1000, 3),
+                        'cpu_ms': round(phase.cpu * 1000, 3)} for phase in self.phases],
+            'total': {'wall_ms': round(sum(phase.wall for phase in self.phases) * 1000, 3),
+                      'cpu_ms': round(sum(phase.cpu for phase in self.phases) * 1000, 3)},
+            'counters': dict(self.counters),
+        }
+
+    def format_json(self) -> str:
+        import json
+        return json.dumps(self.as_dict(), ensure_ascii=False)
+
+    def format_table(self) -> str:
+        """给人看的表格"""
+        total_wall = sum(phase.wall for phase in self.phases)
+        total_cpu = sum(phase.cpu for phase in self.phases)
+        lines = ["分阶段计时:", f"  {'阶段':<10}{'墙钟(毫秒)':>12}{'CPU(毫秒)':>12}{'占比':>8}"]
+        for phase in self.phases:
+            share = phase.wall / total_wall if total_wall else 0.0
+            lines.append(f"  {phase.label:<10}{phase.wall * 1000:>12.3f}{phase.cpu * 1000:>12.3f}{share:>8.1%}")
+        lines.append(f"  {'合计':<10}{total_wall * 1000:>12.3f}{total_cpu * 1000:>12.3f}")
+        lines.append("计数:")
+        for key, label in COUNTERS:
+            if key not in self.counters:
+                continue
+            value = self.counters[key]
+            shown = f"{value / (1024 * 1024):.1f} MB" if key == 'peak_rss_bytes' else f"{value}"
+            lines.append(f"  {label:<10}{shown:>12}")
+        return '\n'.join(lines)
+
+    def format(self, time_format: str) -> str:
+        """time_format 是 table 或 json"""
+        return self.format_json() if time_format == 'json' else self.format_table()
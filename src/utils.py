@@ -6,7 +6,7 @@ Hangzhou Dialect Programming Language Utilities
 
 import sys
 from typing import List, Optional, Any, Dict
-from keywords import HANGZHOU_KEYWORDS, HANGZHOU_PHRASES
+from keywords import HANGZHOU_KEYWORDS
 
 class HangzhouError(Exception):
     """杭州话编程语言错误基类"""
@@ -37,6 +37,13 @@ class RuntimeError(HangzhouError):
     """运行时错误"""
     pass
 
+class ResourceLimitError(HangzhouError):
+    """资源超限错误：步数、调用深度、运行时间或内存超出预算"""
+    def __init__(self, resource: str, limit: Any, message: str):
+        self.resource = resource
+        self.limit = limit
+        super().__init__(message)
+
 def format_hangzhou_error(error: Exception, source_code: str = "") -> str:
     """格式化杭州话风格的错误消息"""
     error_messages = {
@@ -97,7 +104,7 @@ def debug_tokens(text: str) -> None:
     try:
         tokens = tokenize(text)
         for i, token in enumerate(tokens):
-            print(f"{i:3d}: {token.type.name:15} | {token.value:20} | {token.line}:{token.column}")
+            print(f"{i:3d}: {token.type.name:15} | {token.value!s:20} | {token.line}:{token.column}")
     except Exception as e:
         print(f"词法分析错误: {e}")
     
@@ -189,6 +196,7 @@ def translate_to_python(hangzhou_code: str) -> str:
 
 def get_keyword_suggestions(partial_word: str) -> List[str]:
     """获取关键字建议（用于自动补全）"""
+    from vocabulary import HANGZHOU_PHRASES
     suggestions = []
     
     for keyword in HANGZHOU_KEYWORDS.keys():